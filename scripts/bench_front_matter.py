@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the front matter loaders used by `build_manifest.py`.
+
+Every front matter block under `docs/` (plus the resources catalog) is parsed
+with the restricted single-pass parser, PyYAML's C and pure-Python safe
+loaders and the legacy `_simple_yaml_load` fallback. Results are checked
+against `yaml.safe_load` before timing so the comparison is like for like.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import build_manifest as bm
+
+
+def _collect_blocks(docs_root: Path) -> List[str]:
+    blocks: List[str] = []
+    for path in sorted(docs_root.rglob("*.md")):
+        raw = bm._read_front_matter(path)
+        if raw:
+            blocks.append(raw)
+    links_path = docs_root / "resources" / "links.md"
+    if links_path.exists():
+        blocks.append(links_path.read_text(encoding="utf-8"))
+    return blocks
+
+
+def _loaders() -> Dict[str, Callable[[str], Any]]:
+    loaders: Dict[str, Callable[[str], Any]] = {"fast": bm._fast_yaml_load}
+    if bm.yaml is not None:
+        if hasattr(bm.yaml, "CSafeLoader"):
+            loaders["pyyaml_c"] = lambda raw: bm.yaml.load(raw, Loader=bm.yaml.CSafeLoader)
+        loaders["pyyaml_pure"] = lambda raw: bm.yaml.load(raw, Loader=bm.yaml.SafeLoader)
+    loaders["simple_fallback"] = bm._simple_yaml_load
+    return loaders
+
+
+def _check_parity(blocks: List[str]) -> Dict[str, int]:
+    supported = mismatched = 0
+    for raw in blocks:
+        try:
+            result = bm._fast_yaml_load(raw)
+        except bm._UnsupportedYaml:
+            continue
+        supported += 1
+        if bm.yaml is not None and result != bm.yaml.load(raw, Loader=bm.yaml.SafeLoader):
+            mismatched += 1
+    return {"blocks": len(blocks), "supported": supported, "mismatched": mismatched}
+
+
+def _time_loader(loader: Callable[[str], Any], blocks: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for raw in blocks:
+            try:
+                loader(raw)
+            except bm._UnsupportedYaml:
+                pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(docs_root: Path, *, copies: int, repeat: int) -> Dict[str, Any]:
+    blocks = _collect_blocks(docs_root) * copies
+    total_bytes = sum(len(raw.encode("utf-8")) for raw in blocks)
+    results: Dict[str, Any] = {"parity": _check_parity(blocks), "loaders": {}}
+    for name, loader in _loaders().items():
+        seconds = _time_loader(loader, blocks, repeat)
+        results["loaders"][name] = {
+            "seconds": round(seconds, 6),
+            "blocks_per_second": round(len(blocks) / seconds, 1) if seconds else None,
+            "mb_per_second": round(total_bytes / seconds / 1e6, 2) if seconds else None,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark front matter loaders.")
+    parser.add_argument("--docs", type=Path, default=bm.DOCS_ROOT, help="Docs tree to read front matter from.")
+    parser.add_argument("--copies", type=int, default=20, help="Replicate the corpus N times per run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Keep the best of N timed runs.")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results.")
+    args = parser.parse_args()
+
+    results = run(args.docs, copies=args.copies, repeat=args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    parity = results["parity"]
+    print(
+        f"{parity['blocks']} blocks, {parity['supported']} inside the fast subset, "
+        f"{parity['mismatched']} mismatches against yaml.safe_load"
+    )
+    fast = results["loaders"]["fast"]["seconds"]
+    for name, stats in results["loaders"].items():
+        print(
+            f"{name:>16}: {stats['blocks_per_second']:>12,.0f} blocks/s "
+            f"{stats['mb_per_second']:>8.2f} MB/s  x{stats['seconds'] / fast:.1f} vs fast"
+        )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:  # pragma: no cover
+        print(f"[bench_front_matter] error: {exc}", file=sys.stderr)
+        sys.exit(1)
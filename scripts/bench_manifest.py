@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for `build_manifest.py` over synthetic knowledge gardens.
+
+Generates deterministic `docs/` trees (notes, patterns, guides, snippets,
+examples and a `resources/links.md` catalog) with realistic front matter, then
+builds each one in a fresh subprocess and records wall time, peak RSS and
+throughput for every build phase. Results are emitted as JSON so runs can be
+compared across releases.
+
+    python3 scripts/bench_manifest.py --sizes 1000,10000 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import build_manifest as bm
+
+
+GARDEN_FORMAT = 2
+RESULT_SCHEMA = "bench_manifest.v1"
+DEFAULT_SIZES = "1000,10000"
+FILES_PER_DIRECTORY = 1000
+QUERY_COLD_SCRIPT = """
+import time
+start = time.perf_counter()
+import sys
+import manifest_query
+index = manifest_query.ManifestIndex.open(sys.argv[1])
+index.get(sys.argv[2])
+index.by_type("note")[:1]
+print(round((time.perf_counter() - start) * 1000, 3))
+"""
+
+# Share of items per content type; resources live in links.md rather than files.
+TYPE_MIX = (
+    ("note", "notes", 0.40),
+    ("pattern", "patterns", 0.20),
+    ("snippet", "snippets", 0.20),
+    ("guide", "guide", 0.05),
+    ("example", "examples", 0.05),
+    ("resource", "resources", 0.10),
+)
+WORDS = (
+    "agent memory context tool planner router critic reflection retrieval vector graph "
+    "prompt chain guardrail evaluation latency budget cache token stream handoff protocol "
+    "schema state checkpoint episode summary dedup idempotency queue worker lock trace"
+).split()
+STATUSES = ("draft", "in-review", "stable")
+SOURCE_TYPES = ("linkedin", "paper", "blog", "video", "talk", "book", "podcast", "report")
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def _quoted(values: List[str]) -> str:
+    return "[" + ", ".join(json.dumps(value) for value in values) + "]"
+
+
+def _date(rng: random.Random) -> dt.date:
+    return dt.date(2023, 1, 1) + dt.timedelta(days=rng.randrange(1100))
+
+
+def _item_path(item_type: str, folder: str, index: int, slug: str, created: dt.date) -> str:
+    bucket = f"batch-{index // FILES_PER_DIRECTORY:04d}"
+    if item_type == "note":
+        return f"{folder}/{bucket}/{created.isoformat()}_{slug}.md"
+    return f"{folder}/{bucket}/{slug}.md"
+
+
+def generate_garden(root: Path, count: int, *, seed: int = 7, body_bytes: int = 1500) -> Dict[str, int]:
+    """Writes a synthetic `docs/` tree with `count` items under `root` and returns per-type counts."""
+    marker = root / ".garden.json"
+    spec = {"format": GARDEN_FORMAT, "items": count, "seed": seed, "body_bytes": body_bytes}
+    if marker.exists():
+        existing = json.loads(marker.read_text(encoding="utf-8"))
+        if existing.get("spec") == spec:
+            return existing["counts"]
+
+    rng = random.Random(seed)
+    docs_root = root / "docs"
+    tags = [f"tag-{index:03d}" for index in range(400)]
+    tag_weights = [1.0 / (rank + 1) for rank in range(len(tags))]
+    themes = [f"{group}/{name}" for group in ("memory", "reasoning", "execution", "safety", "ops") for name in WORDS[:8]]
+
+    counts = {item_type: int(count * share) for item_type, _, share in TYPE_MIX}
+    counts["note"] += count - sum(counts.values())
+    planned: Dict[str, List[str]] = {}
+    for item_type, folder, _ in TYPE_MIX:
+        if item_type == "resource":
+            continue
+        paths = []
+        for index in range(counts[item_type]):
+            slug = f"{item_type}-{index:07d}-{rng.choice(WORDS)}"
+            paths.append(_item_path(item_type, folder, index, slug, _date(rng)))
+        planned[item_type] = paths
+
+    for item_type, folder, _ in TYPE_MIX:
+        if item_type == "resource":
+            continue
+        for path in planned[item_type]:
+            created = dt.date.fromisoformat(path.rsplit("/", 1)[-1][:10]) if item_type == "note" else _date(rng)
+            updated = created + dt.timedelta(days=rng.randrange(120))
+            slug = Path(path).stem.split("_", 1)[-1]
+            lines = [
+                "---",
+                f'title: "{_words(rng, 5).title()}"',
+                f'slug: "{slug}"',
+                f"tags: {_quoted(rng.choices(tags, weights=tag_weights, k=rng.randint(2, 8)))}",
+                f"themes: {_quoted(rng.sample(themes, rng.randint(1, 3)))}",
+            ]
+            if item_type == "note":
+                lines += [
+                    "source:",
+                    f'  type: "{rng.choice(SOURCE_TYPES)}"',
+                    f'  title: "{_words(rng, 4)}"',
+                    f'  author: "{_words(rng, 2).title()}"',
+                    "  org: null",
+                    f'  url: "https://example.org/{slug}"',
+                ]
+            else:
+                origin = rng.choice(planned["note"]) if planned["note"] else None
+                lines += [
+                    "source:",
+                    f'  origin_note: "{origin}"' if origin else "  origin_note: null",
+                    f'  author: "{_words(rng, 2).title()}"',
+                ]
+            lines += [
+                f'status: "{rng.choice(STATUSES)}"',
+                f'created_at: "{created.isoformat()}"',
+                f'updated_at: "{updated.isoformat()}"',
+                f'summary: "{_words(rng, 20)}"',
+                "relationships:",
+            ]
+            if item_type == "note":
+                targets = [rng.choice(planned[kind]) for kind in ("pattern", "snippet") if planned[kind]]
+                lines.append("  promotes_to:")
+                lines += [f'    - "{target}"' for target in targets[: rng.randint(0, 2)]]
+                lines.append("  related_notes: []")
+            else:
+                for kind, label in (("snippet", "snippets"), ("example", "examples"), ("pattern", "patterns")):
+                    picks = [rng.choice(planned[kind]) for _ in range(rng.randint(0, 3))] if planned[kind] else []
+                    lines.append(f"  {label}: {_quoted([f'docs/{pick}' for pick in picks])}")
+            lines.append("---")
+            # Mostly short bodies with the occasional pasted transcript.
+            size = body_bytes * (40 if rng.random() < 0.01 else 1)
+            body = "\n\n".join(_words(rng, 12) for _ in range(max(1, size // 90)))
+            target = docs_root / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text("\n".join(lines) + "\n\n### Overview\n" + body + "\n", encoding="utf-8")
+
+    resources_dir = docs_root / "resources"
+    resources_dir.mkdir(parents=True, exist_ok=True)
+    with (resources_dir / "links.md").open("w", encoding="utf-8") as handle:
+        for index in range(counts["resource"]):
+            origin = rng.choice(planned["note"]) if planned["note"] else ""
+            handle.write(
+                f'- title: "Resource {index:07d} {_words(rng, 3)}"\n'
+                f'  summary: "{_words(rng, 16)}"\n'
+                f'  url: "https://example.org/resources/{index}"\n'
+                f'  type: "{rng.choice(("book", "tool", "blog", "paper"))}"\n'
+                f"  tags: {_quoted(rng.choices(tags, weights=tag_weights, k=rng.randint(1, 5)))}\n"
+                f'  origin_note: "docs/{origin}"\n'
+                f'  added_at: "{_date(rng).isoformat()}"\n\n'
+            )
+
+    # The real section schemas, so parsing pays for validation as it does in the repository.
+    for section in bm.SCHEMA_SECTIONS:
+        schema = bm.DOCS_ROOT / section / bm.SECTION_SCHEMA_FILE
+        if schema.is_file():
+            (docs_root / section).mkdir(parents=True, exist_ok=True)
+            (docs_root / section / bm.SECTION_SCHEMA_FILE).write_bytes(schema.read_bytes())
+
+    marker.write_text(json.dumps({"spec": spec, "counts": counts}), encoding="utf-8")
+    return counts
+
+
+def _reset_peak_rss() -> None:
+    # Linux lets a process reset its high-water mark; elsewhere peaks are cumulative.
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> float:
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class _PhaseRecorder:
+    def __init__(self) -> None:
+        self.phases: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Dict[str, Any]]:
+        record: Dict[str, Any] = {}
+        _reset_peak_rss()
+        start = time.perf_counter()
+        yield record
+        seconds = time.perf_counter() - start
+        record.update({"seconds": round(seconds, 6), "peak_rss_mb": _peak_rss_mb()})
+        for unit in ("files", "items"):
+            if unit in record:
+                record[f"{unit}_per_second"] = round(record[unit] / seconds, 1) if seconds else None
+        self.phases[name] = record
+
+
+def measure_build(root: Path, *, jobs: int = 1) -> Dict[str, Any]:
+    """Runs every build phase against the garden at `root` and returns phase records."""
+    docs_root = root / "docs"
+    cache_path = root / ".cache" / "parse_cache.ndjson"
+    state_path = root / ".cache" / "build_state.json"
+    for stale in (cache_path, state_path):
+        if stale.exists():
+            stale.unlink()
+    recorder = _PhaseRecorder()
+
+    with recorder.phase("discovery") as record:
+        discovered = bm._discover_markdown(docs_root)
+        record["files"] = sum(len(paths) for paths in discovered)
+    files = recorder.phases["discovery"]["files"]
+
+    schemas = bm._schema_fingerprint(docs_root)
+    with recorder.phase("parse") as record:
+        cache = bm._ParseCache(cache_path, schemas=schemas)
+        report = bm._SchemaReport()
+        items = bm._collect_markdown_items(
+            cache, jobs=jobs, docs_root=docs_root, discovered=discovered, schema=report
+        )
+        record["files"] = files
+    cache.save()
+
+    with recorder.phase("parse_cached") as record:
+        cache = bm._ParseCache.load(cache_path, schemas=schemas)
+        bm._collect_markdown_items(cache, jobs=jobs, docs_root=docs_root, discovered=discovered)
+        record.update({"files": files, "cache_hits": cache.hits})
+
+    with recorder.phase("duplicates") as record:
+        minhash = bm._MinHashStore(root / ".cache" / "minhash_cache.ndjson")
+        bm._collect_signatures(discovered, minhash, docs_root=docs_root)
+        clusters = bm.find_near_duplicates(minhash.signatures)
+        record.update({"files": files, "clusters": len(clusters)})
+    del minhash
+
+    with recorder.phase("resources") as record:
+        before = len(items)
+        bm._collect_resources(items, docs_root=docs_root, schema=report)
+        record["items"] = len(items) - before
+
+    with recorder.phase("schema") as record:
+        problems = report.finish()
+        record.update({"problems": len(problems), "files": len({path for path, _ in problems})})
+
+    with recorder.phase("sort") as record:
+        manifest = bm._assemble_manifest(items)
+        record["items"] = len(manifest["items"])
+
+    # The garden federated with a mirror of itself: the home root hits its parse cache, the mirror
+    # is collected cold alongside it, and every id collides once.
+    with tempfile.TemporaryDirectory() as state_dir, recorder.phase("federated") as record:
+        federated, _, _, collisions = bm.build_federated_manifest(
+            [bm.FederatedRoot("mirror", root)], docs_root=docs_root, cache_path=cache_path, state_dir=Path(state_dir)
+        )
+        record.update({"roots": 2, "items": len(federated["items"]), "collisions": len(collisions)})
+    del federated, collisions
+
+    with recorder.phase("links") as record:
+        dangling = bm._find_dangling_links(manifest, bm._known_doc_paths(docs_root))
+        record.update({"items": len(manifest["items"]), "edges": len(manifest["graph"].targets), "dangling": len(dangling)})
+
+    with recorder.phase("related") as record:
+        try:
+            related = bm._RelatedCache(None)
+            bm.suggest_related(manifest, docs_root=docs_root, cache=related)
+            record.update({"items": len(manifest["items"]), "rows": related.recomputed})
+        except RuntimeError as exc:  # numpy/scipy not installed
+            record["skipped"] = str(exc)
+
+    with recorder.phase("json") as record:
+        json_path = root / ".cache" / "content_manifest.json"
+        bm._write_chunks_if_changed(json_path, bm._iter_manifest_json(manifest))
+        record.update({"items": len(manifest["items"]), "bytes": json_path.stat().st_size})
+
+    spans: List[Tuple[int, int]] = []
+    with recorder.phase("ndjson") as record:
+        ndjson_path = root / ".cache" / "content_manifest.ndjson"
+        bm._write_manifest_ndjson(ndjson_path, manifest, spans)
+        record.update({"items": len(manifest["items"]), "bytes": ndjson_path.stat().st_size})
+
+    with recorder.phase("query_index") as record:
+        index_path = ndjson_path.with_suffix(".idx")
+        bm._write_query_index(index_path, manifest, ndjson_path, spans)
+        record.update({"items": len(manifest["items"]), "bytes": index_path.stat().st_size})
+
+    # Import, open and first lookups in a fresh interpreter, timed from inside it.
+    cold = subprocess.run(
+        [sys.executable, "-c", QUERY_COLD_SCRIPT, str(index_path), manifest["items"][-1].id],
+        cwd=Path(__file__).resolve().parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    recorder.phases["query_index"]["cold_query_ms"] = float(cold.stdout)
+
+    with recorder.phase("render") as record:
+        cards = bm._CardCache()
+        pages = bm._render_pages(manifest, cards=cards)
+        record.update({"items": len(manifest["items"]), "pages": len(pages)})
+
+    bm.manifest_output.OUTPUTS = outputs = bm._OutputStore(state_path)
+    try:
+        with recorder.phase("archives") as record:
+            written, _ = bm.regenerate_archives(manifest, docs_root=docs_root, cards=cards)
+            record.update({"items": len(manifest["items"]), "written": len(written), "pages": len(outputs.entries)})
+
+        with recorder.phase("archives_unchanged") as record:
+            written, _ = bm.regenerate_archives(manifest, docs_root=docs_root, cards=cards)
+            record.update({"items": len(manifest["items"]), "written": len(written)})
+    finally:
+        bm.manifest_output.OUTPUTS = None
+
+    # Cached parsing, NDJSON output, duplicate detection and the no-op archive pass are alternatives or opt-in stages.
+    total = sum(
+        phase["seconds"]
+        for name, phase in recorder.phases.items()
+        if name not in {"parse_cached", "ndjson", "duplicates", "federated", "related", "archives_unchanged"}
+    )
+    return {"files": files, "items": len(manifest["items"]), "total_seconds": round(total, 6), "phases": recorder.phases}
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=bm.REPOSITORY_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def run(sizes: List[int], workdir: Path, *, jobs: int, seed: int, body_bytes: int) -> Dict[str, Any]:
+    results = []
+    for size in sizes:
+        root = workdir / f"garden-{size}"
+        start = time.perf_counter()
+        counts = generate_garden(root, size, seed=seed, body_bytes=body_bytes)
+        generate_seconds = time.perf_counter() - start
+        # A fresh interpreter per size keeps peak RSS figures independent.
+        completed = subprocess.run(
+            [sys.executable, __file__, "--measure", str(root), "--jobs", str(jobs)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        measured = json.loads(completed.stdout)
+        measured.update({"size": size, "counts": counts, "generate_seconds": round(generate_seconds, 3)})
+        results.append(measured)
+    return {
+        "schema": RESULT_SCHEMA,
+        "created_at": dt.datetime.utcnow().isoformat() + "Z",
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "jobs": jobs,
+        "yaml": "pyyaml" if bm.yaml is not None else "fallback",
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark build_manifest.py on synthetic gardens.")
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help="Comma-separated item counts, e.g. 1000,10000,100000,1000000.",
+    )
+    parser.add_argument("--workdir", type=Path, help="Where synthetic gardens are generated and reused.")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for the parse phase.")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the garden generator.")
+    parser.add_argument("--body-bytes", type=int, default=1500, help="Typical Markdown body size.")
+    parser.add_argument("--output", type=Path, help="Write JSON results to this file instead of stdout.")
+    parser.add_argument("--measure", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure is not None:
+        print(json.dumps(measure_build(args.measure, jobs=args.jobs)))
+        return
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    workdir = args.workdir or Path(tempfile.gettempdir()) / "akg-bench"
+    results = run(sizes, workdir, jobs=args.jobs, seed=args.seed, body_bytes=args.body_bytes)
+    payload = json.dumps(results, indent=2) + "\n"
+    if args.output is not None:
+        args.output.write_text(payload, encoding="utf-8")
+    else:
+        sys.stdout.write(payload)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except subprocess.CalledProcessError as exc:  # pragma: no cover
+        print(f"[bench_manifest] error: measurement failed\n{exc.stderr}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as exc:  # pragma: no cover
+        print(f"[bench_manifest] error: {exc}", file=sys.stderr)
+        sys.exit(1)
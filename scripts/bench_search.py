@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Compares the prebuilt sharded search index with the lunr index mkdocs ships.
+
+The manifest and `build_search_index` output are built for a docs tree in a
+temporary directory. Both indexes are then measured for on-disk size, the
+bytes a visitor fetches before the first result, and query latency. The
+lunr side replays what the browser does on every page load: parse
+`site/search/search_index.json`, build a lunr index from it (through the
+`lunr` package when it is installed), then query it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import build_manifest as bm
+
+try:
+    import lunr  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    lunr = None
+
+
+DEFAULT_QUERIES = (
+    "memory",
+    "tool use",
+    "agent routing",
+    "guardrails safety",
+    "reflection critic",
+    "a2a protocol",
+    "evaluation monitoring",
+    "prompt chaining",
+)
+DEFAULT_LUNR_INDEX = bm.REPOSITORY_ROOT / "site" / "search" / "search_index.json"
+
+
+def _best_of(repeat: int, action: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _fetched_bytes(index_dir: Path, query: str) -> int:
+    """Bytes a client downloads to answer `query` from a cold start: meta, term shards and hit chunks."""
+    index = bm.SearchIndex(index_dir)
+    index.search(query)
+    files = [index_dir / "meta.json"]
+    files += [index_dir / "shards" / f"{name}.json" for name in index.shards]
+    files += [index_dir / "docs" / f"{chunk}.json" for chunk in index.doc_chunks]
+    return sum(path.stat().st_size for path in files)
+
+
+def measure_sharded(docs_root: Path, queries: List[str], *, repeat: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        index_dir = workdir / "search"
+        manifest = bm.build_manifest(docs_root=docs_root, cache_path=workdir / "parse_cache.ndjson")
+        start = time.perf_counter()
+        stats = bm.build_search_index(manifest, docs_root=docs_root, output_dir=index_dir)
+        build_seconds = time.perf_counter() - start
+
+        files = [index_dir / "meta.json", *sorted(index_dir.glob("*/*.json"))]
+        warm = bm.SearchIndex(index_dir)
+        for query in queries:
+            warm.search(query)
+        return {
+            **stats,
+            "build_seconds": round(build_seconds, 6),
+            "total_bytes": sum(path.stat().st_size for path in files),
+            "meta_bytes": files[0].stat().st_size,
+            "fetched_bytes": {query: _fetched_bytes(index_dir, query) for query in queries},
+            "cold_query_seconds": {
+                query: round(_best_of(repeat, lambda: bm.SearchIndex(index_dir).search(query)), 6)
+                for query in queries
+            },
+            "warm_query_seconds": {
+                query: round(_best_of(repeat, lambda: warm.search(query)), 6) for query in queries
+            },
+        }
+
+
+def measure_lunr(index_path: Path, queries: List[str], *, repeat: int) -> Optional[Dict[str, Any]]:
+    if not index_path.exists():
+        return None
+    raw = index_path.read_text(encoding="utf-8")
+    docs = json.loads(raw)["docs"]
+    result: Dict[str, Any] = {
+        "docs": len(docs),
+        "total_bytes": index_path.stat().st_size,
+        "parse_seconds": round(_best_of(repeat, lambda: json.loads(raw)), 6),
+    }
+    if lunr is None:
+        result["lunr"] = "not installed; pip install lunr to time index build and queries"
+        return result
+
+    def build() -> Any:
+        return lunr.lunr(ref="location", fields=("title", "text"), documents=json.loads(raw)["docs"])
+
+    index = build()
+    result["build_seconds"] = round(_best_of(repeat, build), 6)
+    result["warm_query_seconds"] = {
+        query: round(_best_of(repeat, lambda: index.search(query)), 6) for query in queries
+    }
+    # The browser pays for parsing and indexing on every page load before the first query.
+    result["cold_query_seconds"] = {
+        query: round(result["parse_seconds"] + result["build_seconds"] + seconds, 6)
+        for query, seconds in result["warm_query_seconds"].items()
+    }
+    return result
+
+
+def run(docs_root: Path, lunr_index: Path, queries: List[str], *, repeat: int) -> Dict[str, Any]:
+    return {
+        "queries": queries,
+        "sharded": measure_sharded(docs_root, queries, repeat=repeat),
+        "lunr": measure_lunr(lunr_index, queries, repeat=repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the sharded search index against lunr.")
+    parser.add_argument("--docs", type=Path, default=bm.DOCS_ROOT, help="Docs tree to index.")
+    parser.add_argument(
+        "--lunr-index", type=Path, default=DEFAULT_LUNR_INDEX, help="mkdocs search_index.json to compare with."
+    )
+    parser.add_argument("--query", action="append", dest="queries", help="Query to time (repeatable).")
+    parser.add_argument("--repeat", type=int, default=5, help="Keep the best of N timed runs.")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results.")
+    args = parser.parse_args()
+
+    results = run(args.docs, args.lunr_index, list(args.queries or DEFAULT_QUERIES), repeat=args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    sharded, lunr_stats = results["sharded"], results["lunr"]
+    print(
+        f"sharded: {sharded['docs']} pages, {sharded['terms']} terms, {sharded['shards']} shards, "
+        f"{sharded['total_bytes']:,} bytes ({sharded['meta_bytes']:,} in meta.json)"
+    )
+    if lunr_stats is None:
+        print(f"lunr: {args.lunr_index} not found; run `mkdocs build` first")
+    else:
+        print(f"lunr: {lunr_stats['docs']} sections, {lunr_stats['total_bytes']:,} bytes")
+        if "lunr" in lunr_stats:
+            print(f"lunr: {lunr_stats['lunr']}")
+    for query in results["queries"]:
+        line = (
+            f"{query!r:>24}: sharded fetch {sharded['fetched_bytes'][query]:>9,} B, "
+            f"cold {sharded['cold_query_seconds'][query] * 1000:7.2f} ms, "
+            f"warm {sharded['warm_query_seconds'][query] * 1000:6.3f} ms"
+        )
+        if lunr_stats is not None and "cold_query_seconds" in lunr_stats:
+            line += (
+                f" | lunr fetch {lunr_stats['total_bytes']:>9,} B, "
+                f"cold {lunr_stats['cold_query_seconds'][query] * 1000:7.2f} ms, "
+                f"warm {lunr_stats['warm_query_seconds'][query] * 1000:6.3f} ms"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:  # pragma: no cover
+        print(f"[bench_search] error: {exc}", file=sys.stderr)
+        sys.exit(1)
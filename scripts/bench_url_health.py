@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the resource URL health checker against local stand-in servers.
+
+Every simulated host is an HTTP/1.1 keep-alive server on its own 127.0.0.1
+port that answers after `--latency` seconds, so nothing leaves the machine.
+The checker runs cold (HEAD for every URL), then again with a zero max age
+so every URL is revalidated through If-None-Match, and a sample is timed
+one request at a time as the sequential baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+import build_manifest as bm
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    connections: Set[Tuple[str, int]] = set()
+    lock = threading.Lock()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self._answer()
+
+    def do_GET(self) -> None:
+        self._answer()
+
+    def _answer(self) -> None:
+        with self.lock:
+            self.connections.add(self.client_address)
+        if self.latency:
+            time.sleep(self.latency)
+        etag = '"v1"'
+        status = 304 if self.headers.get("If-None-Match") == etag else 200
+        if self.path.startswith("/missing"):
+            status = 404
+        body = b"" if status == 304 else b"ok"
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+
+def _start_hosts(count: int, latency: float) -> List[ThreadingHTTPServer]:
+    _StandInHandler.latency = latency
+    servers = []
+    for _ in range(count):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def _timed_check(urls: List[str], cache: Any, **options: Any) -> Tuple[float, Dict[str, Any]]:
+    _StandInHandler.connections = set()
+    start = time.perf_counter()
+    results = bm.check_urls(urls, cache=cache, **options)
+    return time.perf_counter() - start, results
+
+
+def run(*, urls: int, hosts: int, latency: float, host_interval: float, sample: int) -> Dict[str, Any]:
+    servers = _start_hosts(hosts, latency)
+    try:
+        ports = [server.server_address[1] for server in servers]
+        targets = [
+            f"http://127.0.0.1:{ports[index % hosts]}/{'missing' if index % 50 == 0 else 'page'}/{index}"
+            for index in range(urls)
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = bm._UrlHealthCache(Path(tmp) / "url_health.ndjson")
+            cold_seconds, results = _timed_check(targets, cache, host_interval=host_interval)
+            cold_connections = len(_StandInHandler.connections)
+            cache.save()
+
+            warm = bm._UrlHealthCache.load(cache.path)
+            revalidate_seconds, _ = _timed_check(targets, warm, host_interval=host_interval, max_age=0)
+
+            sequential = bm._UrlHealthCache(Path(tmp) / "sequential.ndjson")
+            sequential_seconds, _ = _timed_check(
+                targets[:sample], sequential, host_interval=0, concurrency=1, per_host=1
+            )
+        return {
+            "urls": urls,
+            "hosts": hosts,
+            "latency_seconds": latency,
+            "host_interval_seconds": host_interval,
+            "cold_seconds": round(cold_seconds, 4),
+            "cold_urls_per_second": round(urls / cold_seconds, 1),
+            "connections_opened": cold_connections,
+            "broken": sum(1 for check in results.values() if not check.ok),
+            "revalidate_seconds": round(revalidate_seconds, 4),
+            "revalidated": warm.revalidated,
+            "sequential_estimate_seconds": round(sequential_seconds / sample * urls, 2) if sample else None,
+        }
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the URL health checker on local stand-in hosts.")
+    parser.add_argument("--urls", type=int, default=3000, help="URLs to check.")
+    parser.add_argument("--hosts", type=int, default=50, help="Stand-in hosts the URLs are spread over.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds each stand-in takes to answer.")
+    parser.add_argument(
+        "--host-interval",
+        type=float,
+        default=bm.URL_CHECK_HOST_INTERVAL,
+        help="Seconds between request starts on one host.",
+    )
+    parser.add_argument("--sample", type=int, default=100, help="URLs timed sequentially for the baseline.")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results.")
+    args = parser.parse_args()
+
+    results = run(
+        urls=args.urls,
+        hosts=args.hosts,
+        latency=args.latency,
+        host_interval=args.host_interval,
+        sample=min(args.sample, args.urls),
+    )
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(
+        f"{results['urls']} URLs on {results['hosts']} hosts ({results['latency_seconds'] * 1000:.0f} ms latency): "
+        f"cold {results['cold_seconds']:.2f} s ({results['cold_urls_per_second']:,.0f} URL/s, "
+        f"{results['connections_opened']} connections), revalidation {results['revalidate_seconds']:.2f} s, "
+        f"{results['broken']} broken; one at a time ~{results['sequential_estimate_seconds']} s"
+    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:  # pragma: no cover
+        print(f"[bench_url_health] error: {exc}", file=sys.stderr)
+        sys.exit(1)
@@ -5,572 +5,560 @@ the landing pages (home, Brain Dump, section indexes) with dynamic cards.
 
 The script is intentionally data-first: every Markdown page is described in the
 manifest so that navigation components can stay in sync without manual edits.
+
+This module assembles the manifest, federates other roots into it and drives
+the build from the command line; parsing, the item model, schemas, indexes,
+the graph, serialization, pages, archives, cards, search, duplicates, related
+items, URL checks, watch mode and the profiler live in the `manifest_*.py`
+modules next to it.
 """
 
 from __future__ import annotations
 
 import argparse
 import datetime as dt
+import hashlib
+import heapq
 import json
 import os
-import re
 import sys
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
-
-
-try:
-    import yaml  # type: ignore
-except ImportError:  # pragma: no cover - handled at runtime
-    yaml = None  # Fallback handled in `_load_yaml`
-
-
-REPOSITORY_ROOT = Path(__file__).resolve().parents[1]
-DOCS_ROOT = REPOSITORY_ROOT / "docs"
-MANIFEST_PATH = REPOSITORY_ROOT / "data" / "content_manifest.json"
-
-
-def _simple_yaml_scalar(token: str) -> Any:
-    token = token.strip()
-    if not token:
-        return ""
-    if token in {"null", "Null", "NULL", "~"}:
-        return None
-    if token in {"true", "True", "TRUE"}:
-        return True
-    if token in {"false", "False", "FALSE"}:
-        return False
-    if token.startswith('"') and token.endswith('"'):
-        return token[1:-1]
-    if token.startswith("'") and token.endswith("'"):
-        return token[1:-1]
-    if token.startswith("[") and token.endswith("]"):
-        try:
-            return json.loads(token)
-        except json.JSONDecodeError:
-            return [item.strip() for item in token[1:-1].split(",") if item.strip()]
-    try:
-        if "." in token:
-            return float(token)
-        return int(token)
-    except ValueError:
-        return token
-
-
-def _simple_yaml_load(raw: str) -> Any:
-    lines = raw.splitlines()
-    index = 0
-
-    def parse_block(expected_indent: int) -> Dict[str, Any]:
-        nonlocal index
-        data: Dict[str, Any] = {}
-        while index < len(lines):
-            line = lines[index]
-            stripped = line.strip()
-            if not stripped or stripped.startswith("#"):
-                index += 1
-                continue
-            indent = len(line) - len(line.lstrip(" "))
-            if indent < expected_indent:
-                break
-            if indent > expected_indent:
-                raise ValueError(f"Unexpected indent at line {index + 1}: {line}")
-            if ":" not in stripped:
-                raise ValueError(f"Expected key:value at line {index + 1}: {line}")
-            key, remainder = stripped.split(":", 1)
-            key = key.strip()
-            remainder = remainder.strip()
-            index += 1
-            if remainder:
-                data[key] = _simple_yaml_scalar(remainder)
-                continue
-
-            # Peek next meaningful line to decide dict vs list.
-            values: Any
-            if index < len(lines):
-                next_line = lines[index]
-                while index < len(lines) and not next_line.strip():
-                    index += 1
-                    if index < len(lines):
-                        next_line = lines[index]
-                if index < len(lines):
-                    next_indent = len(next_line) - len(next_line.lstrip(" "))
-                    next_stripped = next_line.strip()
-                    if next_stripped.startswith("- "):
-                        values = parse_list(next_indent)
-                    else:
-                        values = parse_block(next_indent)
-                else:
-                    values = {}
-            else:
-                values = {}
-            data[key] = values
-        return data
-
-    def parse_list(expected_indent: int) -> List[Any]:
-        nonlocal index
-        items: List[Any] = []
-        while index < len(lines):
-            line = lines[index]
-            stripped = line.strip()
-            if not stripped:
-                index += 1
-                continue
-            indent = len(line) - len(line.lstrip(" "))
-            if indent < expected_indent:
-                break
-            if not stripped.startswith("- "):
-                break
-            payload = stripped[2:].strip()
-            index += 1
-
-            # Check if payload is key:value (inline dict item)
-            if payload and ":" in payload:
-                # This could be an inline dict item like "- key: value"
-                # or start of a nested block like "- title: value"
-                # Check if next line is indented more (nested block)
-                if index < len(lines):
-                    next_line = lines[index]
-                    if next_line.strip() and not next_line.strip().startswith("- "):
-                        next_indent = len(next_line) - len(next_line.lstrip(" "))
-                        if next_indent > indent:
-                            # Nested block - parse the first key:value inline, then the rest as block
-                            key, value = payload.split(":", 1)
-                            block_data = {key.strip(): _simple_yaml_scalar(value)}
-                            block_data.update(parse_block(next_indent))
-                            items.append(block_data)
-                            continue
-                # Simple inline key:value
-                items.append(_simple_yaml_scalar(payload))
-            elif payload:
-                items.append(_simple_yaml_scalar(payload))
-            else:
-                # Nested structure with empty payload
-                if index >= len(lines):
-                    items.append({})
-                    break
-                next_line = lines[index]
-                next_indent = len(next_line) - len(next_line.lstrip(" "))
-                if next_line.strip().startswith("- "):
-                    items.append(parse_list(next_indent))
-                else:
-                    items.append(parse_block(next_indent))
-        return items
-
-    # Decide if root is list or dict
-    while index < len(lines) and not lines[index].strip():
-        index += 1
-    if index < len(lines) and lines[index].lstrip().startswith("- "):
-        return parse_list(len(lines[index]) - len(lines[index].lstrip(" ")))
-    index = 0
-    return parse_block(0)
-
-
-def _load_yaml_any(raw: str) -> Any:
-    if not raw.strip():
-        return {}
-    if yaml is not None:
-        return yaml.safe_load(raw)
-    return _simple_yaml_load(raw)
-
-
-def _load_yaml(raw: str) -> Dict[str, Any]:
-    """Loads YAML mapping using PyYAML when available, otherwise a minimal parser."""
-    if not raw.strip():
-        return {}
-    loaded = _load_yaml_any(raw)
-    if loaded is None:
-        return {}
-    if not isinstance(loaded, dict):
-        raise ValueError("Front matter must be a mapping at the top level.")
-    return loaded
-
-
-def _parse_markdown(path: Path) -> Tuple[Dict[str, Any], str]:
-    """Returns (front_matter, body) for a Markdown file."""
-    content = path.read_text(encoding="utf-8")
-    if not content.startswith("---"):
-        return {}, content
-    # Split on the first two occurrences of `---`
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return {}, content
-    _, fm_raw, rest = parts
-    front_matter = _load_yaml(fm_raw)
-    body = rest.lstrip("\n")
-    return front_matter, body
-
-
-def _ensure_date(value: Optional[str], fallback: Optional[str] = None) -> str:
-    """Validates/normalises ISO dates."""
-    candidate = value or fallback
-    if not candidate:
-        return dt.date.today().isoformat()
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import manifest_output
+import manifest_profile
+
+# Each subsystem lives in its own manifest_*.py module; the names below stay
+# importable from build_manifest for the bench scripts and existing callers.
+from manifest_archive import ARCHIVE_DIR, ARCHIVE_INDEXES, ARCHIVE_PAGE_SIZE, _ArchiveLayout, regenerate_archives
+from manifest_cards import CARD_CACHE_PATH, _card_grid, _card_related, _card_signature, _CardCache
+from manifest_common import (
+    CACHE_DIR,
+    DOCS_ROOT,
+    MANIFEST_SCHEMA_PATH,
+    REPOSITORY_ROOT,
+    RESOURCES_CATALOG_DIR,
+    RESOURCES_KEY,
+    SECTION_PAGES,
+    SECTIONS,
+    ManifestBuildError,
+    _consume_front_matter,
+    _encode_json_string,
+    _is_resource_key,
+    _known_doc_paths,
+    _read_front_matter,
+    _slugify,
+)
+from manifest_duplicates import _collect_signatures, _MinHashStore, _write_duplicates_report, find_near_duplicates
+from manifest_graph import DanglingLinksError, _find_dangling_links, _normalize_doc_path, _RelationGraph
+from manifest_indexes import _build_indexes, _index_specs, _IndexState
+from manifest_items import ManifestItem, _as_list, _ensure_date
+from manifest_json import (
+    MANIFEST_PATH,
+    NDJSON_FORMAT,
+    NDJSON_MANIFEST_PATH,
+    _iter_manifest_json,
+    _serialize_manifest,
+    _stable_generated_at,
+    _write_manifest_ndjson,
+    _write_manifest_outputs,
+    _write_query_index,
+    iter_manifest_items,
+    read_manifest_header,
+)
+from manifest_output import BUILD_STATE_PATH, _OutputStore, _write_chunks_if_changed, _write_if_changed
+from manifest_pages import _render_pages, regenerate_pages
+from manifest_parse import (
+    PARSE_CACHE_PATH,
+    PARSE_CACHE_VERSION,
+    _collect_markdown_items,
+    _collect_resources,
+    _discover_markdown,
+    _iter_resource_entries,
+    _ParseCache,
+)
+from manifest_profile import PROFILE_TRACE_PATH, _count, _print_profile, _Profiler, _span
+from manifest_related import RELATED_CACHE_PATH, RELATED_CARD_LIMIT, RELATED_TOP_K, _RelatedCache, suggest_related
+from manifest_schema import (
+    _SCHEMA_KEBAB,
+    SCHEMA_SECTIONS,
+    SECTION_SCHEMA_FILE,
+    SchemaValidationError,
+    _print_schema_report,
+    _schema_fingerprint,
+    _SchemaReport,
+)
+from manifest_search import SEARCH_INDEX_DIR, SearchIndex, build_search_index
+from manifest_urls import (
+    URL_CHECK_HOST_INTERVAL,
+    URL_HEALTH_CACHE_PATH,
+    HttpResponse,
+    UrlCheck,
+    _resource_urls,
+    _UrlHealthCache,
+    check_urls,
+)
+from manifest_watch import (
+    SECTION_TYPES,
+    WATCH_FLUSH_DELAY,
+    _InotifyWatcher,
+    _is_watched,
+    _PollingWatcher,
+    _scan_watched,
+    _WatchSession,
+    watch,
+)
+from manifest_yaml import _fast_yaml_load, _load_yaml, _load_yaml_any, _parse_markdown, _simple_yaml_load, _UnsupportedYaml, yaml
+
+MINHASH_CACHE_PATH = CACHE_DIR / "minhash_cache.ndjson"
+FEDERATION_DIR = CACHE_DIR / "federation"
+FEDERATION_STREAM_VERSION = 2
+DUPLICATES_REPORT_PATH = REPOSITORY_ROOT / "data" / "content_duplicates.json"
+
+
+def build_manifest(
+    *,
+    full: bool = False,
+    jobs: int = 1,
+    docs_root: Path = DOCS_ROOT,
+    cache_path: Path = PARSE_CACHE_PATH,
+    minhash: Optional[_MinHashStore] = None,
+    schema: Optional[_SchemaReport] = None,
+) -> Dict[str, Any]:
+    with _span("cache load"):
+        cache = _ParseCache.load(cache_path, full=full, schemas=_schema_fingerprint(docs_root))
     try:
-        # Accept both date and datetime strings.
-        return dt.datetime.fromisoformat(candidate).date().isoformat()
-    except ValueError:
-        raise ValueError(f"Expected ISO date, got '{candidate}'")
+        items = _collect_markdown_items(cache, jobs=jobs, docs_root=docs_root, minhash=minhash, schema=schema)
+        with _span("resources"):
+            _collect_resources(items, docs_root=docs_root, cache=cache, schema=schema)
+    finally:
+        with _span("cache save"):
+            cache.save()
+            if minhash is not None:
+                minhash.save()
+    return _assemble_manifest(items)
+
+
+def _assemble_manifest(items: List[ManifestItem], *, ordered: bool = False) -> Dict[str, Any]:
+    """Builds the manifest around `items`; `ordered` items are already in (type, slug) order."""
+    if ordered:
+        items_sorted = items
+    else:
+        with _span("sort", items=len(items)):
+            items_sorted = sorted(items, key=lambda item: (item.type, item.slug))
+    manifest = {
+        "version": 1,
+        "generated_at": dt.datetime.utcnow().isoformat() + "Z",
+        "items": items_sorted,
+    }
+    with _span("indexes"):
+        manifest["indexes"] = _build_indexes(manifest["items"], _index_specs())
+    with _span("graph"):
+        manifest["graph"] = _RelationGraph.build(manifest["items"])
+    return manifest
 
 
-def _slugify(value: str) -> str:
-    value = value.strip().lower()
-    value = re.sub(r"[^a-z0-9\-]+", "-", value)
-    value = re.sub(r"-{2,}", "-", value)
-    return value.strip("-")
+class FederatedRoot(NamedTuple):
+    """Another garden repository mounted into this one's manifest under `<name>/`."""
 
+    name: str
+    root: Path
 
-def _as_list(value: Optional[Any]) -> List[Any]:
-    if value is None:
-        return []
-    if isinstance(value, list):
-        return value
-    return [value]
+    @classmethod
+    def parse(cls, spec: str) -> "FederatedRoot":
+        """Reads `NAME=PATH` or `PATH`, which is named after its folder."""
+        name, separator, path = spec.partition("=")
+        root = Path(path if separator else spec).expanduser().resolve()
+        name = (name if separator else root.name).strip("/")
+        if not _SCHEMA_KEBAB.match(name):
+            raise ValueError(f"root name {name!r} must be kebab-case")
+        if not (root / "docs").is_dir():
+            raise ValueError(f"{root} has no docs/ folder")
+        return cls(name, root)
 
 
-def _write_if_changed(path: Path, content: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    if path.exists() and path.read_text(encoding="utf-8") == content:
-        return
-    path.write_text(content, encoding="utf-8")
+class _RootResult(NamedTuple):
+    name: str
+    stream: str
+    items: int
+    problems: List[Tuple[str, str]]
+    known_paths: List[str]
 
 
-def _escape_html(value: str) -> str:
-    return (
-        value.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&#39;")
-    )
+def _mount_item(fields: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """Moves an item and its docs references under `<name>/`; URLs and blanks are kept as they are."""
+    source = fields["path"]
 
+    def mount(raw: Any) -> Any:
+        path = _normalize_doc_path(raw, source=source)
+        return f"{name}/{path}" if path else raw
 
-def _relative_item_link(item: Dict[str, Any], *, context_path: str) -> str:
-    context_dir = Path(context_path).parent
-    target_path = Path(item["path"])
-    relative = os.path.relpath(target_path, context_dir).replace("\\", "/")
-    if relative.endswith("README.md"):
-        relative = relative[: -len("README.md")]
-    elif relative.endswith(".md"):
-        relative = relative[: -3]
-    if not relative.endswith("/"):
-        relative = relative + "/"
-    if not relative.startswith("."):
-        return f"./{relative}"
-    return relative
-
-
-def _card_grid(items: List[Dict[str, Any]], *, context_path: str) -> str:
-    if not items:
-        return "_No entries yet._"
-    lines = ['<div class="kg-grid">']
-    for item in items:
-        tags = item.get("tags", [])[:3]
-        tag_html = "".join(
-            f'<span class="kg-badge">{_escape_html(tag)}</span>' for tag in tags
-        )
-        link = _relative_item_link(item, context_path=context_path)
-        lines.extend(
-            [
-                '  <div class="kg-card">',
-                f'    <div class="kg-card__type">{item["type"].title()}</div>',
-                f'    <h3><a href="{link}">{_escape_html(item["title"])}</a></h3>',
-                f'    <p class="kg-card__summary">{_escape_html(item.get("summary", ""))}</p>',
-                "    <div class=\"kg-card__meta\">",
-                f'      <span class="kg-badge kg-badge--status">{_escape_html(item.get("status", "draft").title())}</span>',
-                f'      <span class="kg-badge kg-badge--date">{_escape_html(item.get("updated_at", ""))}</span>',
-                f"      {tag_html}",
-                "    </div>",
-                "  </div>",
-            ]
-        )
-    lines.append("</div>")
-    return "\n".join(lines)
-
-
-@dataclass
-class ManifestItem:
-    id: str
-    type: str
-    title: str
-    slug: str
-    summary: str
-    status: str
-    tags: List[str]
-    themes: List[str]
-    created_at: str
-    updated_at: str
-    path: str
-    origin_note: Optional[str]
-    promotions: List[str] = field(default_factory=list)
-    relationships: Dict[str, List[str]] = field(default_factory=dict)
-
-    def as_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "type": self.type,
-            "title": self.title,
-            "slug": self.slug,
-            "summary": self.summary,
-            "status": self.status,
-            "tags": self.tags,
-            "themes": self.themes,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at,
-            "path": self.path,
-            "origin_note": self.origin_note,
-            "promotions": self.promotions,
-            "relationships": self.relationships,
-        }
-
-
-def _collect_markdown_items() -> List[ManifestItem]:
-    items: List[ManifestItem] = []
-    section_map = {
-        "notes": ("note", DOCS_ROOT / "notes"),
-        "patterns": ("pattern", DOCS_ROOT / "patterns"),
-        "guide": ("guide", DOCS_ROOT / "guide"),
-        "snippets": ("snippet", DOCS_ROOT / "snippets"),
-        "examples": ("example", DOCS_ROOT / "examples"),
+    fields["path"] = f"{name}/{source}"
+    fields["origin_note"] = mount(fields["origin_note"]) if fields["origin_note"] else fields["origin_note"]
+    fields["promotions"] = [mount(target) for target in fields["promotions"]]
+    fields["relationships"] = {
+        kind: [mount(target) for target in targets] for kind, targets in fields["relationships"].items()
     }
+    return fields
 
-    for section, (content_type, base_path) in section_map.items():
-        for path in sorted(base_path.rglob("*.md")):
-            if path.name.lower() in {"readme.md", "index.md"}:
-                continue
-            if path.name == "section_file_schema.yml":
-                continue
-            front_matter, _ = _parse_markdown(path)
-            if not front_matter:
-                continue
-
-            title = front_matter.get("title") or path.stem.replace("-", " ").title()
-            slug = front_matter.get("slug") or _slugify(title)
-            summary = front_matter.get("summary") or ""
-            tags = _as_list(front_matter.get("tags"))
-            themes = _as_list(front_matter.get("themes") or front_matter.get("theme"))
-            relationships = front_matter.get("relationships") or {}
-
-            created_at = _ensure_date(front_matter.get("created_at"))
-            updated_at = _ensure_date(front_matter.get("updated_at"), fallback=created_at)
-
-            origin_note: Optional[str] = None
-            if content_type == "note":
-                origin_note = f"notes/{path.name}"
-            else:
-                origin_note = front_matter.get("origin_note") or (
-                    front_matter.get("source", {}) if isinstance(front_matter.get("source"), dict) else None
-                )
-                if isinstance(origin_note, dict):
-                    origin_note = origin_note.get("origin_note") or origin_note.get("note")
-
-            promotes_to = []
-            if content_type == "note":
-                rel = front_matter.get("relationships") or {}
-                promotes_to = rel.get("promotes_to") or []
-
-            manifest_path = path.relative_to(DOCS_ROOT).as_posix()
-
-            item = ManifestItem(
-                id=f"{content_type}:{slug}",
-                type=content_type,
-                title=title,
-                slug=slug,
-                summary=summary,
-                status=front_matter.get("status", "draft"),
-                tags=tags,
-                themes=themes or ["core/unsorted"],
-                created_at=created_at,
-                updated_at=updated_at,
-                path=manifest_path,
-                origin_note=origin_note,
-                promotions=_as_list(promotes_to),
-                relationships={
-                    key: _as_list(value) for key, value in (relationships or {}).items()
-                },
-            )
-            items.append(item)
-    return items
 
+def _collect_root(task: Tuple[str, str, str, str, bool]) -> _RootResult:
+    """Collects one federated root into a (type, slug)-sorted item stream; runs on a worker process.
 
-def _collect_resources(items: List[ManifestItem]) -> None:
-    links_path = DOCS_ROOT / "resources" / "links.md"
-    if not links_path.exists():
-        return
-    raw = links_path.read_text(encoding="utf-8")
-    raw = raw.strip()
-    if not raw:
-        return
-    parsed = _load_yaml_any(raw)
-    if not isinstance(parsed, list):
-        raise ValueError("resources/links.md must contain a YAML list.")
-    for entry in parsed:
-        if not isinstance(entry, dict):
-            continue
-        title = entry.get("title")
-        url = entry.get("url")
-        if not title or not url:
-            continue
-        slug = _slugify(title)
-        created_at = entry.get("added_at") or dt.date.today().isoformat()
-        item = ManifestItem(
-            id=f"resource:{slug}",
-            type="resource",
-            title=title,
-            slug=slug,
-            summary=entry.get("summary") or entry.get("insight") or "",
-            status="curated",
-            tags=_as_list(entry.get("tags")),
-            themes=_as_list(entry.get("type")),
-            created_at=_ensure_date(created_at),
-            updated_at=_ensure_date(entry.get("added_at"), fallback=created_at),
-            path="resources/links.md",
-            origin_note=entry.get("origin_note") or entry.get("from_note"),
-            promotions=[],
-            relationships={},
-        )
-        items.append(item)
-
+    The root keeps its own parse cache, and the stream is only rewritten
+    when its content changed, so an untouched root costs a stat per file.
+    """
+    name, docs_root_str, cache_path, stream_path, full = task
+    docs_root = Path(docs_root_str)
+    schema = _SchemaReport()
+    cache = _ParseCache.load(Path(cache_path), full=full, schemas=_schema_fingerprint(docs_root))
+    try:
+        items = _collect_markdown_items(cache, docs_root=docs_root, schema=schema)
+        _collect_resources(items, docs_root=docs_root, cache=cache, schema=schema)
+    finally:
+        cache.save()
+    items.sort(key=lambda item: (item.type, item.slug))
 
-def build_manifest() -> Dict[str, Any]:
-    items = _collect_markdown_items()
-    _collect_resources(items)
-    items_sorted = sorted(items, key=lambda item: (item.type, item.slug))
-    manifest = {
-        "version": 1,
-        "generated_at": dt.datetime.utcnow().isoformat() + "Z",
-        "items": [item.as_dict() for item in items_sorted],
-    }
-    return manifest
+    lines = []
+    for item in items:
+        fields = item.as_dict()
+        if item.url is not None:
+            fields["url"] = item.url
+        lines.append(json.dumps(_mount_item(fields, name) if name else fields, ensure_ascii=False) + "\n")
+    digest = hashlib.sha256("".join(lines).encode("utf-8")).hexdigest()
+    stream = Path(stream_path)
+    header = {"version": FEDERATION_STREAM_VERSION, "root": name, "sha256": digest}
+    try:
+        with stream.open("r", encoding="utf-8") as handle:
+            current = json.loads(handle.readline() or "{}") == header
+    except (OSError, ValueError):
+        current = False
+    if full or not current:
+        stream.parent.mkdir(parents=True, exist_ok=True)
+        temporary = stream.with_suffix(".tmp")
+        with temporary.open("w", encoding="utf-8") as handle:
+            handle.write(json.dumps(header) + "\n")
+            handle.writelines(lines)
+        os.replace(temporary, stream)
+
+    prefix = f"{name}/" if name else ""
+    return _RootResult(
+        name,
+        str(stream),
+        len(items),
+        [(prefix + key, message) for key, message in schema.finish()],
+        [prefix + path for path in _known_doc_paths(docs_root)] if name else [],
+    )
 
 
-def _select(items: Iterable[Dict[str, Any]], *, item_type: Optional[str] = None) -> List[Dict[str, Any]]:
-    data = [item for item in items if item_type is None or item["type"] == item_type]
-    return sorted(data, key=lambda x: x.get("updated_at", ""), reverse=True)
+def _read_root_stream(path: str, name: str) -> Iterator[Tuple[str, ManifestItem]]:
+    with open(path, "r", encoding="utf-8") as handle:
+        handle.readline()
+        for line in handle:
+            yield name, ManifestItem(**json.loads(line))
 
 
-def _format_theme(theme: str) -> str:
-    cleaned = theme.replace("_", " ").replace("-", " ").replace("/", " / ")
-    parts = [part.capitalize() for part in cleaned.split()]
-    return " ".join(parts)
+def _merge_roots(
+    streams: List[Iterator[Tuple[str, ManifestItem]]],
+) -> Tuple[List[ManifestItem], List[ManifestItem], List[Tuple[str, str]]]:
+    """K-way merges per-root sorted streams into (items, this repository's items, id collisions).
 
+    Ties keep root order, so ids are `type:slug` and every clash is adjacent:
+    the first root keeps the id and later roots get `<id>@<root>`.
+    """
+    items: List[ManifestItem] = []
+    local: List[ManifestItem] = []
+    collisions: List[Tuple[str, str]] = []
+    owner_id, owner = None, ""
+    for name, item in heapq.merge(*streams, key=lambda entry: (entry[1].type, entry[1].slug)):
+        if item.id != owner_id:
+            owner_id, owner = item.id, name
+        elif name != owner:
+            item.id = f"{owner_id}@{name}"
+            collisions.append(
+                (item.path, f"id {owner_id!r} is also defined in {owner or 'this repository'}; renamed to {item.id!r}")
+            )
+        items.append(item)
+        if not name:
+            local.append(item)
+    return items, local, collisions
+
+
+def build_federated_manifest(
+    roots: List[FederatedRoot],
+    *,
+    full: bool = False,
+    docs_root: Path = DOCS_ROOT,
+    cache_path: Path = PARSE_CACHE_PATH,
+    state_dir: Path = FEDERATION_DIR,
+    schema: Optional[_SchemaReport] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any], Set[str], List[Tuple[str, str]]]:
+    """Builds one manifest over `docs_root` plus every mounted root.
+
+    Roots are collected concurrently, one process each, and their sorted
+    streams are merged instead of re-sorted, so a build takes about as long
+    as its slowest root. Returns (manifest, manifest of this repository's
+    own items, known docs paths, id collisions); the landing pages render
+    from the second, since mounted items live outside docs_dir.
+    """
+    tasks = [("", str(docs_root), str(cache_path), str(state_dir / "home.ndjson"), full)]
+    for root in roots:
+        mounted = state_dir / "roots" / root.name
+        tasks.append(
+            (root.name, str(root.root / "docs"), str(mounted / "parse_cache.ndjson"), str(mounted / "items.ndjson"), full)
+        )
+    workers = min(len(tasks), os.cpu_count() or 1)
+    with _span("roots", roots=len(tasks)):
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_collect_root, tasks))
+        else:
+            results = list(map(_collect_root, tasks))
+    known = _known_doc_paths(docs_root)
+    for result in results:
+        known.update(result.known_paths)
+        if schema is not None:
+            schema.merge(result.problems)
+    with _span("merge", items=sum(result.items for result in results)):
+        items, local, collisions = _merge_roots([_read_root_stream(result.stream, result.name) for result in results])
+    return _assemble_manifest(items, ordered=True), _assemble_manifest(local, ordered=True), known, collisions
 
-def _render_home(manifest: Dict[str, Any]) -> str:
-    items = manifest["items"]
-    notes = _select(items, item_type="note")[:6]
-    promos = [
-        item
-        for item in manifest["items"]
-        if item["type"] in {"pattern", "guide", "snippet", "example"}
-    ]
-    promos = sorted(promos, key=lambda x: x.get("updated_at", ""), reverse=True)[:6]
 
-    overview = (
-        "**Agentic Knowledge Garden** é um brain dump evolutivo sobre agentes de IA. "
-        "Cada nota nasce no Brain Dump, cria conexões e promove conteúdo reutilizável."
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build content manifest and landing pages.")
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Suppress console output.",
     )
-
-    sections = [
-        "# Agentic Knowledge Garden",
-        overview,
-        "",
-        "## Brain Dump Highlights",
-        _card_grid(notes, context_path="index.md"),
-        "",
-        "## Freshly Promoted",
-        _card_grid(promos, context_path="index.md"),
-        "",
-        "## Explore Pillars",
-        "- Brain Dump → ideias brutas e sinais.",
-        "- Patterns → soluções recorrentes comentadas.",
-        "- Guides → fundamentos organizados por tema.",
-        "- Resources → referências externas curadas.",
-        "- Snippets → blocos de código mínimos.",
-        "- Examples → fluxos reprodutíveis.",
-        "",
-        "> Tudo nasce de uma nota. Explore, combine, promova.",
-    ]
-    return "\n".join(sections) + "\n"
-
-
-def _render_notes_index(manifest: Dict[str, Any]) -> str:
-    notes = _select(manifest["items"], item_type="note")
-    latest = notes[:8]
-
-    sections = [
-        "---",
-        'title: "Brain Dump"',
-        'summary: "Notas brutas que alimentam todo o jardim."',
-        "---",
-        "",
-        "# Brain Dump",
-        "Notas recentes e sinais que evoluem em padrões, guias e recursos.",
-        "",
-        "## Last Updates",
-        _card_grid(latest, context_path="notes/README.md"),
-    ]
-    return "\n".join(sections) + "\n"
-
-
-def _render_section_index(manifest: Dict[str, Any], *, item_type: str, heading: str, folder: str) -> str:
-    items = _select(manifest["items"], item_type=item_type)
-    latest = items[:8]
-    sections = [
-        f"# {heading}",
-        "",
-        "## Latest",
-        _card_grid(latest, context_path=f"{folder}/README.md"),
-    ]
-    return "\n".join(sections) + "\n"
-
-
-def regenerate_pages(manifest: Dict[str, Any]) -> None:
-    _write_if_changed(MANIFEST_PATH, json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
-    _write_if_changed(DOCS_ROOT / "index.md", _render_home(manifest))
-    _write_if_changed(DOCS_ROOT / "notes" / "README.md", _render_notes_index(manifest))
-    _write_if_changed(
-        DOCS_ROOT / "patterns" / "README.md",
-        _render_section_index(manifest, item_type="pattern", heading="Patterns", folder="patterns"),
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the parse cache and re-parse every Markdown file.",
     )
-    _write_if_changed(
-        DOCS_ROOT / "snippets" / "README.md",
-        _render_section_index(manifest, item_type="snippet", heading="Snippets", folder="snippets"),
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Parse Markdown files on N worker processes (0 = one per CPU).",
     )
-    _write_if_changed(
-        DOCS_ROOT / "examples" / "README.md",
-        _render_section_index(manifest, item_type="example", heading="Examples", folder="examples"),
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay resident and rebuild only what changes under docs/.",
     )
-    _write_if_changed(
-        DOCS_ROOT / "guide" / "README.md",
-        _render_section_index(manifest, item_type="guide", heading="Guides", folder="guide"),
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        metavar="SECONDS",
+        help="With --watch, poll file stats at this interval instead of using inotify.",
     )
-    _write_if_changed(
-        DOCS_ROOT / "resources" / "README.md",
-        _render_section_index(manifest, item_type="resource", heading="Resources", folder="resources"),
+    parser.add_argument(
+        "--format",
+        choices=("json", "ndjson", "both"),
+        default="json",
+        help="Manifest output: content_manifest.json, streaming content_manifest.ndjson, or both.",
     )
-
-
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Build content manifest and landing pages.")
     parser.add_argument(
-        "--quiet",
+        "--search-index",
         action="store_true",
-        help="Suppress console output.",
+        help="Also write the sharded BM25 search index under docs/assets/search/.",
+    )
+    parser.add_argument(
+        "--find-duplicates",
+        action="store_true",
+        help="Report near-duplicate Markdown bodies (MinHash/LSH) in data/content_duplicates.json.",
+    )
+    parser.add_argument(
+        "--archive-page-size",
+        type=int,
+        default=ARCHIVE_PAGE_SIZE,
+        metavar="N",
+        help=f"Items per archive page under docs/{ARCHIVE_DIR}/ (default: {ARCHIVE_PAGE_SIZE}).",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=Path,
+        const=PROFILE_TRACE_PATH,
+        metavar="TRACE",
+        help="Record per-phase and per-file timings as a Chrome trace (default: .cache/build_manifest/profile_trace.json).",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="With --profile, list the N slowest files to parse.",
+    )
+    parser.add_argument(
+        "--check-urls",
+        action="store_true",
+        help="Check every resource URL concurrently and write the result into the resource items.",
+    )
+    parser.add_argument(
+        "--related",
+        action="store_true",
+        help="Suggest related items from TF-IDF similarity of tags, themes and bodies (needs numpy and scipy).",
+    )
+    parser.add_argument(
+        "--root",
+        action="append",
+        dest="roots",
+        default=[],
+        metavar="[NAME=]PATH",
+        help="Federate another garden repository into this manifest, mounted under NAME/ (repeatable).",
+    )
+    parser.add_argument(
+        "--strict-schema",
+        action="store_true",
+        help="Fail the build when front matter or catalog entries break their section_file_schema.yml.",
+    )
+    parser.add_argument(
+        "--allow-dangling-links",
+        action="store_true",
+        help="Report references to missing docs files as warnings instead of failing the build.",
     )
     args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    manifest_path = MANIFEST_PATH if args.format in {"json", "both"} else None
+    ndjson_path = NDJSON_MANIFEST_PATH if args.format in {"ndjson", "both"} else None
+
+    if args.archive_page_size < 1:
+        parser.error("--archive-page-size must be at least 1.")
+    if args.watch and args.profile is not None:
+        parser.error("--profile profiles a single build and cannot be combined with --watch.")
+    try:
+        roots = [FederatedRoot.parse(spec) for spec in args.roots]
+    except ValueError as exc:
+        parser.error(f"--root: {exc}")
+    if len({root.name for root in roots}) != len(roots):
+        parser.error("--root names must be unique.")
+    if roots and (args.watch or args.find_duplicates or args.search_index or args.related):
+        parser.error("--root cannot be combined with --watch, --find-duplicates, --search-index or --related.")
+    if args.watch and args.related:
+        parser.error("--related scores the whole garden and cannot be combined with --watch.")
+    if args.watch:
+        watch(
+            manifest_path=manifest_path,
+            ndjson_path=ndjson_path,
+            archive_page_size=args.archive_page_size,
+            jobs=jobs,
+            poll_interval=args.poll_interval,
+            quiet=args.quiet,
+        )
+        return
 
-    manifest = build_manifest()
-    regenerate_pages(manifest)
-
-    if not args.quiet:
-        print(f"Manifest generated with {len(manifest['items'])} items.")
-        print(f"Wrote manifest to {MANIFEST_PATH.relative_to(REPOSITORY_ROOT)}")
+    profiler = manifest_profile.PROFILER = _Profiler() if args.profile is not None else None
+    manifest_output.OUTPUTS = outputs = _OutputStore.load(BUILD_STATE_PATH, full=args.full)
+    try:
+        minhash = _MinHashStore.load(MINHASH_CACHE_PATH, full=args.full) if args.find_duplicates else None
+        schema = _SchemaReport()
+        collisions: List[Tuple[str, str]] = []
+        if roots:
+            manifest, pages, known_paths, collisions = build_federated_manifest(roots, full=args.full, schema=schema)
+        else:
+            manifest = build_manifest(full=args.full, jobs=jobs, minhash=minhash, schema=schema)
+            pages, known_paths = manifest, None
+        manifest["generated_at"] = _stable_generated_at(manifest, outputs, (manifest_path, ndjson_path))
+        with _span("schema"):
+            problems = schema.finish()
+        if problems and args.strict_schema:
+            raise SchemaValidationError(problems)
+        if problems:
+            _print_schema_report(problems)
+        for path, message in collisions:
+            print(f"[build_manifest] warning: {path}: {message}", file=sys.stderr)
+        with _span("dangling links"):
+            dangling = _find_dangling_links(manifest, known_paths or _known_doc_paths(DOCS_ROOT))
+        if dangling and not args.allow_dangling_links:
+            raise DanglingLinksError(dangling)
+        for path, message in dangling:
+            print(f"[build_manifest] warning: {path}: {message}", file=sys.stderr)
+        url_cache = None
+        if args.check_urls:
+            with _span("url health"):
+                urls = _resource_urls(pages["items"])
+                url_cache = _UrlHealthCache.load(URL_HEALTH_CACHE_PATH, full=args.full)
+                results = check_urls(urls.values(), cache=url_cache)
+                url_cache.save()
+            manifest["health"] = {item_id: results[url].record() for item_id, url in urls.items()}
+            for url, check in sorted(results.items()):
+                if not check.ok:
+                    reason = check.error or f"HTTP {check.status}"
+                    print(f"[build_manifest] warning: {url}: {reason}", file=sys.stderr)
+        related = None
+        if args.related:
+            with _span("related"):
+                related = _RelatedCache.load(RELATED_CACHE_PATH, full=args.full)
+                manifest["related"] = suggest_related(manifest, cache=related)
+                related.save()
+        cards = _CardCache.load(CARD_CACHE_PATH, full=args.full)
+        regenerate_pages(manifest, manifest_path=manifest_path, ndjson_path=ndjson_path, cards=cards, pages=pages)
+        archived, removed = regenerate_archives(pages, page_size=args.archive_page_size, cards=cards)
+        cards.save()
+        _count("card cache hits", cards.hits)
+        _count("cards rendered", cards.misses)
+
+        search_stats = None
+        if args.search_index:
+            with _span("search index"):
+                search_stats = build_search_index(manifest)
+        clusters = None
+        if minhash is not None:
+            with _span("duplicates"):
+                clusters = find_near_duplicates(minhash.signatures)
+                _write_duplicates_report(DUPLICATES_REPORT_PATH, clusters, manifest)
+
+        if not args.quiet:
+            print(f"Manifest generated with {len(manifest['items'])} items.")
+            if roots:
+                print(
+                    f"Federation: {len(roots)} root(s) mounted under "
+                    f"{', '.join(root.name + '/' for root in roots)}; {len(collisions)} id collision(s) renamed"
+                )
+            if clusters is not None:
+                print(
+                    f"Duplicates: {len(clusters)} near-duplicate cluster(s) among {len(minhash.signatures)} bodies "
+                    f"written to {DUPLICATES_REPORT_PATH.relative_to(REPOSITORY_ROOT)}"
+                )
+            if url_cache is not None:
+                broken = sum(1 for check in url_cache.results.values() if not check.ok)
+                print(
+                    f"URL health: {len(url_cache.results)} URL(s), {url_cache.fresh} from cache, "
+                    f"{url_cache.revalidated} revalidated, {broken} broken"
+                )
+            if related is not None:
+                print(
+                    f"Related: top {RELATED_TOP_K} suggestions for {len(manifest['items'])} items, "
+                    f"{related.recomputed} recomputed"
+                )
+            if search_stats is not None:
+                print(
+                    f"Search index: {search_stats['docs']} pages, {search_stats['terms']} terms "
+                    f"in {search_stats['shards']} shards under {SEARCH_INDEX_DIR.relative_to(REPOSITORY_ROOT)}"
+                )
+            for path in (manifest_path, ndjson_path):
+                if path is not None:
+                    print(f"Wrote manifest to {path.relative_to(REPOSITORY_ROOT)}")
+            print(f"Archive: {len(archived)} page(s) written, {len(removed)} removed under docs/{ARCHIVE_DIR}/")
+    finally:
+        outputs.save()
+        if profiler is not None:
+            profiler.write(args.profile)
+            _print_profile(profiler, args.profile, top=args.profile_top)
 
 
 if __name__ == "__main__":
     try:
         main()
+    except ManifestBuildError as exc:  # pragma: no cover
+        for path, message in exc.errors:
+            print(f"[build_manifest] error: {path}: {message}", file=sys.stderr)
+        print(f"[build_manifest] {exc}", file=sys.stderr)
+        sys.exit(1)
     except Exception as exc:  # pragma: no cover
         print(f"[build_manifest] error: {exc}", file=sys.stderr)
         sys.exit(1)
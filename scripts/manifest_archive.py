@@ -0,0 +1,243 @@
+"""
+Paginated archives under docs/archive/: every item by type, tag and theme.
+
+Pages are rendered from the pre-sorted archive indexes of the manifest and
+share the landing pages' card cache; --watch re-renders only the pages an
+edit touches.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import posixpath
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import manifest_output
+from manifest_cards import _card_grid, _CardCache, _escape_html
+from manifest_common import DOCS_ROOT, SECTION_PAGES, _slugify
+from manifest_output import _write_if_changed
+from manifest_profile import _span
+
+if TYPE_CHECKING:
+    from manifest_items import ManifestItem
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_PAGE_SIZE = 24
+# Tag and theme archives as (manifest index, folder under ARCHIVE_DIR, heading).
+ARCHIVE_KINDS: Tuple[Tuple[str, str, str], ...] = (
+    ("archive_by_tag", "tags", "Tags"),
+    ("archive_by_theme", "themes", "Themes"),
+)
+ARCHIVE_INDEXES = ("archive_by_type", *(name for name, _, _ in ARCHIVE_KINDS))
+
+
+class _ArchiveGroup(NamedTuple):
+    key: Tuple[str, str]  # (archive index, group value), e.g. ("archive_by_tag", "memory")
+    kind: str  # heading of the group on the archive home, e.g. "Tags"
+    folder: str  # docs-relative, e.g. "archive/tags/memory"
+    label: str
+    positions: List[int]  # oldest first
+
+
+def _archive_slugs(values: Iterable[str]) -> Dict[str, str]:
+    """Maps tag or theme values to unique folder names."""
+    slugs: Dict[str, str] = {}
+    taken: Set[str] = set()
+    for value in values:
+        base = _slugify(value) or hashlib.sha1(value.encode("utf-8")).hexdigest()[:8]
+        slug, counter = base, 2
+        while slug in taken:
+            slug, counter = f"{base}-{counter}", counter + 1
+        taken.add(slug)
+        slugs[value] = slug
+    return slugs
+
+
+def _archive_groups(manifest: Dict[str, Any]) -> Iterator[_ArchiveGroup]:
+    """Yields the section archives (in landing page order) and then every tag and theme archive."""
+    by_type = manifest["indexes"]["archive_by_type"]
+    sections = [("note", "Brain Dump", "notes"), *SECTION_PAGES]
+    for item_type, heading, folder in sections:
+        yield _ArchiveGroup(
+            ("archive_by_type", item_type), "Sections", f"{ARCHIVE_DIR}/{folder}", heading, by_type.get(item_type, [])
+        )
+    for index_name, folder, kind in ARCHIVE_KINDS:
+        groups = manifest["indexes"][index_name]
+        for value, slug in _archive_slugs(groups).items():
+            yield _ArchiveGroup((index_name, value), kind, f"{ARCHIVE_DIR}/{folder}/{slug}", value, groups[value])
+
+
+def _archive_page_name(number: int) -> str:
+    return f"page-{number}.md"
+
+
+def _render_archive_page(
+    group: _ArchiveGroup,
+    number: int,
+    items: List[ManifestItem],
+    *,
+    last: bool,
+    cards: Optional[_CardCache] = None,
+) -> str:
+    """One archive page, newest first; it only mentions its neighbours so older pages stay untouched."""
+    # With directory URLs page-N.md is served from page-N/, one level below its folder.
+    context_path = f"{group.folder}/{_archive_page_name(number)[:-3]}/index.md"
+    pager = []
+    if number > 1:
+        pager.append(f"[← Older]({_archive_page_name(number - 1)})")
+    pager.append("[All pages](index.md)")
+    if not last:
+        pager.append(f"[Newer →]({_archive_page_name(number + 1)})")
+    sections = [
+        f"# {_escape_html(group.label)} · page {number}",
+        "",
+        f"Created {items[0].created_at} → {items[-1].created_at}.",
+        "",
+        _card_grid(items[::-1], context_path=context_path, cards=cards),
+        "",
+        " · ".join(pager),
+    ]
+    return "\n".join(sections) + "\n"
+
+
+def _render_archive_index(group: _ArchiveGroup, pages: List[Tuple[int, str, str, int]]) -> str:
+    lines = [
+        f"# {_escape_html(group.label)}",
+        "",
+        f"{len(group.positions)} item(s), newest pages first. [Back to the archive]({_archive_home_link(group)})",
+        "",
+    ]
+    if not pages:
+        lines.append("_No entries yet._")
+    for number, first, last, count in reversed(pages):
+        lines.append(f"- [Page {number}]({_archive_page_name(number)}) — {first} → {last} ({count})")
+    return "\n".join(lines) + "\n"
+
+
+def _archive_home_link(group: _ArchiveGroup) -> str:
+    return posixpath.relpath(f"{ARCHIVE_DIR}/index.md", group.folder)
+
+
+def _render_archive_home(groups: List[Tuple[str, str, str, int]]) -> str:
+    lines = ["# Archive", "", "Every item of the garden, paginated by section, tag and theme."]
+    current = None
+    for kind, folder, label, count in groups:
+        if kind != current:
+            current = kind
+            lines.extend(["", f"## {kind}", ""])
+        lines.append(f"- [{_escape_html(label)}]({folder[len(ARCHIVE_DIR) + 1 :]}/index.md) ({count})")
+    return "\n".join(lines) + "\n"
+
+
+def _remove_archive_file(path: Path) -> None:
+    path.unlink()
+    if manifest_output.OUTPUTS is not None:
+        manifest_output.OUTPUTS.forget(path)
+
+
+# {(archive index, group value): (folder, page count)} as last written.
+_ArchiveLayout = Dict[Tuple[str, str], Tuple[str, int]]
+
+
+def regenerate_archives(
+    manifest: Dict[str, Any],
+    *,
+    docs_root: Path = DOCS_ROOT,
+    page_size: int = ARCHIVE_PAGE_SIZE,
+    cards: Optional[_CardCache] = None,
+    touched: Optional[Dict[Tuple[str, str], Tuple[int, Optional[int]]]] = None,
+    layout: Optional[_ArchiveLayout] = None,
+) -> Tuple[List[str], List[str]]:
+    """Writes paginated archives under docs/archive/ and returns (written, removed) docs-relative paths.
+
+    Groups are streamed one page at a time from the pre-sorted archive
+    indexes. Unchanged pages are skipped by content hash, without being read
+    back when the build state is active; stale pages of vanished groups are
+    deleted.
+
+    --watch passes the `touched` groups of an edit as {(index, value): (first
+    rank, last rank or None for "to the end")} along with the `layout` kept
+    from the previous call; only those pages, their group index and the
+    archive home are then rendered.
+    """
+    cards = cards if cards is not None else _CardCache()
+    generated: Set[str] = set()
+    written: List[str] = []
+    removed: List[str] = []
+    items = manifest["items"]
+    groups = list(_archive_groups(manifest))
+    if layout is None:
+        layout = {}
+    if touched is not None and (
+        not layout or any(layout.get(group.key, (group.folder,))[0] != group.folder for group in groups)
+    ):
+        touched = None  # a new value shifted the folder slugs of others
+
+    def emit(relative_path: str, content: str) -> None:
+        generated.add(relative_path)
+        if _write_if_changed(docs_root / relative_path, content):
+            written.append(relative_path)
+
+    with _span("archives"):
+        home: List[Tuple[str, str, str, int]] = []
+        current: _ArchiveLayout = {}
+        for group in groups:
+            total = len(group.positions)
+            count = -(-total // page_size)
+            home.append((group.kind, group.folder, group.label, total))
+            current[group.key] = (group.folder, count)
+            if touched is None or group.key not in layout:
+                first, last_page = 1, count
+            elif group.key in touched:
+                low, high = touched[group.key]
+                first = low // page_size + 1
+                last_page = count if high is None else min(count, high // page_size + 1)
+            else:
+                continue
+            pages: List[Tuple[int, str, str, int]] = []
+            for number in range(1, count + 1):
+                chunk = group.positions[(number - 1) * page_size : number * page_size]
+                pages.append((number, items[chunk[0]].created_at, items[chunk[-1]].created_at, len(chunk)))
+                if first <= number <= last_page:
+                    page_items = [items[position] for position in chunk]
+                    emit(
+                        f"{group.folder}/{_archive_page_name(number)}",
+                        _render_archive_page(group, number, page_items, last=number == count, cards=cards),
+                    )
+            emit(f"{group.folder}/index.md", _render_archive_index(group, pages))
+            if touched is not None:
+                _, previous_count = layout.get(group.key, (group.folder, 0))
+                for number in range(count + 1, previous_count + 1):
+                    path = docs_root / group.folder / _archive_page_name(number)
+                    if path.exists():
+                        _remove_archive_file(path)
+                        removed.append(f"{group.folder}/{_archive_page_name(number)}")
+        emit(f"{ARCHIVE_DIR}/index.md", _render_archive_home(home))
+
+        if touched is not None:
+            # Groups that lost their last item take their folder with them.
+            for key in touched.keys() - current.keys():
+                folder = layout.get(key, (None,))[0]
+                directory = docs_root / folder if folder else None
+                if directory is None or not directory.is_dir():
+                    continue
+                for path in sorted(directory.iterdir()):
+                    _remove_archive_file(path)
+                    removed.append(path.relative_to(docs_root).as_posix())
+                directory.rmdir()
+        else:
+            archive_root = docs_root / ARCHIVE_DIR
+            for directory, _, files in os.walk(archive_root, topdown=False):
+                for name in files:
+                    path = Path(directory, name)
+                    relative_path = path.relative_to(docs_root).as_posix()
+                    if relative_path not in generated:
+                        _remove_archive_file(path)
+                        removed.append(relative_path)
+                if directory != str(archive_root) and not os.listdir(directory):
+                    os.rmdir(directory)
+        layout.clear()
+        layout.update(current)
+    return written, sorted(removed)
@@ -0,0 +1,180 @@
+"""
+HTML cards for the landing and archive pages, and the cache of rendered cards.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import os
+import posixpath
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from manifest_common import CACHE_DIR, _encode_json_string
+from manifest_output import _write_chunks_if_changed
+from manifest_related import RELATED_CARD_LIMIT
+
+if TYPE_CHECKING:
+    from manifest_items import ManifestItem
+
+CARD_CACHE_PATH = CACHE_DIR / "card_cache.ndjson"
+# Bump by hand whenever _render_card (or _relative_item_link/_escape_html) changes its HTML;
+# the card cache drops fragments written under another version.
+CARD_MARKUP_VERSION = 2
+
+
+def _escape_html(value: str) -> str:
+    return (
+        value.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&#39;")
+    )
+
+
+def _relative_item_link(item: ManifestItem, *, context_dir: str) -> str:
+    relative = os.path.relpath(item["path"], context_dir or ".").replace("\\", "/")
+    if relative.endswith("README.md"):
+        relative = relative[: -len("README.md")]
+    elif relative.endswith(".md"):
+        relative = relative[: -3]
+    if not relative.endswith("/"):
+        relative = relative + "/"
+    if not relative.startswith("."):
+        return f"./{relative}"
+    return relative
+
+
+def _card_signature(item: ManifestItem, related: Sequence[ManifestItem] = ()) -> Tuple[Any, ...]:
+    """Everything `_card_grid` shows for an item, for cheap change detection."""
+    return (
+        item.type,
+        item.title,
+        item.summary,
+        item.status,
+        item.updated_at,
+        tuple(item.tags[:3]),
+        item.path,
+        tuple((other.title, other.path) for other in related),
+    )
+
+
+def _render_card(item: ManifestItem, context_dir: str, related: Sequence[ManifestItem] = ()) -> str:
+    tags = item.get("tags", [])[:3]
+    tag_html = "".join(
+        f'<span class="kg-badge">{_escape_html(str(tag))}</span>' for tag in tags
+    )
+    link = _relative_item_link(item, context_dir=context_dir)
+    lines = [
+        '  <div class="kg-card">',
+        f'    <div class="kg-card__type">{item["type"].title()}</div>',
+        f'    <h3><a href="{link}">{_escape_html(item["title"])}</a></h3>',
+        f'    <p class="kg-card__summary">{_escape_html(item.get("summary", ""))}</p>',
+        "    <div class=\"kg-card__meta\">",
+        f'      <span class="kg-badge kg-badge--status">{_escape_html(item.get("status", "draft").title())}</span>',
+        f'      <span class="kg-badge kg-badge--date">{_escape_html(item.get("updated_at", ""))}</span>',
+        f"      {tag_html}",
+        "    </div>",
+    ]
+    if related:
+        links = " · ".join(
+            f'<a href="{_relative_item_link(other, context_dir=context_dir)}">{_escape_html(other["title"])}</a>'
+            for other in related
+        )
+        lines.append(f'    <p class="kg-card__related">Related: {links}</p>')
+    lines.append("  </div>")
+    return "\n".join(lines)
+
+
+class _CardCache:
+    """Rendered card fragments keyed by card content and the directory of the page showing them.
+
+    A card is rendered once per build however many pages list it. With a `path`
+    the fragments used by a build are persisted for the next one, keyed by a
+    digest of (signature, directory) that is only computed on a miss and on save.
+    """
+
+    def __init__(self, path: Optional[Path] = None, entries: Optional[Dict[str, str]] = None) -> None:
+        self.path = path
+        self.entries: Dict[str, str] = entries or {}
+        self.used: Dict[Tuple[Tuple[Any, ...], str], str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: Path, *, full: bool = False) -> "_CardCache":
+        if full or not path.exists():
+            return cls(path)
+        entries: Dict[str, str] = {}
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                header = json.loads(handle.readline() or "{}")
+                if header.get("markup") != CARD_MARKUP_VERSION:
+                    return cls(path)
+                for line in handle:
+                    key, fragment = json.loads(line)
+                    entries[key] = fragment
+        except (OSError, ValueError, TypeError, AttributeError):
+            return cls(path)
+        return cls(path, entries)
+
+    @staticmethod
+    def _digest(key: Tuple[Tuple[Any, ...], str]) -> str:
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+    def fragment(self, item: ManifestItem, context_dir: str, related: Sequence[ManifestItem] = ()) -> str:
+        key = (_card_signature(item, related), context_dir)
+        fragment = self.used.get(key)
+        if fragment is None:
+            fragment = self.entries.get(self._digest(key)) if self.entries else None
+            if fragment is None:
+                self.misses += 1
+                fragment = _render_card(item, context_dir, related)
+            else:
+                self.hits += 1
+            self.used[key] = fragment
+        else:
+            self.hits += 1
+        return fragment
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        fragments = {self._digest(key): fragment for key, fragment in self.used.items()}
+        if fragments.keys() == self.entries.keys():
+            return
+        header = {"markup": CARD_MARKUP_VERSION}
+        lines = (
+            f"[{_encode_json_string(key)},{_encode_json_string(fragment)}]\n" for key, fragment in fragments.items()
+        )
+        _write_chunks_if_changed(self.path, itertools.chain([json.dumps(header) + "\n"], lines))
+
+
+def _card_related(manifest: Dict[str, Any]) -> Dict[str, List[ManifestItem]]:
+    """The suggestions landing-page cards link to, from `manifest["related"]` when --related ran."""
+    return manifest.get("related") or {}
+
+
+def _card_grid(
+    items: List[ManifestItem],
+    *,
+    context_path: str,
+    cards: Optional[_CardCache] = None,
+    related: Optional[Dict[str, List[ManifestItem]]] = None,
+) -> str:
+    """Renders `items` as cards, each linking to its first RELATED_CARD_LIMIT `related` items."""
+    if not items:
+        return "_No entries yet._"
+    context_dir = posixpath.dirname(context_path)
+    render = cards.fragment if cards is not None else _render_card
+    related = related or {}
+    return "\n".join(
+        [
+            '<div class="kg-grid">',
+            *(render(item, context_dir, related.get(item.id, [])[:RELATED_CARD_LIMIT]) for item in items),
+            "</div>",
+        ]
+    )
@@ -0,0 +1,112 @@
+"""
+Paths, section tables, the build error and small text helpers shared by
+`build_manifest.py` and its subsystem modules.
+
+Everything here sticks to the standard library and imports no other module
+of the builder, so any of them can depend on it without an import cycle.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Iterator, List, Optional, Set, Tuple
+
+REPOSITORY_ROOT = Path(__file__).resolve().parents[1]
+DOCS_ROOT = REPOSITORY_ROOT / "docs"
+CACHE_DIR = REPOSITORY_ROOT / ".cache" / "build_manifest"
+FRONT_MATTER_LIMIT = 256 * 1024
+SECTIONS: Tuple[Tuple[str, str], ...] = (
+    ("notes", "note"),
+    ("patterns", "pattern"),
+    ("guide", "guide"),
+    ("snippets", "snippet"),
+    ("examples", "example"),
+)
+SECTION_PAGES: Tuple[Tuple[str, str, str], ...] = (
+    ("pattern", "Patterns", "patterns"),
+    ("snippet", "Snippets", "snippets"),
+    ("example", "Examples", "examples"),
+    ("guide", "Guides", "guide"),
+    ("resource", "Resources", "resources"),
+)
+RESOURCES_KEY = "resources/links.md"
+# Optional sharded catalog next to links.md, e.g. one file per type or month.
+RESOURCES_CATALOG_DIR = "resources/catalog"
+MANIFEST_SCHEMA_PATH = REPOSITORY_ROOT / "data" / "content_manifest_schema.yml"
+
+_encode_json_string = json.encoder.encode_basestring  # what json.dumps uses with ensure_ascii=False
+
+
+def _consume_front_matter(lines: Iterator[str], source: str = "<front matter>") -> Optional[str]:
+    """Consumes lines up to the closing `---` delimiter and returns the raw front matter.
+
+    Returns None when the document has no front matter or the block is never
+    closed. A block that grows beyond FRONT_MATTER_LIMIT characters raises
+    ManifestBuildError naming `source`.
+    """
+    if next(lines, "").rstrip() != "---":
+        return None
+    collected: List[str] = []
+    size = 0
+    for line in lines:
+        if line.rstrip() == "---":
+            return "".join(collected)
+        size += len(line)
+        if size > FRONT_MATTER_LIMIT:
+            message = f"front matter exceeds FRONT_MATTER_LIMIT ({FRONT_MATTER_LIMIT} characters)"
+            raise ManifestBuildError([(source, message)])
+        collected.append(line)
+    return None
+
+
+def _read_front_matter(path: Path, source: Optional[str] = None) -> Optional[str]:
+    """Reads only the front matter block of a Markdown file, never its body."""
+    with path.open("r", encoding="utf-8") as handle:
+        return _consume_front_matter(handle, source or str(path))
+
+
+def _slugify(value: str) -> str:
+    value = value.strip().lower()
+    value = re.sub(r"[^a-z0-9\-]+", "-", value)
+    value = re.sub(r"-{2,}", "-", value)
+    return value.strip("-")
+
+
+def _is_resource_key(key: str) -> bool:
+    """True for links.md and the Markdown shards of the resources catalog."""
+    if key == RESOURCES_KEY:
+        return True
+    folder, _, name = key.rpartition("/")
+    return folder == RESOURCES_CATALOG_DIR and name.endswith(".md") and name.lower() not in {"readme.md", "index.md"}
+
+
+def _known_doc_paths(docs_root: Path) -> Set[str]:
+    """Every file under `docs_root` as a docs-relative POSIX path, hidden folders excluded."""
+    root = str(docs_root) + os.sep
+    known: Set[str] = set()
+    directories = [str(docs_root)]
+    while directories:
+        try:
+            entries = os.scandir(directories.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                else:
+                    known.add(entry.path[len(root):].replace(os.sep, "/"))
+    return known
+
+
+class ManifestBuildError(Exception):
+    """Raised once collection finishes, carrying every (path, message) failure."""
+
+    def __init__(self, errors: List[Tuple[str, str]]) -> None:
+        super().__init__(f"{len(errors)} file(s) could not be parsed")
+        self.errors = errors
@@ -0,0 +1,216 @@
+"""
+Near-duplicate detection for `build_manifest.py --find-duplicates`.
+
+Only notes and patterns are signed; snippets and examples share licence
+headers and setup steps that would pair them up. Bodies are reduced to
+MinHash signatures over word shingles, cached by body hash between builds,
+and LSH banding pairs each document only with the candidates that share a
+band with it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from manifest_common import _encode_json_string
+from manifest_output import _write_chunks_if_changed
+from manifest_search import _read_markdown_body, _search_terms
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+DUPLICATE_SECTIONS = frozenset({"notes", "patterns"})
+SHINGLE_WORDS = 5
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 16
+DUPLICATE_THRESHOLD = 0.8
+_MINHASH_EMPTY = 1 << 64
+# Bin values are below 2**64 / MINHASH_PERMUTATIONS, so offsets of this size never collide with them.
+_MINHASH_OFFSET = _MINHASH_EMPTY // MINHASH_PERMUTATIONS
+
+
+def _minhash_signature(text: str) -> Optional[Tuple[int, ...]]:
+    """One-permutation MinHash of the word shingles of `text`, or None when it has no words.
+
+    Each shingle is hashed once and kept as the minimum of its bin; empty
+    bins borrow the next filled bin (rotation densification), so a
+    signature costs O(shingles + bins) rather than O(shingles * bins).
+    """
+    words = _search_terms(text)
+    if not words:
+        return None
+    width = min(SHINGLE_WORDS, len(words))
+    bins = MINHASH_PERMUTATIONS
+    signature = [_MINHASH_EMPTY] * bins
+    for start in range(len(words) - width + 1):
+        shingle = " ".join(words[start : start + width]).encode("utf-8")
+        value = int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+        slot, value = value % bins, value // bins
+        if value < signature[slot]:
+            signature[slot] = value
+    if _MINHASH_EMPTY not in signature:
+        return tuple(signature)
+    dense = list(signature)
+    for slot, value in enumerate(signature):
+        if value != _MINHASH_EMPTY:
+            continue
+        step = 1
+        while signature[(slot + step) % bins] == _MINHASH_EMPTY:
+            step += 1
+        dense[slot] = signature[(slot + step) % bins] + step * _MINHASH_OFFSET
+    return tuple(dense)
+
+
+def _estimated_jaccard(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+class _MinHashStore:
+    """MinHash signatures keyed by the sha256 of a Markdown body, persisted between builds.
+
+    `signatures` maps docs paths to the signatures of the current build.
+    """
+
+    def __init__(self, path: Path, entries: Optional[Dict[str, Tuple[int, ...]]] = None) -> None:
+        self.path = path
+        self.entries: Dict[str, Tuple[int, ...]] = entries or {}
+        self.used: Dict[str, Tuple[int, ...]] = {}
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+        self.hits = 0
+
+    @classmethod
+    def load(cls, path: Path, *, full: bool = False) -> "_MinHashStore":
+        if full or not path.exists():
+            return cls(path)
+        entries: Dict[str, Tuple[int, ...]] = {}
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                header = json.loads(handle.readline() or "{}")
+                if header.get("permutations") != MINHASH_PERMUTATIONS or header.get("shingle") != SHINGLE_WORDS:
+                    return cls(path)
+                for line in handle:
+                    digest, signature = json.loads(line)
+                    entries[digest] = tuple(signature)
+        except (OSError, ValueError, TypeError, AttributeError):
+            return cls(path)
+        return cls(path, entries)
+
+    def lookup(self, digest: str) -> Optional[Tuple[int, ...]]:
+        signature = self.entries.get(digest)
+        if signature is not None:
+            self.hits += 1
+            self.used[digest] = signature
+        return signature
+
+    def store(self, digest: str, signature: Tuple[int, ...]) -> None:
+        self.used[digest] = signature
+
+    def save(self) -> None:
+        if self.used.keys() == self.entries.keys():
+            return
+        header = {"permutations": MINHASH_PERMUTATIONS, "shingle": SHINGLE_WORDS}
+        lines = (
+            f"[{_encode_json_string(digest)},{json.dumps(list(signature))}]\n"
+            for digest, signature in self.used.items()
+        )
+        _write_chunks_if_changed(self.path, itertools.chain([json.dumps(header) + "\n"], lines))
+
+
+def _collect_signatures(
+    discovered: List[List[Path]],
+    store: _MinHashStore,
+    *,
+    docs_root: Path,
+    pool: Optional[ProcessPoolExecutor] = None,
+    jobs: int = 1,
+) -> None:
+    """Fills `store.signatures` for the discovered notes and patterns, computing only bodies not seen before."""
+    pending: List[Tuple[str, str]] = []
+    bodies: List[str] = []
+    for paths in discovered:
+        for path in paths:
+            key = path.relative_to(docs_root).as_posix()
+            if key.split("/", 1)[0] not in DUPLICATE_SECTIONS:
+                continue
+            body = _read_markdown_body(path)
+            digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+            signature = store.lookup(digest)
+            if signature is not None:
+                store.signatures[key] = signature
+                continue
+            pending.append((key, digest))
+            bodies.append(body)
+    if pool is not None and bodies:
+        chunksize = max(1, len(bodies) // (jobs * 8))
+        results: Iterable[Optional[Tuple[int, ...]]] = pool.map(_minhash_signature, bodies, chunksize=chunksize)
+    else:
+        results = map(_minhash_signature, bodies)
+    for (key, digest), signature in zip(pending, results):
+        if signature is not None:
+            store.store(digest, signature)
+            store.signatures[key] = signature
+
+
+def find_near_duplicates(
+    signatures: Dict[str, Tuple[int, ...]], *, threshold: float = DUPLICATE_THRESHOLD
+) -> List[Tuple[float, List[str]]]:
+    """Clusters paths whose estimated Jaccard similarity reaches `threshold`, via LSH banding.
+
+    Every document is compared only with the first member of each band
+    bucket it lands in, so the work is O(documents * LSH_BANDS). Returns
+    (lowest linking similarity, sorted paths) per cluster.
+    """
+    keys = sorted(signatures)
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    parent = list(range(len(keys)))
+    weakest: Dict[int, float] = {}
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for band in range(LSH_BANDS):
+        buckets: Dict[Tuple[int, ...], int] = {}
+        for index, key in enumerate(keys):
+            first = buckets.setdefault(signatures[key][band * rows : (band + 1) * rows], index)
+            if first == index:
+                continue
+            left, right = find(first), find(index)
+            if left == right:
+                continue
+            similarity = _estimated_jaccard(signatures[keys[first]], signatures[key])
+            if similarity < threshold:
+                continue
+            parent[right] = left
+            weakest[left] = min(similarity, weakest.get(left, 1.0), weakest.pop(right, 1.0))
+
+    clusters: Dict[int, List[str]] = {}
+    for index, key in enumerate(keys):
+        clusters.setdefault(find(index), []).append(key)
+    return [(round(weakest[root], 4), members) for root, members in clusters.items() if len(members) > 1]
+
+
+def _write_duplicates_report(
+    path: Path, clusters: List[Tuple[float, List[str]]], manifest: Dict[str, Any]
+) -> None:
+    ids = {item.path: item.id for item in manifest["items"]}
+    report = {
+        "version": 1,
+        "method": {
+            "shingle_words": SHINGLE_WORDS,
+            "permutations": MINHASH_PERMUTATIONS,
+            "bands": LSH_BANDS,
+            "threshold": DUPLICATE_THRESHOLD,
+        },
+        "clusters": [
+            {"similarity": similarity, "documents": [{"path": member, "id": ids.get(member)} for member in members]}
+            for similarity, members in sorted(clusters, key=lambda cluster: cluster[1])
+        ],
+    }
+    _write_chunks_if_changed(path, [json.dumps(report, indent=2, ensure_ascii=False) + "\n"])
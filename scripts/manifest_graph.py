@@ -0,0 +1,313 @@
+"""
+The bidirectional relationship graph between manifest items and the check for
+references to files that do not exist.
+"""
+
+from __future__ import annotations
+
+import bisect
+import posixpath
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from manifest_common import ManifestBuildError
+from manifest_items import ManifestItem
+
+
+class DanglingLinksError(ManifestBuildError):
+    """Raised when front matter references point at files that do not exist under docs/."""
+
+    def __init__(self, errors: List[Tuple[str, str]]) -> None:
+        super().__init__(errors)
+        self.args = (f"{len(errors)} dangling reference(s) in front matter",)
+
+
+def _normalize_doc_path(raw: Any, *, source: str = "") -> Optional[str]:
+    """Maps a front matter path reference to a docs-relative path, or None for URLs and blanks."""
+    if not isinstance(raw, str):
+        return None
+    value = raw.strip().split("#", 1)[0]
+    if not value or "://" in value:
+        return None
+    if value.startswith(("./", "../")) and source:
+        value = posixpath.join(posixpath.dirname(source), value)
+    value = posixpath.normpath(value.lstrip("/"))
+    if value.startswith("docs/"):
+        value = value[len("docs/") :]
+    return None if value.startswith("..") or value == "." else value
+
+
+def _item_references(item: ManifestItem) -> Iterator[Tuple[str, Any]]:
+    """Yields (kind, raw path) for every outgoing reference of a manifest item."""
+    if item.type != "note":
+        yield "origin_note", item.origin_note
+    for target in item.promotions:
+        yield "promotes_to", target
+    for kind, targets in item._relationships:
+        if kind == "promotes_to":
+            continue
+        for target in targets:
+            yield kind, target
+
+
+class _RelationGraph:
+    """Forward and reverse item edges in compressed sparse row form.
+
+    Nodes are positions into the manifest items. The edges leaving node `n`
+    are `targets[offsets[n]:offsets[n + 1]]` (with their kinds at the same
+    offsets), and the edges arriving at `n` live in `sources` under
+    `reverse_offsets`, so both neighbourhoods are a slice away. The path and
+    name indexes used for resolution are kept so --watch can patch single
+    rows through `replace`, `insert` and `remove` instead of rebuilding.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.kinds: List[str] = []
+        self.offsets = array("i", [0] * (size + 1))
+        self.targets = array("i")
+        self.edge_kinds = array("i")
+        self.reverse_offsets = array("i", [0] * (size + 1))
+        self.sources = array("i")
+        self.reverse_kinds = array("i")
+        # (position, kind, raw reference) for references that match no item, by position.
+        self.unresolved: List[Tuple[int, str, Any]] = []
+        # Path and (section, basename) lookups; -1 marks keys shared by several items.
+        self._by_path: Dict[str, int] = {}
+        self._by_name: Dict[Tuple[str, str], int] = {}
+        # Most references are repeated verbatim, so each string is resolved once.
+        self._resolved: Dict[str, Tuple[Optional[str], Optional[int]]] = {}
+        self._kind_ids: Dict[str, int] = {}
+
+    @staticmethod
+    def _name_key(path: str) -> Tuple[str, str]:
+        section, _, rest = path.partition("/")
+        return section, posixpath.basename(rest)
+
+    @classmethod
+    def build(cls, items: List[ManifestItem]) -> "_RelationGraph":
+        """Resolves every item reference through a path index in O(items + edges)."""
+        graph = cls(len(items))
+        by_path, by_name = graph._by_path, graph._by_name
+        for position, item in enumerate(items):
+            # Resources share links.md and cannot be addressed by path.
+            by_path[item.path] = -1 if item.path in by_path else position
+            name_key = cls._name_key(item.path)
+            by_name[name_key] = -1 if name_key in by_name else position
+
+        in_degree = [0] * len(items)
+        for position, item in enumerate(items):
+            edges, unresolved = graph._edges(position, item)
+            for target, kind_id in edges:
+                graph.targets.append(target)
+                graph.edge_kinds.append(kind_id)
+                in_degree[target] += 1
+            graph.unresolved.extend(unresolved)
+            graph.offsets[position + 1] = len(graph.targets)
+
+        # Counting sort of the forward edges by target gives the reverse rows.
+        cursor = 0
+        for position, degree in enumerate(in_degree):
+            graph.reverse_offsets[position] = cursor
+            in_degree[position] = cursor
+            cursor += degree
+        graph.reverse_offsets[len(items)] = cursor
+        graph.sources = array("i", [0] * cursor)
+        graph.reverse_kinds = array("i", [0] * cursor)
+        for source in range(len(items)):
+            for edge in range(graph.offsets[source], graph.offsets[source + 1]):
+                slot = in_degree[graph.targets[edge]]
+                in_degree[graph.targets[edge]] += 1
+                graph.sources[slot] = source
+                graph.reverse_kinds[slot] = graph.edge_kinds[edge]
+        return graph
+
+    def _resolve(self, raw: str, source: str) -> Tuple[Optional[str], Optional[int]]:
+        path = _normalize_doc_path(raw, source=source)
+        target = self._by_path.get(path, -1) if path else -1
+        if target < 0 and path:
+            # Section folders are flat, so `snippets/<group>/x.md` still finds `snippets/x.md`.
+            target = self._by_name.get(self._name_key(path), -1)
+        return path, None if target < 0 else target
+
+    def _edges(self, position: int, item: ManifestItem) -> Tuple[List[Tuple[int, int]], List[Tuple[int, str, Any]]]:
+        """Resolves one item's references to (target, kind id) edges plus its unresolved ones."""
+        edges: List[Tuple[int, int]] = []
+        unresolved: List[Tuple[int, str, Any]] = []
+        seen: Set[Tuple[int, int]] = set()
+        for kind, raw in _item_references(item):
+            if not raw or not isinstance(raw, str):
+                continue
+            if raw.startswith("."):
+                _, target = self._resolve(raw, item.path)
+            else:
+                hit = self._resolved.get(raw)
+                if hit is None:
+                    hit = self._resolved[raw] = self._resolve(raw, "")
+                _, target = hit
+            if target is None:
+                if "://" not in raw:
+                    unresolved.append((position, kind, raw))
+                continue
+            if target == position:
+                continue
+            kind_id = self._kind_ids.get(kind)
+            if kind_id is None:
+                kind_id = self._kind_ids[kind] = len(self.kinds)
+                self.kinds.append(kind)
+            if (target, kind_id) in seen:
+                continue
+            seen.add((target, kind_id))
+            edges.append((target, kind_id))
+        return edges, unresolved
+
+    @staticmethod
+    def _shift(values: array, changes: Dict[int, int]) -> None:
+        """Adds `changes[row]` to every offset after `row`, in one pass."""
+        changes = {row: delta for row, delta in changes.items() if delta}
+        if not changes:
+            return
+        start = min(changes) + 1
+        running = 0
+        shifted = array("i")
+        for row in range(start, len(values)):
+            running += changes.get(row - 1, 0)
+            shifted.append(values[row] + running)
+        values[start:] = shifted
+
+    def _set_row(self, position: int, edges: List[Tuple[int, int]]) -> None:
+        """Replaces the edges leaving `position` and keeps the reverse rows in step."""
+        start, end = self.offsets[position], self.offsets[position + 1]
+        old = list(zip(self.targets[start:end], self.edge_kinds[start:end]))
+        if old == edges:
+            return
+        self.targets[start:end] = array("i", [target for target, _ in edges])
+        self.edge_kinds[start:end] = array("i", [kind_id for _, kind_id in edges])
+        self._shift(self.offsets, {position: len(edges) - (end - start)})
+        # Reverse rows keep sources ascending, so the row of each target is
+        # patched where `position` sorts; offsets are fixed up once at the end.
+        changes: Dict[int, int] = {}
+        incoming: Dict[int, List[int]] = {target: [] for target, _ in old}
+        for target, kind_id in edges:
+            incoming.setdefault(target, []).append(kind_id)
+        moved = 0  # entries inserted minus removed in rows before the current one
+        for target in sorted(incoming):
+            low = self.reverse_offsets[target] + moved
+            high = self.reverse_offsets[target + 1] + moved
+            first = bisect.bisect_left(self.sources, position, low, high)
+            last = bisect.bisect_right(self.sources, position, low, high)
+            kind_ids = incoming[target]
+            self.sources[first:last] = array("i", [position] * len(kind_ids))
+            self.reverse_kinds[first:last] = array("i", kind_ids)
+            changes[target] = len(kind_ids) - (last - first)
+            moved += changes[target]
+        self._shift(self.reverse_offsets, changes)
+
+    def _refresh(self, positions: Iterable[int], items: List[ManifestItem]) -> None:
+        """Re-resolves the references of `positions` against the current indexes."""
+        for position in sorted(set(positions)):
+            edges, unresolved = self._edges(position, items[position])
+            self._set_row(position, edges)
+            first = bisect.bisect_left(self.unresolved, position, key=lambda entry: entry[0])
+            last = bisect.bisect_right(self.unresolved, position, key=lambda entry: entry[0])
+            self.unresolved[first:last] = unresolved
+
+    def _renumber(self, position: int, delta: int) -> None:
+        """Moves every node reference at or after `position` by `delta`."""
+
+        def moved(values: Iterable[int]) -> array:
+            return array("i", [value + delta if value >= position else value for value in values])
+
+        self.targets = moved(self.targets)
+        self.sources = moved(self.sources)
+        self.unresolved = [
+            (source + delta if source >= position else source, kind, raw) for source, kind, raw in self.unresolved
+        ]
+        for lookup in (self._by_path, self._by_name):
+            for key, value in lookup.items():
+                if value >= position:
+                    lookup[key] = value + delta
+        self._resolved.clear()
+
+    def _lookups(self, path: str) -> Iterator[Tuple[Any, Dict[Any, int], Callable[[str], Any]]]:
+        yield path, self._by_path, str
+        yield self._name_key(path), self._by_name, self._name_key
+
+    def replace(self, position: int, items: List[ManifestItem]) -> None:
+        """Re-resolves the item at `position`, whose path did not change."""
+        self._refresh([position], items)
+
+    def insert(self, position: int, items: List[ManifestItem]) -> None:
+        """Adds the node for `items[position]`, which was just inserted there."""
+        self._renumber(position, 1)
+        self.offsets.insert(position, self.offsets[position])
+        self.reverse_offsets.insert(position, self.reverse_offsets[position])
+        item = items[position]
+        affected = [position, *(source for source, _, _ in self.unresolved)]
+        for key, lookup, _ in self._lookups(item.path):
+            holder = lookup.get(key)
+            if holder is None:
+                lookup[key] = position
+                continue
+            if holder >= 0:  # the key becomes ambiguous, so edges resolved through it may break
+                affected.extend(source for source, _ in self.incoming(holder))
+            lookup[key] = -1
+        self._refresh(affected, items)
+
+    def remove(self, position: int, item: ManifestItem, items: List[ManifestItem]) -> None:
+        """Drops the node of `item`, which was just deleted from `items` at `position`."""
+        affected = [source for source, _ in self.incoming(position) if source != position]
+        for source in affected:
+            self._set_row(source, [edge for edge in self._row(source) if edge[0] != position])
+        self._set_row(position, [])
+        first = bisect.bisect_left(self.unresolved, position, key=lambda entry: entry[0])
+        last = bisect.bisect_right(self.unresolved, position, key=lambda entry: entry[0])
+        del self.unresolved[first:last]
+        del self.offsets[position]
+        del self.reverse_offsets[position]
+        for key, lookup, _ in self._lookups(item.path):
+            if lookup.get(key) == position:
+                del lookup[key]
+        self._renumber(position + 1, -1)
+        for key, lookup, key_of in self._lookups(item.path):
+            if lookup.get(key) != -1:
+                continue
+            # Shared keys are rare, so a scan beats tracking every holder.
+            holders = [other for other, candidate in enumerate(items) if key_of(candidate.path) == key]
+            if len(holders) == 1:
+                lookup[key] = holders[0]
+        affected = [source - 1 if source > position else source for source in affected]
+        self._refresh([*affected, *(source for source, _, _ in self.unresolved)], items)
+
+    def _row(self, position: int) -> List[Tuple[int, int]]:
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return list(zip(self.targets[start:end], self.edge_kinds[start:end]))
+
+    def outgoing(self, position: int) -> List[Tuple[int, str]]:
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return [(self.targets[edge], self.kinds[self.edge_kinds[edge]]) for edge in range(start, end)]
+
+    def incoming(self, position: int) -> List[Tuple[int, str]]:
+        start, end = self.reverse_offsets[position], self.reverse_offsets[position + 1]
+        return [(self.sources[edge], self.kinds[self.reverse_kinds[edge]]) for edge in range(start, end)]
+
+    def links(self, position: int) -> List[int]:
+        return _unique(self.targets[self.offsets[position] : self.offsets[position + 1]])
+
+    def backlinks(self, position: int) -> List[int]:
+        return _unique(self.sources[self.reverse_offsets[position] : self.reverse_offsets[position + 1]])
+
+
+def _find_dangling_links(manifest: Dict[str, Any], known: Set[str]) -> List[Tuple[str, str]]:
+    """Lists (item path, message) for every reference that matches neither an item nor a docs file."""
+    items = manifest["items"]
+    dangling: List[Tuple[str, str]] = []
+    for position, kind, raw in manifest["graph"].unresolved:
+        item = items[position]
+        if _normalize_doc_path(raw, source=item.path) in known:
+            continue
+        dangling.append((item.path, f"{item.id}: {kind} points to missing {raw!r}"))
+    return dangling
+
+
+def _unique(positions: Iterable[int]) -> List[int]:
+    return list(dict.fromkeys(positions))
@@ -0,0 +1,219 @@
+"""
+The precomputed manifest indexes declared under `indexes` in
+`data/content_manifest_schema.yml`, built in full or kept up to date one item
+at a time by `_IndexState`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import heapq
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from manifest_common import MANIFEST_SCHEMA_PATH
+from manifest_items import ManifestItem, _as_list
+from manifest_yaml import _load_yaml
+
+
+class _IndexSpec(NamedTuple):
+    name: str
+    filters: Dict[str, FrozenSet[Any]]
+    group_by: Optional[str]
+    order_by: Optional[str]
+    descending: bool
+    limit: Optional[int]
+
+
+@functools.lru_cache(maxsize=None)
+def _index_specs(schema_path: Path = MANIFEST_SCHEMA_PATH) -> Tuple[_IndexSpec, ...]:
+    """Compiles the `indexes` declared in content_manifest_schema.yml."""
+    schema = _load_yaml(schema_path.read_text(encoding="utf-8"))
+    specs = []
+    for entry in schema.get("indexes") or []:
+        field_name, _, direction = (entry.get("order_by") or "").partition(" ")
+        if direction not in {"", "asc", "desc"}:
+            raise ValueError(f"Index '{entry.get('name')}' has an invalid order_by: {entry.get('order_by')}")
+        specs.append(
+            _IndexSpec(
+                name=entry["name"],
+                filters={key: frozenset(_as_list(value)) for key, value in (entry.get("filter") or {}).items()},
+                group_by=entry.get("group_by"),
+                order_by=field_name or None,
+                descending=direction == "desc",
+                limit=entry.get("limit"),
+            )
+        )
+    return tuple(specs)
+
+
+def _ordered_positions(items: List[ManifestItem], positions: List[int], spec: _IndexSpec) -> List[int]:
+    """Orders positions like a stable sort would, using top-k selection when limited."""
+    if spec.order_by is None:
+        return positions[: spec.limit]
+    field_name = spec.order_by
+
+    def key(position: int) -> Any:
+        return items[position].get(field_name, "")
+
+    if spec.limit is None:
+        return sorted(positions, key=key, reverse=spec.descending)
+    select = heapq.nlargest if spec.descending else heapq.nsmallest
+    return select(spec.limit, positions, key=key)
+
+
+def _index_matches(item: ManifestItem, spec: _IndexSpec) -> bool:
+    return all(item.get(key) in values for key, values in spec.filters.items())
+
+
+def _group_keys(item: ManifestItem, spec: _IndexSpec) -> Iterable[str]:
+    """The groups of `item` under a grouped spec.
+
+    Keys are strings, as in manifest_query, so a YAML int or date tag sorts
+    next to text tags instead of breaking the index.
+    """
+    return dict.fromkeys(map(str, _as_list(item.get(spec.group_by))))
+
+
+def _build_indexes(items: List[ManifestItem], specs: Iterable[_IndexSpec]) -> Dict[str, Any]:
+    """Computes every declared index as positions into `items`.
+
+    Positions keep lookups O(1) for the renderers; `_serialize_manifest`
+    writes them out as item ids.
+    """
+    indexes: Dict[str, Any] = {}
+    for spec in specs:
+        candidates = [position for position, item in enumerate(items) if _index_matches(item, spec)]
+        if spec.group_by is None:
+            indexes[spec.name] = _ordered_positions(items, candidates, spec)
+            continue
+        groups: Dict[str, List[int]] = {}
+        for position in candidates:
+            for value in _group_keys(items[position], spec):
+                groups.setdefault(value, []).append(position)
+        indexes[spec.name] = {
+            value: _ordered_positions(items, groups[value], spec) for value in sorted(groups)
+        }
+    return indexes
+
+
+class _Descending:
+    """Inverts the order of a sort key component."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+class _IndexState:
+    """Index buckets that --watch updates one item at a time.
+
+    Every bucket keeps all of its positions in index order (limits are only
+    applied by `indexes`), so an edit takes the changed item out of its old
+    buckets and bisects it into the new ones instead of recomputing all
+    indexes. `items` is the manifest list itself, edited by the session.
+    """
+
+    def __init__(self, items: List[ManifestItem], specs: Sequence[_IndexSpec]) -> None:
+        self.items = items
+        self.specs = specs
+        self.keys = [self._sort_key(spec) for spec in specs]
+        # Per spec, {group: positions}; ungrouped specs use the single group None.
+        self.buckets: List[Dict[Optional[str], List[int]]] = [{} for _ in specs]
+        for position in range(len(items)):
+            for groups, spec in zip(self.buckets, specs):
+                for group in self._groups(items[position], spec):
+                    groups.setdefault(group, []).append(position)
+        for groups, key in zip(self.buckets, self.keys):
+            for bucket in groups.values():
+                bucket.sort(key=key)
+
+    def _sort_key(self, spec: _IndexSpec) -> Callable[[int], Any]:
+        """Matches the stable sort of `_ordered_positions`: ties keep manifest order."""
+        field_name = spec.order_by
+        items = self.items
+        if field_name is None:
+            return lambda position: position
+        if spec.descending:
+            return lambda position: (_Descending(items[position].get(field_name, "")), position)
+        return lambda position: (items[position].get(field_name, ""), position)
+
+    @staticmethod
+    def _groups(item: ManifestItem, spec: _IndexSpec) -> Iterable[Optional[str]]:
+        if not _index_matches(item, spec):
+            return ()
+        return (None,) if spec.group_by is None else _group_keys(item, spec)
+
+    def discard(self, position: int) -> None:
+        """Takes the item at `position` out of its buckets, before it changes."""
+        item = self.items[position]
+        for groups, spec, key in zip(self.buckets, self.specs, self.keys):
+            for group in self._groups(item, spec):
+                bucket = groups[group]
+                del bucket[bisect.bisect_left(bucket, key(position), key=key)]
+                if not bucket and group is not None:
+                    del groups[group]
+
+    def add(self, position: int) -> None:
+        """Files the item now at `position` into its buckets."""
+        item = self.items[position]
+        for groups, spec, key in zip(self.buckets, self.specs, self.keys):
+            for group in self._groups(item, spec):
+                bisect.insort(groups.setdefault(group, []), position, key=key)
+
+    def ranks(self, position: int, names: Iterable[str]) -> Iterator[Tuple[str, str, int]]:
+        """Yields (index, group, rank in the bucket) for the item at `position` in grouped indexes `names`."""
+        item = self.items[position]
+        for groups, spec, key in zip(self.buckets, self.specs, self.keys):
+            if spec.name not in names:
+                continue
+            for group in self._groups(item, spec):
+                yield spec.name, group, bisect.bisect_left(groups[group], key(position), key=key)
+
+    def renumber(self, position: int, delta: int) -> None:
+        """Moves every stored position at or after `position` by `delta`."""
+        for groups in self.buckets:
+            for bucket in groups.values():
+                bucket[:] = [value + delta if value >= position else value for value in bucket]
+
+    def indexes(self) -> Dict[str, Any]:
+        """The indexes as `_build_indexes` would compute them for `items`."""
+        indexes: Dict[str, Any] = {}
+        for groups, spec in zip(self.buckets, self.specs):
+            if spec.group_by is None:
+                bucket = groups.get(None, [])
+                indexes[spec.name] = bucket if spec.limit is None else bucket[: spec.limit]
+            else:
+                indexes[spec.name] = {
+                    group: groups[group] if spec.limit is None else groups[group][: spec.limit]
+                    for group in sorted(groups)
+                }
+        return indexes
+
+
+def _index_ids(indexes: Dict[str, Any], items: List[ManifestItem]) -> Dict[str, Any]:
+    def ids(positions: List[int]) -> List[str]:
+        return [items[position].id for position in positions]
+
+    return {
+        name: {group: ids(positions) for group, positions in value.items()} if isinstance(value, dict) else ids(value)
+        for name, value in indexes.items()
+    }
+
+
+def _index_items(
+    manifest: Dict[str, Any], name: str, *, group: Optional[str] = None, limit: Optional[int] = None
+) -> List[ManifestItem]:
+    positions = manifest["indexes"][name]
+    if group is not None:
+        positions = positions.get(group, [])
+    items = manifest["items"]
+    return [items[position] for position in positions[:limit]]
@@ -0,0 +1,336 @@
+"""
+The manifest item model: `ManifestItem`, its interned vocabularies and the
+JSON fragment encoders that write items without building dicts first.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import functools
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from manifest_common import _encode_json_string, _slugify
+
+
+def _ensure_date(value: Optional[str], fallback: Optional[str] = None) -> str:
+    """Validates/normalises ISO dates."""
+    candidate = value or fallback
+    if not candidate:
+        return dt.date.today().isoformat()
+    try:
+        # Accept both date and datetime strings.
+        return dt.datetime.fromisoformat(candidate).date().isoformat()
+    except ValueError:
+        raise ValueError(f"Expected ISO date, got '{candidate}'")
+
+
+def _as_list(value: Optional[Any]) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+_JSON_KEY_WORDS = {True: '"true"', False: '"false"', None: '"null"'}
+
+
+def _json_key(key: Any) -> str:
+    if isinstance(key, str):
+        return _encode_json_string(key)
+    if key is None or isinstance(key, bool):
+        return _JSON_KEY_WORDS[key]
+    if isinstance(key, (int, float)):
+        return _encode_json_string(json.dumps(key))
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _json_array(fragments: List[str], pad: Optional[str]) -> str:
+    if not fragments:
+        return "[]"
+    if pad is None:
+        return "[" + ",".join(fragments) + "]"
+    inner = pad + "  "
+    return "[\n" + inner + (",\n" + inner).join(fragments) + "\n" + pad + "]"
+
+
+def _json_object(pairs: Iterable[Tuple[str, str]], pad: Optional[str]) -> str:
+    if pad is None:
+        return "{" + ",".join(f"{key}:{value}" for key, value in pairs) + "}"
+    inner = pad + "  "
+    body = (",\n" + inner).join(f"{key}: {value}" for key, value in pairs)
+    return "{\n" + inner + body + "\n" + pad + "}" if body else "{}"
+
+
+def _json_fragment(value: Any, pad: Optional[str]) -> str:
+    """Encodes `value` as json.dumps(indent=2, ensure_ascii=False) would at indentation `pad`.
+
+    `pad=None` gives the compact `(",", ":")` form instead.
+    """
+    if isinstance(value, str):
+        return _encode_json_string(value)
+    deeper = None if pad is None else pad + "  "
+    if isinstance(value, (list, tuple)):
+        return _json_array([_json_fragment(entry, deeper) for entry in value], pad)
+    if isinstance(value, dict):
+        return _json_object([(_json_key(key), _json_fragment(entry, deeper)) for key, entry in value.items()], pad)
+    return json.dumps(value)
+
+
+def _json_scalar(value: Any, pad: Optional[str]) -> str:
+    return _encode_json_string(value) if type(value) is str else _json_fragment(value, pad)
+
+
+def _json_values(values: Iterable[Any], pad: Optional[str]) -> str:
+    """Encodes a sequence that is usually all strings as a JSON array at `pad`."""
+    deeper = None if pad is None else pad + "  "
+    return _json_array([_json_scalar(value, deeper) for value in values], pad)
+
+
+class _Vocabulary:
+    """Distinct values addressed by small integer ids, with their JSON encodings."""
+
+    __slots__ = ("values", "ids", "encoded")
+
+    def __init__(self) -> None:
+        self.values: List[Any] = []
+        self.ids: Dict[Any, int] = {}
+        self.encoded: List[str] = []
+
+    def intern(self, value: Any) -> int:
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.values)
+            self.values.append(value)
+            self.encoded.append(_json_fragment(value, None))
+        return index
+
+
+_TAGS = _Vocabulary()
+_THEMES = _Vocabulary()
+_STATUSES = _Vocabulary()
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class ManifestItem:
+    """One manifest entry.
+
+    Items are slotted and keep tags, themes and status as ids into shared
+    vocabularies, so a large garden holds each distinct string once. Reads
+    through `item["field"]` / `item.get("field")` decode on access, and
+    `encode()` writes the item's JSON without building a dict first.
+    Resources also carry their catalog `url`, which is not a manifest field.
+    """
+
+    FIELDS = (
+        "id",
+        "type",
+        "title",
+        "slug",
+        "summary",
+        "status",
+        "tags",
+        "themes",
+        "created_at",
+        "updated_at",
+        "path",
+        "origin_note",
+        "promotions",
+        "relationships",
+    )
+    __slots__ = (
+        "id",
+        "type",
+        "title",
+        "slug",
+        "summary",
+        "_status",
+        "_tags",
+        "_themes",
+        "created_at",
+        "updated_at",
+        "path",
+        "origin_note",
+        "promotions",
+        "_relationships",
+        "url",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        type: str,
+        title: str,
+        slug: str,
+        summary: str,
+        status: str,
+        tags: List[Any],
+        themes: List[Any],
+        created_at: str,
+        updated_at: str,
+        path: str,
+        origin_note: Optional[str],
+        promotions: Optional[List[Any]] = None,
+        relationships: Optional[Dict[Any, List[Any]]] = None,
+        url: Optional[str] = None,
+    ) -> None:
+        self.id = id
+        self.type = _intern(type)
+        self.title = title
+        self.slug = slug
+        self.summary = summary
+        self._status = _STATUSES.intern(status)
+        self._tags = tuple(map(_TAGS.intern, tags))
+        self._themes = tuple(map(_THEMES.intern, themes))
+        self.created_at = _intern(created_at)
+        self.updated_at = _intern(updated_at)
+        self.path = path
+        self.origin_note = _intern(origin_note)
+        self.promotions = tuple(map(_intern, promotions or ()))
+        self._relationships = tuple(
+            (_intern(kind), tuple(map(_intern, targets))) for kind, targets in (relationships or {}).items()
+        )
+        self.url = url
+
+    @property
+    def status(self) -> Any:
+        return _STATUSES.values[self._status]
+
+    @property
+    def tags(self) -> List[Any]:
+        return [_TAGS.values[index] for index in self._tags]
+
+    @property
+    def themes(self) -> List[Any]:
+        return [_THEMES.values[index] for index in self._themes]
+
+    @property
+    def relationships(self) -> Dict[Any, List[Any]]:
+        return {kind: list(targets) for kind, targets in self._relationships}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _ITEM_FIELDS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        return list(value) if key == "promotions" else value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in _ITEM_FIELDS else default
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ManifestItem):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __repr__(self) -> str:
+        return f"ManifestItem(id={self.id!r}, path={self.path!r})"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in ManifestItem.FIELDS}
+
+    def encode(
+        self,
+        pad: Optional[str] = None,
+        *,
+        links: Optional[List[str]] = None,
+        backlinks: Optional[List[str]] = None,
+        related: Optional[List[str]] = None,
+        health: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Returns the item as JSON: compact when `pad` is None, else indented as json.dumps(indent=2) at `pad`."""
+        deeper = None if pad is None else pad + "  "
+        innermost = None if pad is None else pad + "    "
+        values = [
+            _json_scalar(self.id, deeper),
+            _json_scalar(self.type, deeper),
+            _json_scalar(self.title, deeper),
+            _json_scalar(self.slug, deeper),
+            _json_scalar(self.summary, deeper),
+            _STATUSES.encoded[self._status],
+            _json_array([_TAGS.encoded[index] for index in self._tags], deeper),
+            _json_array([_THEMES.encoded[index] for index in self._themes], deeper),
+            _json_scalar(self.created_at, deeper),
+            _json_scalar(self.updated_at, deeper),
+            _json_scalar(self.path, deeper),
+            _json_scalar(self.origin_note, deeper),
+            _json_values(self.promotions, deeper),
+            _json_object(
+                [(_json_key(kind), _json_values(targets, innermost)) for kind, targets in self._relationships],
+                deeper,
+            ),
+        ]
+        if links is not None:
+            values.append(_json_array(list(map(_encode_json_string, links)), deeper))
+            values.append(_json_array(list(map(_encode_json_string, backlinks or ())), deeper))
+        if related is not None:
+            values.append(_json_array(list(map(_encode_json_string, related)), deeper))
+        if health is not None:
+            values.append(_json_fragment(health, deeper))
+        return _item_template(pad, links is not None, health is not None, related is not None) % tuple(values)
+
+
+_ITEM_FIELDS = frozenset(ManifestItem.FIELDS)
+
+
+@functools.lru_cache(maxsize=None)
+def _item_template(pad: Optional[str], linked: bool, checked: bool = False, suggested: bool = False) -> str:
+    """`%`-template of an encoded item with one `%s` slot per field, in ManifestItem.FIELDS order."""
+    keys = (
+        ManifestItem.FIELDS
+        + (("links", "backlinks") if linked else ())
+        + (("related",) if suggested else ())
+        + (("health",) if checked else ())
+    )
+    return _json_object([(_encode_json_string(key), "%s") for key in keys], pad)
+
+
+def _build_item(path: Path, content_type: str, front_matter: Dict[str, Any], manifest_path: str) -> ManifestItem:
+    title = front_matter.get("title") or path.stem.replace("-", " ").title()
+    slug = front_matter.get("slug") or _slugify(title)
+    summary = front_matter.get("summary") or ""
+    tags = _as_list(front_matter.get("tags"))
+    themes = _as_list(front_matter.get("themes") or front_matter.get("theme"))
+    relationships = front_matter.get("relationships") or {}
+
+    created_at = _ensure_date(front_matter.get("created_at"))
+    updated_at = _ensure_date(front_matter.get("updated_at"), fallback=created_at)
+
+    origin_note: Optional[str] = None
+    if content_type == "note":
+        origin_note = f"notes/{path.name}"
+    else:
+        origin_note = front_matter.get("origin_note") or (
+            front_matter.get("source", {}) if isinstance(front_matter.get("source"), dict) else None
+        )
+        if isinstance(origin_note, dict):
+            origin_note = origin_note.get("origin_note") or origin_note.get("note")
+
+    promotes_to = []
+    if content_type == "note":
+        rel = front_matter.get("relationships") or {}
+        promotes_to = rel.get("promotes_to") or []
+
+    return ManifestItem(
+        id=f"{content_type}:{slug}",
+        type=content_type,
+        title=title,
+        slug=slug,
+        summary=summary,
+        status=front_matter.get("status", "draft"),
+        tags=tags,
+        themes=themes or ["core/unsorted"],
+        created_at=created_at,
+        updated_at=updated_at,
+        path=manifest_path,
+        origin_note=origin_note,
+        promotions=_as_list(promotes_to),
+        relationships={
+            key: _as_list(value) for key, value in (relationships or {}).items()
+        },
+    )
@@ -0,0 +1,222 @@
+"""
+Serialization of the manifest: the JSON and NDJSON files, the binary query
+index next to them, and the `generated_at` stamp kept stable across builds.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import itertools
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import manifest_query
+from manifest_common import REPOSITORY_ROOT
+from manifest_graph import _RelationGraph
+from manifest_indexes import _index_ids
+from manifest_items import ManifestItem, _json_fragment, _json_key
+from manifest_output import _OutputStore, _write_chunks_if_changed
+from manifest_profile import _span
+
+MANIFEST_PATH = REPOSITORY_ROOT / "data" / "content_manifest.json"
+NDJSON_MANIFEST_PATH = REPOSITORY_ROOT / "data" / "content_manifest.ndjson"
+NDJSON_FORMAT = "content_manifest.ndjson.v1"
+
+
+def _items_digest(revisions: Iterable[Tuple[str, str]]) -> str:
+    """Fingerprint of the item set: every (id, updated_at) pair, in manifest order."""
+    hasher = hashlib.sha256()
+    for item_id, updated_at in revisions:
+        hasher.update(f"{item_id}\0{updated_at}\n".encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _published_stamp(paths: Iterable[Optional[Path]]) -> Dict[str, str]:
+    """{"items": digest, "generated_at": stamp} of the first manifest file in `paths` that reads back."""
+    for path in paths:
+        if path is None or not path.exists():
+            continue
+        try:
+            if path.suffix == ".ndjson":
+                header, items = read_manifest_header(path), iter_manifest_items(path)
+            else:
+                with path.open("r", encoding="utf-8") as handle:
+                    header = json.load(handle)
+                items = header.get("items", [])
+            digest = _items_digest((item["id"], item["updated_at"]) for item in items)
+        except (OSError, ValueError, TypeError, KeyError):
+            continue
+        if isinstance(header.get("generated_at"), str):
+            return {"items": digest, "generated_at": header["generated_at"]}
+    return {}
+
+
+def _stable_generated_at(
+    manifest: Dict[str, Any], outputs: Optional[_OutputStore], published: Iterable[Optional[Path]] = ()
+) -> str:
+    """The `generated_at` to publish for `manifest`.
+
+    SOURCE_DATE_EPOCH wins when set (the reproducible-builds convention).
+    Otherwise the previous stamp is kept for as long as the item set is
+    unchanged, so rebuilding the same content yields identical bytes and a
+    no-op build writes nothing. Without a stamp in the build state (a fresh
+    checkout, a cleared cache) the previous one is read from the `published`
+    manifest files.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return dt.datetime.utcfromtimestamp(int(epoch)).isoformat() + "Z"
+    if outputs is None:
+        return manifest["generated_at"]
+    digest = _items_digest((item.id, item.updated_at) for item in manifest["items"])
+    previous = outputs.manifest if outputs.manifest.get("generated_at") else _published_stamp(published)
+    if previous.get("items") == digest and previous.get("generated_at"):
+        stamp = {"items": digest, "generated_at": previous["generated_at"]}
+    else:
+        stamp = {"items": digest, "generated_at": manifest["generated_at"]}
+    if outputs.manifest != stamp:
+        outputs.manifest = stamp
+        outputs.dirty = True
+    return stamp["generated_at"]
+
+
+def _encoded_items(manifest: Dict[str, Any], pad: Optional[str]) -> Iterator[str]:
+    """Yields each item's JSON with its resolved links and backlinks as ids.
+
+    URL health is added when it was checked, and suggested related ids when
+    --related ran.
+    """
+    items: List[ManifestItem] = manifest["items"]
+    graph: Optional[_RelationGraph] = manifest.get("graph")
+    health: Dict[str, Dict[str, Any]] = manifest.get("health") or {}
+    related: Optional[Dict[str, List[ManifestItem]]] = manifest.get("related")
+    for position, item in enumerate(items):
+        record = health.get(item.id) if item.type == "resource" else None
+        suggested = [other.id for other in related.get(item.id, ())] if related is not None else None
+        if graph is None:
+            yield item.encode(pad, related=suggested, health=record)
+            continue
+        yield item.encode(
+            pad,
+            links=[items[target].id for target in graph.links(position)],
+            backlinks=[items[source].id for source in graph.backlinks(position)],
+            related=suggested,
+            health=record,
+        )
+
+
+def _utf8_len(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _iter_manifest_json(manifest: Dict[str, Any], spans: Optional[List[Tuple[int, int]]] = None) -> Iterator[str]:
+    """Yields the manifest as chunks of json.dumps(indent=2, ensure_ascii=False) output.
+
+    When `spans` is given, the (byte offset, byte length) of every item is
+    appended to it as the chunks stream out.
+    """
+    offset = 0  # bytes yielded so far; only tracked for `spans`
+    separator = "{\n  "
+    for key, value in manifest.items():
+        if key in {"graph", "health", "related"}:  # written into the items instead
+            continue
+        chunk = separator + _json_key(key) + ": "
+        separator = ",\n  "
+        if key == "items":
+            opener = "[\n    "
+            for encoded in _encoded_items(manifest, "    "):
+                chunk += opener
+                if spans is not None:
+                    offset += _utf8_len(chunk)
+                    spans.append((offset, _utf8_len(encoded)))
+                    offset += spans[-1][1]
+                yield chunk + encoded
+                chunk, opener = "", ",\n    "
+            chunk += "[]" if opener == "[\n    " else "\n  ]"
+        elif key == "indexes":
+            chunk += _json_fragment(_index_ids(value, manifest["items"]), "  ")
+        else:
+            chunk += _json_fragment(value, "  ")
+        if spans is not None:
+            offset += _utf8_len(chunk)
+        yield chunk
+    yield "\n}\n"
+
+
+def _serialize_manifest(manifest: Dict[str, Any]) -> str:
+    return "".join(_iter_manifest_json(manifest))
+
+
+def _write_manifest_ndjson(
+    path: Path, manifest: Dict[str, Any], spans: Optional[List[Tuple[int, int]]] = None
+) -> None:
+    """Streams a header record and then one item per line, replacing `path` only on change."""
+    header = {"format": NDJSON_FORMAT, "version": manifest["version"], "generated_at": manifest["generated_at"]}
+    first = _json_fragment(header, None) + "\n"
+
+    def lines() -> Iterator[str]:
+        offset = _utf8_len(first)
+        for encoded in _encoded_items(manifest, None):
+            if spans is not None:
+                spans.append((offset, _utf8_len(encoded)))
+                offset += spans[-1][1] + 1
+            yield encoded + "\n"
+
+    _write_chunks_if_changed(path, itertools.chain([first], lines()))
+
+
+def read_manifest_header(path: Path = NDJSON_MANIFEST_PATH) -> Dict[str, Any]:
+    """Returns the header record of an NDJSON manifest without touching its items."""
+    with path.open("r", encoding="utf-8") as handle:
+        header = json.loads(handle.readline() or "{}")
+    if header.get("format") != NDJSON_FORMAT:
+        raise ValueError(f"{path} is not a {NDJSON_FORMAT} file.")
+    return header
+
+
+def iter_manifest_items(path: Path = NDJSON_MANIFEST_PATH) -> Iterator[Dict[str, Any]]:
+    """Lazily yields the items of an NDJSON manifest, one line at a time."""
+    with path.open("r", encoding="utf-8") as handle:
+        header = json.loads(handle.readline() or "{}")
+        if header.get("format") != NDJSON_FORMAT:
+            raise ValueError(f"{path} is not a {NDJSON_FORMAT} file.")
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _write_query_index(path: Path, manifest: Dict[str, Any], data_path: Path, spans: List[Tuple[int, int]]) -> None:
+    """Writes the binary companion `manifest_query.ManifestIndex` maps next to `data_path`."""
+    records = [(item.id, item.type, item.tags, item.themes, item.updated_at) for item in manifest["items"]]
+    stat = data_path.stat()
+    chunks = manifest_query.encode_index(
+        records,
+        spans,
+        data=os.path.relpath(data_path, path.parent),
+        data_size=stat.st_size,
+        data_mtime_ns=stat.st_mtime_ns,
+        generated_at=manifest["generated_at"],
+    )
+    _write_chunks_if_changed(path, chunks)
+
+
+def _write_manifest_outputs(
+    manifest: Dict[str, Any], *, manifest_path: Optional[Path], ndjson_path: Optional[Path]
+) -> None:
+    """Writes the requested manifest files plus a query index over the NDJSON one, else the JSON one."""
+    spans: List[Tuple[int, int]] = []
+    indexed = ndjson_path or manifest_path
+    if manifest_path is not None:
+        with _span("json"):
+            _write_chunks_if_changed(
+                manifest_path, _iter_manifest_json(manifest, spans if indexed == manifest_path else None)
+            )
+    if ndjson_path is not None:
+        with _span("ndjson"):
+            _write_manifest_ndjson(ndjson_path, manifest, spans)
+    if indexed is not None:
+        with _span("query index"):
+            _write_query_index(indexed.with_suffix(".idx"), manifest, indexed, spans)
@@ -0,0 +1,190 @@
+"""
+Writes generated files only when their content changes.
+
+`_OutputStore` remembers the hash, size and mtime of every file a build
+wrote, so an unchanged output is skipped without reading it back; without
+a store the helpers compare against the file on disk.
+"""
+
+from __future__ import annotations
+
+import filecmp
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from manifest_common import CACHE_DIR, REPOSITORY_ROOT
+from manifest_profile import _count, _span
+
+BUILD_STATE_PATH = CACHE_DIR / "build_state.json"
+BUILD_STATE_VERSION = 1
+OUTPUT_SPOOL_LIMIT = 32 * 1024 * 1024  # bytes of a streamed output held in memory before spilling to disk
+
+
+class _OutputStore:
+    """Content hashes of every generated file, so writes are decided without reading outputs back.
+
+    An entry keeps the sha256, size and mtime a file had when the build last
+    wrote or confirmed it. A file whose stat still matches is trusted to hold
+    that hash; one edited by hand (or missing from the state) is hashed once
+    from disk instead.
+    """
+
+    def __init__(self, path: Optional[Path] = None, entries: Optional[Dict[str, Tuple[str, int, int]]] = None) -> None:
+        self.path = path
+        self.entries: Dict[str, Tuple[str, int, int]] = entries or {}
+        self.manifest: Dict[str, str] = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path, *, full: bool = False) -> "_OutputStore":
+        store = cls(path)
+        if full or not path.exists():
+            return store
+        try:
+            state = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            return store
+        if state.get("version") != BUILD_STATE_VERSION:
+            return store
+        store.entries = {key: tuple(entry) for key, entry in state.get("outputs", {}).items()}
+        store.manifest = state.get("manifest", {})
+        return store
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        absolute = Path(os.path.abspath(path))
+        try:
+            return absolute.relative_to(REPOSITORY_ROOT).as_posix()
+        except ValueError:
+            return absolute.as_posix()
+
+    def unchanged(self, path: Path, digest: str) -> bool:
+        """Whether `path` already holds content hashing to `digest`."""
+        key = self._key(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        entry = self.entries.get(key)
+        if entry is not None and entry == (digest, stat.st_size, stat.st_mtime_ns):
+            return True
+        if entry is not None and entry[1:] == (stat.st_size, stat.st_mtime_ns):
+            return False  # the file is as we left it, and that content differs
+        hasher = hashlib.sha256()
+        with path.open("rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                hasher.update(block)
+        if hasher.hexdigest() != digest:
+            return False
+        self.record(path, digest)
+        return True
+
+    def record(self, path: Path, digest: str) -> None:
+        stat = path.stat()
+        entry = (digest, stat.st_size, stat.st_mtime_ns)
+        key = self._key(path)
+        if self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self.dirty = True
+
+    def forget(self, path: Path) -> None:
+        if self.entries.pop(self._key(path), None) is not None:
+            self.dirty = True
+
+    def write(self, path: Path, chunks: Iterable[Union[str, bytes]]) -> bool:
+        """Streams `chunks` through sha256 and replaces `path` only when the hash differs.
+
+        Output stays in memory up to OUTPUT_SPOOL_LIMIT, so an unchanged file
+        costs no disk writes at all; larger outputs spill to a temporary file
+        that is renamed over `path` or dropped.
+        """
+        hasher = hashlib.sha256()
+        buffered: List[bytes] = []
+        size = 0
+        tmp_path = path.with_name(path.name + ".tmp")
+        handle = None
+        try:
+            for chunk in chunks:
+                data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+                hasher.update(data)
+                if handle is not None:
+                    handle.write(data)
+                    continue
+                buffered.append(data)
+                size += len(data)
+                if size > OUTPUT_SPOOL_LIMIT:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    handle = tmp_path.open("wb")
+                    handle.writelines(buffered)
+                    buffered = []
+        finally:
+            if handle is not None:
+                handle.close()
+        digest = hasher.hexdigest()
+        if self.unchanged(path, digest):
+            if handle is not None:
+                tmp_path.unlink()
+            return False
+        if handle is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("wb") as out:
+                out.writelines(buffered)
+        os.replace(tmp_path, path)
+        self.record(path, digest)
+        return True
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        state = {
+            "version": BUILD_STATE_VERSION,
+            "manifest": self.manifest,
+            "outputs": {key: list(entry) for key, entry in sorted(self.entries.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state, indent=1) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+# Set by build_manifest.main() and watch(); library callers without it fall back to comparing file contents.
+OUTPUTS: Optional[_OutputStore] = None
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Writes `content` unless `path` already holds it; returns whether it wrote."""
+    with _span(f"write {path.name}", "write", path=str(path)):
+        if OUTPUTS is not None:
+            wrote = OUTPUTS.write(path, (content,))
+            _count("writes" if wrote else "writes skipped")
+            return wrote
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.read_text(encoding="utf-8") == content:
+            _count("writes skipped")
+            return False
+        path.write_text(content, encoding="utf-8")
+        _count("writes")
+        return True
+
+
+def _write_chunks_if_changed(path: Path, chunks: Iterable[Union[str, bytes]]) -> None:
+    """Streams `chunks` (text or bytes) to a temporary file and swaps it in only when the content differs."""
+    with _span(f"write {path.name}", "write", path=str(path)):
+        if OUTPUTS is not None:
+            _count("writes" if OUTPUTS.write(path, chunks) else "writes skipped")
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+        if path.exists() and filecmp.cmp(tmp_path, path, shallow=False):
+            tmp_path.unlink()
+            _count("writes skipped")
+            return
+        os.replace(tmp_path, path)
+        _count("writes")
@@ -0,0 +1,150 @@
+"""
+The generated landing pages: home, Brain Dump and the section indexes, each
+rendered from the manifest with cards.
+"""
+
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from manifest_archive import ARCHIVE_DIR
+from manifest_cards import _card_grid, _card_related, _card_signature, _CardCache
+from manifest_common import DOCS_ROOT, SECTION_PAGES
+from manifest_indexes import _index_items
+from manifest_items import ManifestItem
+from manifest_json import MANIFEST_PATH, _write_manifest_outputs
+from manifest_output import _write_if_changed
+from manifest_profile import _span
+from manifest_related import RELATED_CARD_LIMIT
+
+
+def _format_theme(theme: str) -> str:
+    cleaned = theme.replace("_", " ").replace("-", " ").replace("/", " / ")
+    parts = [part.capitalize() for part in cleaned.split()]
+    return " ".join(parts)
+
+
+def _render_home(manifest: Dict[str, Any], *, cards: Optional[_CardCache] = None) -> str:
+    notes, promos = _page_cards(manifest, "index.md")
+    related = _card_related(manifest)
+
+    overview = (
+        "**Agentic Knowledge Garden** é um brain dump evolutivo sobre agentes de IA. "
+        "Cada nota nasce no Brain Dump, cria conexões e promove conteúdo reutilizável."
+    )
+
+    sections = [
+        "# Agentic Knowledge Garden",
+        overview,
+        "",
+        "## Brain Dump Highlights",
+        _card_grid(notes, context_path="index.md", cards=cards, related=related),
+        "",
+        "## Freshly Promoted",
+        _card_grid(promos, context_path="index.md", cards=cards, related=related),
+        "",
+        "## Explore Pillars",
+        "- Brain Dump → ideias brutas e sinais.",
+        "- Patterns → soluções recorrentes comentadas.",
+        "- Guides → fundamentos organizados por tema.",
+        "- Resources → referências externas curadas.",
+        "- Snippets → blocos de código mínimos.",
+        "- Examples → fluxos reprodutíveis.",
+        "",
+        "> Tudo nasce de uma nota. Explore, combine, promova.",
+    ]
+    return "\n".join(sections) + "\n"
+
+
+def _render_notes_index(manifest: Dict[str, Any], *, cards: Optional[_CardCache] = None) -> str:
+    (latest,) = _page_cards(manifest, "notes/README.md")
+
+    sections = [
+        "---",
+        'title: "Brain Dump"',
+        'summary: "Notas brutas que alimentam todo o jardim."',
+        "---",
+        "",
+        "# Brain Dump",
+        "Notas recentes e sinais que evoluem em padrões, guias e recursos.",
+        "",
+        "## Last Updates",
+        _card_grid(latest, context_path="notes/README.md", cards=cards, related=_card_related(manifest)),
+        "",
+        f"[Browse the full archive](../{ARCHIVE_DIR}/notes/index.md)",
+    ]
+    return "\n".join(sections) + "\n"
+
+
+def _render_section_index(
+    manifest: Dict[str, Any], *, item_type: str, heading: str, folder: str, cards: Optional[_CardCache] = None
+) -> str:
+    (latest,) = _page_cards(manifest, f"{folder}/README.md")
+    sections = [
+        f"# {heading}",
+        "",
+        "## Latest",
+        _card_grid(latest, context_path=f"{folder}/README.md", cards=cards, related=_card_related(manifest)),
+        "",
+        f"[Browse the full archive](../{ARCHIVE_DIR}/{folder}/index.md)",
+    ]
+    return "\n".join(sections) + "\n"
+
+
+# Card lists shown by each landing page as (manifest index, group, limit).
+# Watch mode re-renders a page only when one of these lists changes.
+PAGE_CARD_LISTS: Dict[str, Tuple[Tuple[str, Optional[str], int], ...]] = {
+    "index.md": (("brain_dump", None, 6), ("freshly_promoted", None, 6)),
+    "notes/README.md": (("brain_dump", None, 8),),
+    **{f"{folder}/README.md": (("latest_by_type", item_type, 8),) for item_type, _, folder in SECTION_PAGES},
+}
+
+
+def _page_cards(manifest: Dict[str, Any], page: str) -> List[List[ManifestItem]]:
+    return [
+        _index_items(manifest, name, group=group, limit=limit) for name, group, limit in PAGE_CARD_LISTS[page]
+    ]
+
+
+def _page_signature(manifest: Dict[str, Any], page: str) -> Tuple[Any, ...]:
+    related = _card_related(manifest)
+    return tuple(
+        tuple(_card_signature(item, related.get(item.id, [])[:RELATED_CARD_LIMIT]) for item in cards)
+        for cards in _page_cards(manifest, page)
+    )
+
+
+def _page_renderers() -> Dict[str, Callable[..., str]]:
+    renderers: Dict[str, Callable[..., str]] = {
+        "index.md": _render_home,
+        "notes/README.md": _render_notes_index,
+    }
+    for item_type, heading, folder in SECTION_PAGES:
+        renderers[f"{folder}/README.md"] = functools.partial(
+            _render_section_index, item_type=item_type, heading=heading, folder=folder
+        )
+    return renderers
+
+
+def _render_pages(manifest: Dict[str, Any], *, cards: Optional[_CardCache] = None) -> List[Tuple[str, str]]:
+    """Renders every landing page as (docs-relative path, content), sharing card fragments between pages."""
+    cards = cards if cards is not None else _CardCache()
+    return [(relative_path, render(manifest, cards=cards)) for relative_path, render in _page_renderers().items()]
+
+
+def regenerate_pages(
+    manifest: Dict[str, Any],
+    *,
+    docs_root: Path = DOCS_ROOT,
+    manifest_path: Optional[Path] = MANIFEST_PATH,
+    ndjson_path: Optional[Path] = None,
+    cards: Optional[_CardCache] = None,
+    pages: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Writes the manifest files for `manifest` and the landing pages for `pages` (default: the same)."""
+    _write_manifest_outputs(manifest, manifest_path=manifest_path, ndjson_path=ndjson_path)
+    with _span("pages"):
+        for relative_path, content in _render_pages(pages if pages is not None else manifest, cards=cards):
+            _write_if_changed(docs_root / relative_path, content)
@@ -0,0 +1,444 @@
+"""
+Collection of the docs tree into manifest items: Markdown sections across an
+optional process pool, the streamed resources catalog, and the per-file parse
+cache that lets unchanged files skip parsing.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import manifest_profile
+from manifest_common import (
+    CACHE_DIR,
+    DOCS_ROOT,
+    RESOURCES_CATALOG_DIR,
+    RESOURCES_KEY,
+    SECTIONS,
+    ManifestBuildError,
+    _encode_json_string,
+    _is_resource_key,
+    _read_front_matter,
+    _slugify,
+)
+from manifest_duplicates import _collect_signatures, _MinHashStore
+from manifest_items import ManifestItem, _as_list, _build_item, _ensure_date, _json_array, _json_fragment, _json_values
+from manifest_profile import _count, _span
+from manifest_schema import _check_document, _manifest_item_schema, _SchemaReport, _section_schema
+from manifest_yaml import _load_yaml, _load_yaml_any
+
+PARSE_CACHE_PATH = CACHE_DIR / "parse_cache.ndjson"
+PARSE_CACHE_VERSION = 7
+
+
+class _CacheEntry(NamedTuple):
+    mtime_ns: int
+    size: int
+    sha256: str
+    dated_on: Optional[str]
+    item: Any  # Optional[ManifestItem] for Markdown files, Tuple[ManifestItem, ...] for resource catalogs
+    checks: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ())  # schema (problems, unique-by tokens)
+
+
+class _ParseCache:
+    """Persistent cache of parsed items keyed by docs path, stat signature and front matter hash.
+
+    The file is a version header followed by one `[path, mtime_ns, size,
+    sha256, dated_on, item, problems, unique]` line per entry, so it loads
+    and saves without materialising the whole cache as one JSON document.
+    Resource catalog files store a list of `[item, url]` pairs in place of `item`.
+    The header also carries the schema fingerprint the cached problems were
+    checked against.
+    """
+
+    def __init__(
+        self, path: Path, entries: Optional[Dict[str, _CacheEntry]] = None, *, schemas: Optional[str] = None
+    ) -> None:
+        self.path = path
+        self.schemas = schemas
+        self.entries: Dict[str, _CacheEntry] = entries or {}
+        self.seen: Dict[str, _CacheEntry] = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: Path, *, full: bool = False, schemas: Optional[str] = None) -> "_ParseCache":
+        if full or not path.exists():
+            return cls(path, schemas=schemas)
+        entries: Dict[str, _CacheEntry] = {}
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                header = json.loads(handle.readline() or "{}")
+                if (
+                    not isinstance(header, dict)
+                    or header.get("version") != PARSE_CACHE_VERSION
+                    or header.get("schemas") != schemas
+                ):
+                    return cls(path, schemas=schemas)
+                for line in handle:
+                    key, mtime_ns, size, sha256, dated_on, fields, problems, unique = json.loads(line)
+                    if isinstance(fields, list):
+                        item: Any = tuple(ManifestItem(**entry, url=url) for entry, url in fields)
+                    else:
+                        item = ManifestItem(**fields) if fields else None
+                    entries[key] = _CacheEntry(mtime_ns, size, sha256, dated_on, item, (tuple(problems), tuple(unique)))
+        except (OSError, ValueError, TypeError):
+            return cls(path, schemas=schemas)
+        return cls(path, entries, schemas=schemas)
+
+    def lookup(self, key: str, stat: os.stat_result) -> Optional[_CacheEntry]:
+        """Returns the cached entry when the file's mtime and size are unchanged."""
+        entry = self._current(key)
+        if entry and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            self.hits += 1
+            self.seen[key] = entry
+            return entry
+        return None
+
+    def digest(self, key: str) -> Optional[str]:
+        entry = self._current(key)
+        return entry.sha256 if entry else None
+
+    def revalidate(self, key: str, stat: os.stat_result) -> Optional[ManifestItem]:
+        """Refreshes the stat signature of a touched file whose front matter is unchanged."""
+        entry = self.entries[key]
+        self.hits += 1
+        self.store(key, stat, entry.sha256, entry.item, dated=entry.dated_on is not None, checks=entry.checks)
+        return entry.item
+
+    def store(
+        self,
+        key: str,
+        stat: os.stat_result,
+        digest: str,
+        item: Any,
+        *,
+        dated: bool = False,
+        checks: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ()),
+    ) -> None:
+        """Records a parsed item (or catalog items); `dated` marks dates that fell back to today."""
+        dated_on = dt.date.today().isoformat() if dated else None
+        self.seen[key] = _CacheEntry(stat.st_mtime_ns, stat.st_size, digest, dated_on, item, checks)
+        self.dirty = True
+
+    def _current(self, key: str) -> Optional[_CacheEntry]:
+        entry = self.entries.get(key)
+        if entry and entry.dated_on not in (None, dt.date.today().isoformat()):
+            return None
+        return entry
+
+    def save(self) -> None:
+        if not self.dirty and self.seen.keys() == self.entries.keys():
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8", newline="\n") as handle:
+            handle.write(json.dumps({"version": PARSE_CACHE_VERSION, "schemas": self.schemas}) + "\n")
+            for key, entry in self.seen.items():
+                if isinstance(entry.item, tuple):
+                    item = _json_array(
+                        [f"[{resource.encode()},{_json_fragment(resource.url, None)}]" for resource in entry.item], None
+                    )
+                else:
+                    item = entry.item.encode() if entry.item is not None else "null"
+                problems, unique = entry.checks
+                handle.write(
+                    f"[{_encode_json_string(key)},{entry.mtime_ns},{entry.size},"
+                    f"{_json_fragment(entry.sha256, None)},{_json_fragment(entry.dated_on, None)},{item},"
+                    f"{_json_values(problems, None)},{_json_values(unique, None)}]\n"
+                )
+        os.replace(tmp_path, self.path)
+
+
+class _ParseResult(NamedTuple):
+    digest: str
+    unchanged: bool
+    item: Optional[Dict[str, Any]]
+    dated: bool
+    error: Optional[str]
+    # (pid, start, YAML start, YAML end, end) in perf_counter_ns, for --profile.
+    timing: Tuple[int, int, int, int, int]
+    checks: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ())
+
+
+def _discover_section(base_path: Path) -> List[Path]:
+    paths: List[Path] = []
+    for path in sorted(base_path.rglob("*.md")):
+        if path.name.lower() in {"readme.md", "index.md"}:
+            continue
+        paths.append(path)
+    return paths
+
+
+def _parse_task(task: Tuple[str, str, str, Optional[str]]) -> _ParseResult:
+    """Parses one Markdown file; runs inside worker processes when --jobs > 1."""
+    path_str, content_type, manifest_path, known_digest = task
+    path = Path(path_str)
+    start_ns = yaml_start_ns = yaml_end_ns = time.perf_counter_ns()
+
+    def timing() -> Tuple[int, int, int, int, int]:
+        return (os.getpid(), start_ns, yaml_start_ns, yaml_end_ns, time.perf_counter_ns())
+
+    try:
+        # Items depend only on their front matter, so body edits hash to the same entry.
+        fm_raw = _read_front_matter(path, manifest_path) or ""
+        digest = hashlib.sha256(fm_raw.encode("utf-8")).hexdigest()
+        if digest == known_digest:
+            return _ParseResult(digest, True, None, False, None, timing())
+        yaml_start_ns = time.perf_counter_ns()
+        front_matter = _load_yaml(fm_raw)
+        yaml_end_ns = time.perf_counter_ns()
+        # `path` is docs/<section>/.../<name>; the section folder holds the schema.
+        schema = _section_schema(str(path.parents[manifest_path.count("/") - 1]))
+        if not front_matter:
+            problems = (f"{schema.name if schema else content_type}: no front matter block",)
+            return _ParseResult(digest, False, None, False, None, timing(), (problems, ()))
+        item = _build_item(path, content_type, front_matter, manifest_path)
+        fields = item.as_dict()
+        problems, unique = _check_document(schema, front_matter) if schema is not None else ([], [])
+        problems.extend(_check_document(_manifest_item_schema(), fields, "item ")[0])
+        checks = (tuple(problems), tuple(unique))
+        return _ParseResult(digest, False, fields, not front_matter.get("created_at"), None, timing(), checks)
+    except ManifestBuildError as exc:  # already names the file; the caller adds the key back
+        return _ParseResult("", False, None, False, "; ".join(message for _, message in exc.errors), timing())
+    except Exception as exc:  # reported per file by the caller
+        return _ParseResult("", False, None, False, f"{type(exc).__name__}: {exc}", timing())
+
+
+def _discover_markdown(docs_root: Path, pool: Optional[ProcessPoolExecutor] = None) -> List[List[Path]]:
+    """Returns the candidate Markdown files of every section, in SECTIONS order."""
+    base_paths = [docs_root / section for section, _ in SECTIONS]
+    if pool is not None:
+        return list(pool.map(_discover_section, base_paths))
+    return [_discover_section(base_path) for base_path in base_paths]
+
+
+def _collect_markdown_items(
+    cache: Optional[_ParseCache] = None,
+    *,
+    jobs: int = 1,
+    docs_root: Path = DOCS_ROOT,
+    discovered: Optional[List[List[Path]]] = None,
+    minhash: Optional[_MinHashStore] = None,
+    schema: Optional[_SchemaReport] = None,
+) -> List[ManifestItem]:
+    """Collects section items in (section, path) order, parsing on `jobs` processes.
+
+    With `minhash`, the bodies of the discovered notes and patterns are also
+    signed for near-duplicate detection. With `schema`, the section-schema problems of
+    every file (checked while parsing, or remembered by the cache) are added
+    to the report.
+    """
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        if discovered is None:
+            with _span("discover"):
+                discovered = _discover_markdown(docs_root, pool)
+        _count("files discovered", sum(len(paths) for paths in discovered))
+        if minhash is not None:
+            with _span("minhash"):
+                _collect_signatures(discovered, minhash, docs_root=docs_root, pool=pool, jobs=jobs)
+            _count("minhash cache hits", minhash.hits)
+
+        slots: List[Optional[ManifestItem]] = []
+        pending: List[Tuple[int, str, Optional[os.stat_result]]] = []
+        tasks: List[Tuple[str, str, str, Optional[str]]] = []
+        with _span("cache lookup"):
+            for (_, content_type), paths in zip(SECTIONS, discovered):
+                for path in paths:
+                    key = path.relative_to(docs_root).as_posix()
+                    stat = path.stat() if cache is not None else None
+                    entry = cache.lookup(key, stat) if cache is not None else None
+                    if entry is not None:
+                        slots.append(entry.item)
+                        if schema is not None:
+                            schema.add(key, entry.checks)
+                        continue
+                    pending.append((len(slots), key, stat))
+                    slots.append(None)
+                    tasks.append((str(path), content_type, key, cache.digest(key) if cache is not None else None))
+        _count("parse cache hits", len(slots) - len(tasks))
+        _count("files parsed", len(tasks))
+
+        if pool is not None and tasks:
+            chunksize = max(1, len(tasks) // (jobs * 8))
+            results: Iterable[_ParseResult] = pool.map(_parse_task, tasks, chunksize=chunksize)
+        else:
+            results = map(_parse_task, tasks)
+
+        errors: List[Tuple[str, str]] = []
+        with _span("parse", files=len(tasks), jobs=jobs):
+            for (slot, key, stat), result in zip(pending, results):
+                if manifest_profile.PROFILER is not None:
+                    manifest_profile.PROFILER.record_file(key, result.timing)
+                if result.error is not None:
+                    errors.append((key, result.error))
+                    continue
+                item = ManifestItem(**result.item) if result.item else None
+                checks = result.checks
+                if cache is not None and stat is not None:
+                    if result.unchanged:
+                        item = cache.revalidate(key, stat)
+                        checks = cache.seen[key].checks
+                    else:
+                        cache.misses += 1
+                        cache.store(key, stat, result.digest, item, dated=result.dated, checks=checks)
+                if schema is not None:
+                    schema.add(key, checks)
+                slots[slot] = item
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if errors:
+        raise ManifestBuildError(errors)
+    return [item for item in slots if item is not None]
+
+
+def _resource_sources(docs_root: Path) -> List[Path]:
+    """links.md first, then the catalog shards in name order."""
+    sources = [docs_root / RESOURCES_KEY] if (docs_root / RESOURCES_KEY).is_file() else []
+    catalog = docs_root / RESOURCES_CATALOG_DIR
+    if catalog.is_dir():
+        sources.extend(
+            path
+            for path in sorted(catalog.iterdir())
+            if path.is_file() and _is_resource_key(f"{RESOURCES_CATALOG_DIR}/{path.name}")
+        )
+    return sources
+
+
+def _iter_resource_entries(handle: Iterable[str], key: str) -> Iterator[Any]:
+    """Yields the entries of a YAML list one at a time.
+
+    A top-level `- ` line starts a new entry, so each entry is parsed on its
+    own and the document is never held whole. A file that is not a block
+    list ends up as a single chunk and must then parse to a list.
+    """
+
+    def parse(chunk: List[str]) -> List[Any]:
+        raw = "".join(chunk).strip()
+        if not raw:
+            return []
+        parsed = _load_yaml_any(raw)
+        if parsed is None or parsed == {}:  # only comments
+            return []
+        if not isinstance(parsed, list):
+            raise ValueError(f"{key} must contain a YAML list.")
+        return parsed
+
+    chunk: List[str] = []
+    for line in handle:
+        if line[:1] == "-" and line[1:2] in {" ", "\n", ""} and not line.startswith("---") and chunk:
+            yield from parse(chunk)
+            chunk = []
+        chunk.append(line)
+    yield from parse(chunk)
+
+
+def _resource_item(entry: Any, key: str) -> Optional[ManifestItem]:
+    if not isinstance(entry, dict):
+        return None
+    title = entry.get("title")
+    url = entry.get("url")
+    if not title or not url:
+        return None
+    slug = _slugify(title)
+    created_at = entry.get("added_at") or dt.date.today().isoformat()
+    return ManifestItem(
+        id=f"resource:{slug}",
+        type="resource",
+        title=title,
+        slug=slug,
+        summary=entry.get("summary") or entry.get("insight") or "",
+        status="curated",
+        tags=_as_list(entry.get("tags")),
+        themes=_as_list(entry.get("type")),
+        created_at=_ensure_date(created_at),
+        updated_at=_ensure_date(entry.get("added_at"), fallback=created_at),
+        path=key,
+        origin_note=entry.get("origin_note") or entry.get("from_note"),
+        promotions=[],
+        relationships={},
+        url=str(url),
+    )
+
+
+def _parse_resource_source(
+    path: Path, key: str
+) -> Tuple[str, Tuple[ManifestItem, ...], bool, Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    """Streams one catalog file into (sha256, items, dated, schema checks).
+
+    `dated` is set when an entry has no added_at; every entry is checked
+    against the `links` collection of the resources schema.
+    """
+    digest = hashlib.sha256()
+    items: List[ManifestItem] = []
+    dated = False
+    schema = _section_schema(str(path.parents[key.count("/") - 1]))
+    problems: List[str] = []
+    unique: List[str] = []
+
+    def lines() -> Iterator[str]:
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                digest.update(line.encode("utf-8"))
+                yield line
+
+    for number, entry in enumerate(_iter_resource_entries(lines(), key), 1):
+        if schema is not None:
+            if isinstance(entry, dict):
+                found, tokens = _check_document(schema, entry, f"entry {number}: ")
+                problems.extend(found)
+                unique.extend(tokens)
+            else:
+                problems.append(f"entry {number}: {schema.name}: expected a mapping, got {type(entry).__name__}")
+        item = _resource_item(entry, key)
+        if item is not None:
+            items.append(item)
+            dated = dated or not entry.get("added_at")
+    return digest.hexdigest(), tuple(items), dated, (tuple(problems), tuple(unique))
+
+
+def _collect_resources(
+    items: List[ManifestItem],
+    *,
+    docs_root: Path = DOCS_ROOT,
+    cache: Optional[_ParseCache] = None,
+    schema: Optional[_SchemaReport] = None,
+) -> None:
+    """Appends the resources of links.md and of every catalog shard, skipping shards the cache still holds.
+
+    Shards that fail to parse are reported together, by key, in a ManifestBuildError.
+    """
+    errors: List[Tuple[str, str]] = []
+    for path in _resource_sources(docs_root):
+        key = path.relative_to(docs_root).as_posix()
+        stat = path.stat() if cache is not None else None
+        entry = cache.lookup(key, stat) if cache is not None and stat is not None else None
+        if entry is not None:
+            items.extend(entry.item)
+            if schema is not None:
+                schema.add(key, entry.checks)
+            continue
+        try:
+            digest, parsed, dated, checks = _parse_resource_source(path, key)
+        except Exception as exc:  # reported per file below
+            errors.append((key, f"{type(exc).__name__}: {exc}"))
+            continue
+        if cache is not None and stat is not None:
+            cache.misses += 1
+            cache.store(key, stat, digest, parsed, dated=dated, checks=checks)
+        if schema is not None:
+            schema.add(key, checks)
+        items.extend(parsed)
+    if errors:
+        raise ManifestBuildError(errors)
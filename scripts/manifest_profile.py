@@ -0,0 +1,145 @@
+"""
+Phase spans and counters for `build_manifest.py --profile`.
+
+`_span` and `_count` are no-ops until `PROFILER` is set, so the builder and
+its subsystem modules call them unconditionally. The recorded spans are
+written as a Chrome trace.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import heapq
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from manifest_common import CACHE_DIR
+
+PROFILE_TRACE_PATH = CACHE_DIR / "profile_trace.json"
+
+
+class _Profiler:
+    """Spans and counters recorded by --profile, written as a Chrome trace.
+
+    Open the trace in chrome://tracing or https://ui.perfetto.dev. Phases are
+    spans on the main thread; per-file parse spans sit on the thread of the
+    process that parsed them.
+    """
+
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self.origin_ns = time.perf_counter_ns()
+        self.events: List[Dict[str, Any]] = []
+        self.counters: Counter = Counter()
+        self.files: List[Tuple[int, int, str]] = []
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, args: Optional[Dict[str, Any]] = None) -> Iterator[None]:
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.complete(name, category, start_ns, time.perf_counter_ns(), args=args)
+
+    def complete(
+        self,
+        name: str,
+        category: str,
+        start_ns: int,
+        end_ns: int,
+        *,
+        tid: Optional[int] = None,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns - self.origin_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": tid if tid is not None else self.pid,
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def record_file(self, key: str, timing: Tuple[int, int, int, int, int]) -> None:
+        """Adds the parse span (and its YAML load) that a worker measured for `key`."""
+        worker, start_ns, yaml_start_ns, yaml_end_ns, end_ns = timing
+        self.complete(key, "file", start_ns, end_ns, tid=worker)
+        if yaml_end_ns > yaml_start_ns:
+            self.complete("yaml load", "yaml", yaml_start_ns, yaml_end_ns, tid=worker, args={"path": key})
+        self.files.append((end_ns - start_ns, yaml_end_ns - yaml_start_ns, key))
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def slowest_files(self, limit: int) -> List[Tuple[int, int, str]]:
+        return heapq.nlargest(limit, self.files)
+
+    def phases(self) -> List[Tuple[str, float]]:
+        return [(event["name"], event["dur"] / 1000) for event in self.events if event["cat"] == "phase"]
+
+    def write(self, path: Path) -> None:
+        end_ts = (time.perf_counter_ns() - self.origin_ns) / 1000
+        threads = {event["tid"] for event in self.events}
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": "build_manifest"}},
+            *(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self.pid,
+                    "tid": tid,
+                    "args": {"name": "main" if tid == self.pid else f"worker {tid}"},
+                }
+                for tid in sorted(threads)
+            ),
+        ]
+        counters = [
+            {"name": name, "ph": "C", "ts": end_ts, "pid": self.pid, "args": {"value": value}}
+            for name, value in sorted(self.counters.items())
+        ]
+        trace = {
+            "traceEvents": [*metadata, *self.events, *counters],
+            "displayTimeUnit": "ms",
+            "otherData": {"counters": dict(sorted(self.counters.items()))},
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(trace) + "\n", encoding="utf-8")
+
+
+# Set by build_manifest.main() when --profile is on.
+PROFILER: Optional[_Profiler] = None
+
+
+def _span(name: str, category: str = "phase", **args: Any) -> ContextManager[None]:
+    """A profiling span around a phase, or a no-op when --profile is off."""
+    if PROFILER is None:
+        return contextlib.nullcontext()
+    return PROFILER.span(name, category, args)
+
+
+def _count(name: str, amount: int = 1) -> None:
+    if PROFILER is not None:
+        PROFILER.count(name, amount)
+
+
+def _print_profile(profiler: _Profiler, trace_path: Path, *, top: int) -> None:
+    print("[profile] phases:", file=sys.stderr)
+    for name, milliseconds in profiler.phases():
+        print(f"[profile]   {name:<16} {milliseconds:10.1f} ms", file=sys.stderr)
+    for name, value in sorted(profiler.counters.items()):
+        print(f"[profile] {name}: {value}", file=sys.stderr)
+    slowest = profiler.slowest_files(top)
+    if slowest:
+        print(f"[profile] slowest {len(slowest)} file(s):", file=sys.stderr)
+        for parse_ns, yaml_ns, key in slowest:
+            print(f"[profile]   {parse_ns / 1e6:8.2f} ms (yaml {yaml_ns / 1e6:6.2f} ms)  {key}", file=sys.stderr)
+    print(f"[profile] trace written to {trace_path}; open it in https://ui.perfetto.dev", file=sys.stderr)
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Lazy, memory-mapped queries over the content manifest.
+
+`build_manifest.py` writes `data/content_manifest.idx` next to the manifest:
+a short JSON header followed by fixed-width arrays holding the byte span of
+every item in the manifest file, the items ordered by id and by
+`updated_at`, and posting lists per type, tag and theme. Opening an index
+maps both files and parses only the header, so startup costs the same for
+ten items or a million. Items are decoded from their JSON span only when
+they are accessed.
+
+    from manifest_query import ManifestIndex
+
+    with ManifestIndex.open() as index:
+        recent = index.by_tag("memory") & index.updated_between("2025-10-01")
+        for item in recent:
+            print(item["path"])
+
+The module sticks to the standard library and does not import
+`build_manifest`, so agents can load it without the builder's dependencies.
+It also avoids `pathlib`, `typing` and `datetime`, whose imports alone
+would cost more than opening the index and answering a query.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import datetime as dt
+    from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDEX_PATH = os.path.join(REPOSITORY_ROOT, "data", "content_manifest.idx")
+INDEX_FORMAT = "content_manifest.idx.v2"
+INDEX_MAGIC = b"KGMIDX01"
+FACETS = ("type", "tag", "theme")
+
+_PREFIX = struct.Struct("<8sI")  # magic, header length
+_ALIGN = 8
+
+
+def _day(value: Union[str, dt.date]) -> int:
+    """An ISO date (string or date) as a sortable YYYYMMDD integer."""
+    text = value if isinstance(value, str) else value.isoformat()
+    return int(text[:10].replace("-", ""))
+
+
+def _keys_section(keys: List[bytes]) -> Tuple[bytes, array]:
+    bounds = array("I", [0])
+    for key in keys:
+        bounds.append(bounds[-1] + len(key))
+    return b"".join(keys), bounds
+
+
+def encode_index(
+    records: Sequence[Tuple[str, str, Sequence[str], Sequence[str], str]],
+    spans: Sequence[Tuple[int, int]],
+    *,
+    data: str,
+    data_size: int,
+    data_mtime_ns: int,
+    generated_at: str,
+) -> Iterator[bytes]:
+    """Yields the binary index for `records`, whose JSON sits at `spans` (offset, length) in `data`.
+
+    Each record is (id, type, tags, themes, updated_at) of one item, in
+    manifest order. `data_size` and `data_mtime_ns` come from the stat of
+    `data` as written, so readers notice when it changes underneath.
+    """
+    if len(records) != len(spans):
+        raise ValueError(f"{len(records)} records but {len(spans)} item spans.")
+    count = len(records)
+    sections: Dict[str, Union[bytes, array]] = {
+        "offsets": array("Q", [offset for offset, _ in spans]),
+        "lengths": array("I", [length for _, length in spans]),
+    }
+
+    ids = [record[0].encode("utf-8") for record in records]
+    id_order = sorted(range(count), key=ids.__getitem__)
+    sections["id_keys"], sections["id_bounds"] = _keys_section([ids[position] for position in id_order])
+    sections["id_order"] = array("I", id_order)
+
+    days = [_day(record[4]) for record in records]
+    updated_order = sorted(range(count), key=days.__getitem__)
+    sections["updated_order"] = array("I", updated_order)
+    sections["updated_days"] = array("I", [days[position] for position in updated_order])
+
+    for facet, field in zip(FACETS, (1, 2, 3)):
+        postings: Dict[bytes, List[int]] = {}
+        for position, record in enumerate(records):
+            values = (record[field],) if facet == "type" else record[field]
+            for value in dict.fromkeys(values):
+                postings.setdefault(str(value).encode("utf-8"), []).append(position)
+        keys = sorted(postings)
+        sections[f"{facet}_keys"], sections[f"{facet}_bounds"] = _keys_section(keys)
+        starts = array("I", [0])
+        flat = array("I")
+        for key in keys:
+            flat.extend(postings[key])
+            starts.append(len(flat))
+        sections[f"{facet}_starts"] = starts
+        sections[f"{facet}_postings"] = flat
+
+    layout: Dict[str, List[Any]] = {}
+    blobs: List[bytes] = []
+    offset = 0
+    for name, section in sections.items():
+        blob = section.tobytes() if isinstance(section, array) else section
+        layout[name] = [offset, len(blob), section.typecode if isinstance(section, array) else "B"]
+        padding = -len(blob) % _ALIGN
+        blobs.append(blob + b"\0" * padding)
+        offset += len(blob) + padding
+    header = json.dumps(
+        {
+            "format": INDEX_FORMAT,
+            "byteorder": sys.byteorder,
+            "data": data,
+            "data_size": data_size,
+            "data_mtime_ns": data_mtime_ns,
+            "generated_at": generated_at,
+            "count": count,
+            "sections": layout,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    header += b" " * (-(_PREFIX.size + len(header)) % _ALIGN)
+    yield _PREFIX.pack(INDEX_MAGIC, len(header)) + header
+    yield from blobs
+
+
+class _Keys:
+    """Sorted UTF-8 keys stored back to back, searchable with bisect."""
+
+    __slots__ = ("blob", "bounds")
+
+    def __init__(self, blob: memoryview, bounds: memoryview) -> None:
+        self.blob = blob
+        self.bounds = bounds
+
+    def __len__(self) -> int:
+        return len(self.bounds) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return self.blob[self.bounds[index] : self.bounds[index + 1]].tobytes()
+
+    def find(self, key: str) -> int:
+        """Position of `key`, or -1."""
+        encoded = key.encode("utf-8")
+        index = bisect.bisect_left(self, encoded)
+        return index if index < len(self) and self[index] == encoded else -1
+
+
+def _sorted_member(positions: Sequence[int]) -> Any:
+    def member(position: int) -> bool:
+        found = bisect.bisect_left(positions, position)
+        return found < len(positions) and positions[found] == position
+
+    return member
+
+
+class Selection:
+    """Item positions matched by a query; items are decoded on access.
+
+    `ordered` selections (facets, all items) hold ascending manifest
+    positions, which lets `&` probe them with bisect instead of building sets.
+    """
+
+    __slots__ = ("index", "positions", "ordered")
+
+    def __init__(self, index: "ManifestIndex", positions: Sequence[int], *, ordered: bool = True) -> None:
+        self.index = index
+        self.positions = positions
+        self.ordered = ordered
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __bool__(self) -> bool:
+        return len(self.positions) > 0
+
+    def __getitem__(self, key: Union[int, slice]) -> Any:
+        if isinstance(key, slice):
+            return Selection(self.index, self.positions[key], ordered=self.ordered and (key.step or 1) > 0)
+        return self.index.item(self.positions[key])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        item = self.index.item
+        for position in self.positions:
+            yield item(position)
+
+    def _member(self) -> Any:
+        return _sorted_member(self.positions) if self.ordered else set(self.positions).__contains__
+
+    def __and__(self, other: "Selection") -> "Selection":
+        """Items in both selections, in this selection's order."""
+        if not self.ordered:
+            member = other._member()
+            return Selection(self.index, [p for p in self.positions if member(p)], ordered=False)
+        if other.ordered and len(other) > len(self):
+            member = other._member()
+            return Selection(self.index, [p for p in self.positions if member(p)])
+        member = self._member()
+        kept = [p for p in other.positions if member(p)]
+        return Selection(self.index, kept if other.ordered else sorted(kept))
+
+    def __or__(self, other: "Selection") -> "Selection":
+        """Items in either selection, in manifest order."""
+        return Selection(self.index, sorted(set(self.positions).union(other.positions)))
+
+    def ids(self) -> List[str]:
+        return [item["id"] for item in self]
+
+    def __repr__(self) -> str:
+        return f"<Selection of {len(self)} item(s)>"
+
+
+class ManifestIndex:
+    """Read-only view of the manifest through its binary companion index."""
+
+    def __init__(self, path: Union[str, os.PathLike] = INDEX_PATH) -> None:
+        self.path = os.fspath(path)
+        self._maps: List[mmap.mmap] = []
+        index_map = self._map(self.path)
+        magic, header_size = _PREFIX.unpack_from(index_map)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{self.path} is not a manifest index.")
+        header = json.loads(index_map[_PREFIX.size : _PREFIX.size + header_size])
+        if header.get("format") != INDEX_FORMAT or header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"{self.path} was written as {header.get('format')}; rebuild it with build_manifest.py.")
+        self.header = header
+        self.data_path = os.path.join(os.path.dirname(self.path), header["data"])
+        # A same-length edit keeps the size, so the modification time is compared too.
+        stat = os.stat(self.data_path)
+        if (stat.st_size, stat.st_mtime_ns) != (header["data_size"], header["data_mtime_ns"]):
+            raise ValueError(f"{self.path} is out of date with {self.data_path}; rerun build_manifest.py.")
+        # An empty manifest cannot be mapped, but then no span is ever read from it.
+        self._data = self._map(self.data_path) if header["count"] else b""
+        self._base = memoryview(index_map)[_PREFIX.size + header_size :]
+        self._sections = {
+            name: self._base[offset : offset + size].cast(typecode)
+            for name, (offset, size, typecode) in header["sections"].items()
+        }
+        self._offsets = self._sections["offsets"]
+        self._lengths = self._sections["lengths"]
+        self._ids = _Keys(self._sections["id_keys"], self._sections["id_bounds"])
+        self._facets = {
+            facet: _Keys(self._sections[f"{facet}_keys"], self._sections[f"{facet}_bounds"]) for facet in FACETS
+        }
+
+    @classmethod
+    def open(cls, path: Union[str, os.PathLike] = INDEX_PATH) -> "ManifestIndex":
+        return cls(path)
+
+    def _map(self, path: str) -> mmap.mmap:
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def close(self) -> None:
+        for view in self._sections.values():
+            view.release()
+        self._sections.clear()
+        self._base.release()
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:  # a Selection still slices the postings; unmapped once it goes away
+                pass
+        self._maps.clear()
+
+    def __enter__(self) -> "ManifestIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.header["count"]
+
+    @property
+    def generated_at(self) -> str:
+        return self.header["generated_at"]
+
+    def item(self, position: int) -> Dict[str, Any]:
+        """Decodes the item at manifest `position`."""
+        offset = self._offsets[position]
+        return json.loads(self._data[offset : offset + self._lengths[position]])
+
+    def all(self) -> Selection:
+        return Selection(self, range(len(self)))
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        found = self._ids.find(item_id)
+        return self.item(self._sections["id_order"][found]) if found >= 0 else None
+
+    def _postings(self, facet: str, value: str) -> Selection:
+        found = self._facets[facet].find(value)
+        if found < 0:
+            return Selection(self, ())
+        starts = self._sections[f"{facet}_starts"]
+        return Selection(self, self._sections[f"{facet}_postings"][starts[found] : starts[found + 1]])
+
+    def by_type(self, value: str) -> Selection:
+        return self._postings("type", value)
+
+    def by_tag(self, value: str) -> Selection:
+        return self._postings("tag", value)
+
+    def by_theme(self, value: str) -> Selection:
+        return self._postings("theme", value)
+
+    def values(self, facet: str) -> List[str]:
+        """Every distinct type, tag or theme, sorted."""
+        keys = self._facets[facet]
+        return [keys[index].decode("utf-8") for index in range(len(keys))]
+
+    def updated_between(
+        self, start: Union[str, dt.date, None] = None, end: Union[str, dt.date, None] = None
+    ) -> Selection:
+        """Items whose `updated_at` falls within [start, end], oldest first; either bound may be open."""
+        days = self._sections["updated_days"]
+        low = bisect.bisect_left(days, _day(start)) if start is not None else 0
+        high = bisect.bisect_right(days, _day(end)) if end is not None else len(days)
+        return Selection(self, self._sections["updated_order"][low:high], ordered=False)
+
+
+def _print_items(selection: Iterable[Dict[str, Any]]) -> None:
+    for item in selection:
+        print(f"{item['updated_at']}  {item['type']:<9} {item['id']}  {item['path']}")
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the content manifest through its binary index.")
+    parser.add_argument("--index", default=INDEX_PATH, help="Index written by build_manifest.py.")
+    parser.add_argument("--id", help="Print the item with this id as JSON.")
+    parser.add_argument("--type", help="Only items of this type.")
+    parser.add_argument("--tag", action="append", default=[], help="Only items with this tag (repeatable).")
+    parser.add_argument("--theme", action="append", default=[], help="Only items with this theme (repeatable).")
+    parser.add_argument("--since", help="Only items updated on or after this ISO date.")
+    parser.add_argument("--until", help="Only items updated on or before this ISO date.")
+    args = parser.parse_args()
+
+    with ManifestIndex.open(args.index) as index:
+        if args.id:
+            item = index.get(args.id)
+            if item is None:
+                raise SystemExit(f"[manifest_query] no item with id {args.id!r}")
+            print(json.dumps(item, indent=2, ensure_ascii=False))
+            return
+        selection = index.all()
+        if args.since or args.until:
+            selection = index.updated_between(args.since, args.until)
+        if args.type:
+            selection &= index.by_type(args.type)
+        for tag in args.tag:
+            selection &= index.by_tag(tag)
+        for theme in args.theme:
+            selection &= index.by_theme(theme)
+        _print_items(selection)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as exc:  # pragma: no cover
+        print(f"[manifest_query] error: {exc}", file=sys.stderr)
+        sys.exit(1)
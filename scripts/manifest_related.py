@@ -0,0 +1,312 @@
+"""
+Related-item suggestions for `build_manifest.py --related`.
+
+Every item becomes a TF-IDF row over its body terms, tags and themes, and
+its neighbours are the items with the highest cosine similarity. numpy and
+scipy are imported only when suggestions are requested.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from manifest_common import CACHE_DIR, DOCS_ROOT
+from manifest_profile import _count, _span
+from manifest_search import _read_markdown_body, _search_terms
+
+if TYPE_CHECKING:
+    from manifest_items import ManifestItem
+
+RELATED_CACHE_PATH = CACHE_DIR / "related_cache.npz"
+RELATED_FORMAT = "related.v1"
+RELATED_TOP_K = 5
+RELATED_CARD_LIMIT = 3
+RELATED_MIN_SCORE = 0.05
+RELATED_TAG_WEIGHT = 3.0  # a shared tag or theme weighs like a body word repeated ~7 times
+RELATED_BODY_CHARS = 8000
+# Terms in more than this share of the items (but at least RELATED_MAX_DF_FLOOR of them) say
+# little about relatedness and fill the similarity products, so they are dropped.
+RELATED_MAX_DF = 0.01
+RELATED_MAX_DF_FLOOR = 50
+RELATED_BLOCK_CELLS = 1 << 22  # similarity cells per block; bounds memory at any garden size
+RELATED_REBUILD_FRACTION = 0.2  # past this share of changed items everything is recomputed
+_RELATED_SCORE_BITS = 20  # resolution of scores inside the top-k sort key
+
+
+def _related_backend() -> Tuple[Any, Any]:
+    """numpy and scipy.sparse, imported on first use so builds without --related never load them."""
+    try:
+        import numpy
+        from scipy import sparse
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("--related needs numpy and scipy (pip install numpy scipy)") from exc
+    return numpy, sparse
+
+
+def _related_features(item: ManifestItem, docs_root: Path) -> Dict[str, float]:
+    """Sublinear term frequencies of an item's title, summary and body, plus its tags and themes."""
+    text = f"{item.title} {item.summary}"
+    if item.type != "resource":  # resources share links.md and only have their metadata
+        try:
+            text += " " + _read_markdown_body(docs_root / item.path)[:RELATED_BODY_CHARS]
+        except (OSError, UnicodeDecodeError):
+            pass
+    features = {term: 1.0 + math.log(count) for term, count in Counter(_search_terms(text)).items()}
+    for tag in item.tags:
+        features[f"tag:{tag}"] = RELATED_TAG_WEIGHT
+    for theme in item.themes:
+        features[f"theme:{theme}"] = RELATED_TAG_WEIGHT
+    return features
+
+
+def _related_fingerprint(item: ManifestItem, docs_root: Path) -> int:
+    """Changes whenever `_related_features` could: the metadata it reads or the file's size and mtime."""
+    stat = ""
+    if item.type != "resource":
+        try:
+            info = (docs_root / item.path).stat()
+            stat = f"{info.st_mtime_ns}:{info.st_size}"
+        except OSError:
+            pass
+    key = f"{item.title}\0{item.summary}\0{item.tags}\0{item.themes}\0{stat}"
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _related_idf(np: Any, counts: Any, size: int, width: int) -> Any:
+    """IDF weight of every column, zero for terms in fewer than two items or past the RELATED_MAX_DF cutoff."""
+    document_frequency = np.bincount(counts.indices, minlength=width)
+    idf = (np.log((1 + size) / (1 + document_frequency)) + 1).astype(np.float32)
+    idf[(document_frequency < 2) | (document_frequency > max(RELATED_MAX_DF_FLOOR, RELATED_MAX_DF * size))] = 0
+    return idf
+
+
+def _top_k_entries(np: Any, rows: Any, cols: Any, scores: Any, k: int) -> Tuple[Any, Any, Any, Any]:
+    """Keeps the `k` best-scoring (row, col, score) entries of every row, with their ranks.
+
+    Entries are ordered by (row, descending score, column), packed into one
+    int64 key so a single argsort replaces a three-key lexsort; the column
+    breaks score ties, so the output is stable.
+    """
+    if not len(rows):
+        return rows, cols, scores, rows
+    row_bits, col_bits = int(rows.max()).bit_length(), int(cols.max()).bit_length()
+    if row_bits + _RELATED_SCORE_BITS + col_bits < 63:
+        steps = (1 << _RELATED_SCORE_BITS) - 1
+        rank = np.rint((1 - np.clip(scores, 0, 1)) * steps).astype(np.int64)
+        order = np.argsort(((rows.astype(np.int64) << _RELATED_SCORE_BITS | rank) << col_bits) | cols)
+    else:  # pragma: no cover - gardens with millions of items
+        order = np.lexsort((cols, -scores, rows))
+    rows, cols, scores = rows[order], cols[order], scores[order]
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    ranks = np.arange(len(rows)) - np.repeat(starts, np.diff(np.r_[starts, len(rows)]))
+    keep = ranks < k
+    return rows[keep], cols[keep], scores[keep], ranks[keep]
+
+
+class _RelatedCache:
+    """Feature rows and top-k neighbours of the previous --related run, persisted as one .npz file.
+
+    Rows are keyed by item id and fingerprint, so the next run only
+    re-reads the items that changed, and re-scores the rows whose weighted
+    vectors moved plus the rows whose neighbour lists they touch.
+    """
+
+    def __init__(self, path: Optional[Path], state: Optional[Dict[str, Any]] = None) -> None:
+        self.path = path
+        self.state = state
+        self.recomputed = 0
+
+    @classmethod
+    def load(cls, path: Path, *, full: bool = False, top_k: int = RELATED_TOP_K) -> "_RelatedCache":
+        if full or not path.exists():
+            return cls(path)
+        np, sparse = _related_backend()
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                meta = json.loads(str(stored["meta"]))
+                if meta.get("format") != RELATED_FORMAT or meta.get("top_k") != top_k:
+                    return cls(path)
+                counts = sparse.csr_matrix(
+                    (stored["data"], stored["indices"], stored["indptr"]),
+                    shape=(len(meta["ids"]), len(meta["vocabulary"])),
+                )
+                state = {
+                    "ids": meta["ids"],
+                    "vocabulary": meta["vocabulary"],
+                    "fingerprints": stored["fingerprints"],
+                    "counts": counts,
+                    "neighbours": stored["neighbours"],
+                    "scores": stored["scores"],
+                }
+        except (OSError, ValueError, KeyError):
+            return cls(path)
+        return cls(path, state)
+
+    def save(self, top_k: int = RELATED_TOP_K) -> None:
+        if self.path is None or self.state is None or not self.recomputed:
+            return
+        np, _ = _related_backend()
+        state = self.state
+        meta = {"format": RELATED_FORMAT, "top_k": top_k, "ids": state["ids"], "vocabulary": state["vocabulary"]}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("wb") as handle:
+            np.savez(
+                handle,
+                meta=np.array(json.dumps(meta, ensure_ascii=False)),
+                fingerprints=state["fingerprints"],
+                data=state["counts"].data,
+                indices=state["counts"].indices,
+                indptr=state["counts"].indptr,
+                neighbours=state["neighbours"],
+                scores=state["scores"],
+            )
+        os.replace(tmp_path, self.path)
+
+
+def suggest_related(
+    manifest: Dict[str, Any],
+    *,
+    docs_root: Path = DOCS_ROOT,
+    cache: Optional[_RelatedCache] = None,
+    top_k: int = RELATED_TOP_K,
+) -> Dict[str, List[ManifestItem]]:
+    """Maps every item id to its `top_k` most similar items by TF-IDF cosine similarity.
+
+    Items become L2-normalised sparse rows over body terms, tags and themes.
+    Similarities are computed as blocks of sparse row products against the
+    whole matrix, at most RELATED_BLOCK_CELLS cells at a time, and each block
+    is cut to its top k entries per row before the next one starts. With a
+    `cache`, unchanged items reuse their feature rows. A row is re-scored when
+    its weighted vector moved: the item changed, or the IDF weight of one of
+    its terms did. Adding or removing an item changes every weight, so every
+    row is re-scored then. Rows whose previous neighbours moved are re-scored
+    too. Every other row merges its old list with its similarities to the
+    moved rows, so the result matches a run without the cache.
+    """
+    np, sparse = _related_backend()
+    items: List[ManifestItem] = manifest["items"]
+    size = len(items)
+    cache = cache if cache is not None else _RelatedCache(None)
+    previous = cache.state
+    fingerprints = np.fromiter(
+        (_related_fingerprint(item, docs_root) for item in items), dtype=np.uint64, count=size
+    )
+
+    old_rows = np.full(size, -1, dtype=np.int64)
+    if previous is not None:
+        known = {item_id: row for row, item_id in enumerate(previous["ids"])}
+        for row, item in enumerate(items):
+            old = known.get(item.id, -1)
+            if old >= 0 and previous["fingerprints"][old] == fingerprints[row]:
+                old_rows[row] = old
+    reused = np.flatnonzero(old_rows >= 0)
+    changed = np.flatnonzero(old_rows < 0)
+    removed = 0 if previous is None else len(previous["ids"]) - len(reused)
+    full = previous is None or len(changed) + removed > RELATED_REBUILD_FRACTION * max(size, 1)
+
+    with _span("related features", items=len(changed)):
+        vocabulary: Dict[str, int] = {}
+        if not full:
+            vocabulary = {term: column for column, term in enumerate(previous["vocabulary"])}
+        indptr, indices, data = [0], [], []
+        for row in (range(size) if full else changed):
+            for term, weight in _related_features(items[row], docs_root).items():
+                indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                data.append(weight)
+            indptr.append(len(indices))
+        width = len(vocabulary)
+        fresh = sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, width),
+        )
+        if full:
+            counts = fresh
+        else:
+            old = previous["counts"][old_rows[reused]]
+            old = sparse.csr_matrix((old.data, old.indices, old.indptr), shape=(len(reused), width))
+            order = np.concatenate([reused, changed])
+            counts = sparse.vstack([old, fresh], format="csr")[np.argsort(order)]
+
+    idf = _related_idf(np, counts, size, width)
+    matrix = sparse.csr_matrix(counts.multiply(idf[np.newaxis, :]), dtype=np.float32)
+    matrix.eliminate_zeros()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    matrix = sparse.diags((1 / norms).astype(np.float32)) @ matrix
+    transposed = matrix.T.tocsr()
+
+    neighbours = np.full((size, top_k), -1, dtype=np.int32)
+    scores = np.zeros((size, top_k), dtype=np.float32)
+    stable = np.zeros(size, dtype=bool)
+    if full:
+        compute = np.arange(size)
+    else:
+        # Old neighbour lists in current positions; a list that lost a member is re-scored whole.
+        to_current = np.full(len(previous["ids"]), -1, dtype=np.int64)
+        to_current[old_rows[reused]] = reused
+        old_neighbours = previous["neighbours"][old_rows[reused]]
+        mapped = np.where(old_neighbours >= 0, to_current[old_neighbours], -1)
+        # IDF weights are global: a term whose weight changed moves every row that contains it.
+        reweighted = np.flatnonzero(idf != _related_idf(np, previous["counts"], len(previous["ids"]), width))
+        moved = (old_rows < 0) | (counts[:, reweighted].getnnz(axis=1) > 0)
+        lost = (old_neighbours >= 0) & ((mapped < 0) | moved[np.maximum(mapped, 0)])
+        affected = reused[lost.any(axis=1)]
+        compute = np.union1d(np.flatnonzero(moved), affected)
+        stable[reused] = True
+        stable[compute] = False
+    incremental = bool(stable.any())
+    candidates: List[Tuple[Any, Any, Any]] = []
+
+    block_rows = max(1, RELATED_BLOCK_CELLS // max(size, 1))
+    with _span("related scores", rows=len(compute)):
+        for start in range(0, len(compute), block_rows):
+            block = compute[start : start + block_rows]
+            product = (matrix[block] @ transposed).tocoo()
+            rows, cols, values = block[product.row], product.col.astype(np.int64), product.data
+            keep = (rows != cols) & (values >= RELATED_MIN_SCORE)
+            rows, cols, values = rows[keep], cols[keep], values[keep]
+            if incremental:
+                # Similarity is symmetric: moved rows hand stable rows their scores against them.
+                toward = stable[cols] & moved[rows]
+                candidates.append((cols[toward], rows[toward], values[toward]))
+            rows, cols, values, ranks = _top_k_entries(np, rows, cols, values, top_k)
+            neighbours[rows, ranks] = cols
+            scores[rows, ranks] = values
+
+    if incremental:
+        rows = np.flatnonzero(stable)
+        old = old_rows[rows]
+        kept = previous["neighbours"][old] >= 0
+        candidates.append(
+            (
+                np.repeat(rows, kept.sum(axis=1)),
+                to_current[previous["neighbours"][old][kept]],
+                previous["scores"][old][kept],
+            )
+        )
+        rows, cols, values, ranks = _top_k_entries(
+            np, *(np.concatenate([candidate[part] for candidate in candidates]) for part in range(3)), top_k
+        )
+        neighbours[rows, ranks] = cols
+        scores[rows, ranks] = values
+
+    cache.recomputed = len(compute)
+    cache.state = {
+        "ids": [item.id for item in items],
+        "vocabulary": list(vocabulary),
+        "fingerprints": fingerprints,
+        "counts": counts,
+        "neighbours": neighbours,
+        "scores": scores,
+    }
+    _count("related rows recomputed", len(compute))
+    return {
+        item.id: [items[column] for column in neighbours[row] if column >= 0] for row, item in enumerate(items)
+    }
@@ -0,0 +1,265 @@
+"""
+Front matter and manifest item validation against the `section_file_schema.yml`
+files and `data/content_manifest_schema.yml`.
+
+Each schema is compiled once into plain type checks; `_SchemaReport` gathers
+every problem of a build so they are reported together.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import functools
+import hashlib
+import re
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from manifest_common import MANIFEST_SCHEMA_PATH, SECTIONS, ManifestBuildError
+from manifest_items import _as_list
+from manifest_yaml import _load_yaml
+
+SECTION_SCHEMA_FILE = "section_file_schema.yml"
+SCHEMA_SECTIONS = (*(section for section, _ in SECTIONS), "resources")
+_SCHEMA_KEBAB = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*\Z")
+_SCHEMA_URL = re.compile(r"https?://[^\s/]+\S*\Z")
+_MISSING = object()
+
+
+def _is_date(value: Any) -> bool:
+    if isinstance(value, dt.date):
+        return True
+    try:
+        dt.date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _is_datetime(value: Any) -> bool:
+    if isinstance(value, dt.date):
+        return True
+    try:
+        dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return False
+    return True
+
+
+_SCHEMA_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda value: isinstance(value, str),
+    "markdown": lambda value: isinstance(value, str),
+    "code": lambda value: isinstance(value, str),
+    "id": lambda value: isinstance(value, str),
+    "kebab": lambda value: isinstance(value, str) and _SCHEMA_KEBAB.match(value) is not None,
+    "url": lambda value: isinstance(value, str) and _SCHEMA_URL.match(value) is not None,
+    "path": lambda value: isinstance(value, str) and "://" not in value,
+    "date": _is_date,
+    "datetime": _is_datetime,
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def _split_alternatives(spec: str) -> List[str]:
+    """Splits `a|list[b|c]|null` on the pipes outside brackets."""
+    parts: List[str] = []
+    depth = start = 0
+    for index, char in enumerate(spec):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            parts.append(spec[start:index].strip())
+            start = index + 1
+    parts.append(spec[start:].strip())
+    return parts
+
+
+def _compile_type(spec: str) -> Optional[Callable[[Any], bool]]:
+    """A predicate for a schema type such as `string|null`, `enum[a, b]` or `list[path]`.
+
+    Returns None for names the schemas use only descriptively, which then
+    accept any value.
+    """
+    checks: List[Callable[[Any], bool]] = []
+    for alternative in _split_alternatives(spec):
+        name, _, argument = alternative.partition("[")
+        argument = argument[:-1] if argument.endswith("]") else argument
+        if name == "enum":
+            options = frozenset(option.strip().strip("'\"") for option in argument.split(","))
+            checks.append(lambda value, options=options: isinstance(value, str) and value in options)
+        elif name == "list":
+            element = _compile_type(argument)
+            if element is None:
+                checks.append(lambda value: isinstance(value, list))
+            else:
+                checks.append(
+                    lambda value, element=element: isinstance(value, list) and all(map(element, value))
+                )
+        elif name == "map":
+            checks.append(lambda value: isinstance(value, dict))
+        elif name in _SCHEMA_TYPES:
+            checks.append(_SCHEMA_TYPES[name])
+        else:
+            return None
+    if len(checks) == 1:
+        return checks[0]
+    return lambda value: any(check(value) for check in checks)
+
+
+class _SchemaCheck(NamedTuple):
+    """A schema compiled to flat (dotted path, predicate, spec) field checks plus its rules."""
+
+    name: str
+    fields: Tuple[Tuple[Tuple[str, ...], Callable[[Any], bool], str], ...]
+    required: Tuple[Tuple[str, ...], ...]
+    unique_by: Tuple[str, ...]
+
+
+def _compile_fields(
+    spec: Dict[str, Any], prefix: Tuple[str, ...] = ()
+) -> Iterator[Tuple[Tuple[str, ...], Callable[[Any], bool], str]]:
+    for key, value in spec.items():
+        path = (*prefix, str(key))
+        if isinstance(value, dict):
+            yield path, lambda found: isinstance(found, dict), "a mapping"
+            yield from _compile_fields(value, path)
+            continue
+        text = str(value).strip()
+        if text.startswith("{") and text.endswith("}"):  # inline mapping of a one-line schema
+            yield path, lambda found: isinstance(found, dict), "a mapping"
+            continue
+        check = _compile_type(text)
+        if check is not None:
+            yield path, check, text
+
+
+def _compile_schema(name: str, fields: Dict[str, Any], rules: Iterable[Any]) -> _SchemaCheck:
+    required: List[Tuple[str, ...]] = []
+    unique_by: List[str] = []
+    for rule in rules:
+        if not isinstance(rule, dict):
+            continue
+        required.extend(tuple(str(field).split(".")) for field in _as_list(rule.get("must_have")))
+        unique_by.extend(str(field) for field in _as_list(rule.get("unique_by")))
+    return _SchemaCheck(name, tuple(_compile_fields(fields or {})), tuple(required), tuple(unique_by))
+
+
+@functools.lru_cache(maxsize=None)
+def _section_schema(section_root: str) -> Optional[_SchemaCheck]:
+    """Compiles `<section>/section_file_schema.yml` once per process; None when the section has none."""
+    path = Path(section_root) / SECTION_SCHEMA_FILE
+    if not path.is_file():
+        return None
+    schema = _load_yaml(path.read_text(encoding="utf-8"))
+    name = str(schema.get("$schema") or path.parent.name)
+    if "collections" in schema:  # resources: each catalog entry is checked against its collection
+        collection = (schema.get("collections") or {}).get("links") or {}
+        rules = [{"unique_by": collection.get("unique_by")}]
+        return _compile_schema(f"{name}#links", collection.get("item") or {}, rules)
+    return _compile_schema(name, schema.get("front_matter") or {}, schema.get("rules") or [])
+
+
+@functools.lru_cache(maxsize=None)
+def _manifest_item_schema(schema_path: str = str(MANIFEST_SCHEMA_PATH)) -> _SchemaCheck:
+    schema = _load_yaml(Path(schema_path).read_text(encoding="utf-8"))
+    return _compile_schema("manifest_item", schema.get("manifest_item") or {}, ())
+
+
+def _schema_fingerprint(docs_root: Path) -> str:
+    """Hash of every schema file, so cached schema problems expire when a schema changes."""
+    digest = hashlib.sha1()
+    for path in [MANIFEST_SCHEMA_PATH, *(docs_root / section / SECTION_SCHEMA_FILE for section in SCHEMA_SECTIONS)]:
+        digest.update(path.as_posix().encode("utf-8"))
+        if path.is_file():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _schema_lookup(document: Any, path: Tuple[str, ...]) -> Any:
+    for key in path:
+        if not isinstance(document, dict) or key not in document:
+            return _MISSING
+        document = document[key]
+    return document
+
+
+def _check_document(check: _SchemaCheck, document: Dict[str, Any], where: str = "") -> Tuple[List[str], List[str]]:
+    """Returns (problems, unique-by tokens) of one front matter block or catalog entry."""
+    problems: List[str] = []
+    missing = [
+        f"`{'.'.join(path)}`" for path in check.required if _schema_lookup(document, path) in (_MISSING, None, "", [], {})
+    ]
+    if missing:
+        problems.append(f"{where}{check.name}: missing required {', '.join(missing)}")
+    for path, predicate, spec in check.fields:
+        value = _schema_lookup(document, path)
+        if value is not _MISSING and not predicate(value):
+            shown = repr(value if not isinstance(value, (dt.date, dt.datetime)) else value.isoformat())
+            shown = shown if len(shown) <= 60 else shown[:57] + "..."
+            problems.append(f"{where}{check.name}: `{'.'.join(path)}` should be {spec}, got {shown}")
+    unique = [
+        f"{field}={value}"
+        for field in check.unique_by
+        for value in (_schema_lookup(document, (field,)),)
+        if value not in (_MISSING, None, "")
+    ]
+    return problems, unique
+
+
+class _SchemaReport:
+    """Schema problems of one build, gathered per file and checked across files for `unique_by`."""
+
+    def __init__(self) -> None:
+        self.problems: Dict[str, List[str]] = {}
+        self.unique: Dict[Tuple[str, str], List[str]] = {}
+
+    def add(self, key: str, checks: Tuple[Tuple[str, ...], Tuple[str, ...]]) -> None:
+        problems, unique = checks
+        if problems:
+            self.problems.setdefault(key, []).extend(problems)
+        section = key.split("/", 1)[0]
+        for token in unique:
+            self.unique.setdefault((section, token), []).append(key)
+
+    def merge(self, problems: Iterable[Tuple[str, str]]) -> None:
+        """Adds the finished problems of another report, such as a federated root's."""
+        for key, message in problems:
+            self.problems.setdefault(key, []).append(message)
+
+    def finish(self) -> List[Tuple[str, str]]:
+        """Adds `unique_by` clashes and returns every problem as (docs path, message), sorted."""
+        for (_, token), keys in self.unique.items():
+            if len(keys) > 1:
+                field, _, value = token.partition("=")
+                for key in keys:
+                    others = ", ".join(other for other in keys if other != key) or key
+                    self.problems.setdefault(key, []).append(f"duplicate {field} {value!r} (also in {others})")
+        self.unique.clear()
+        return [(key, message) for key in sorted(self.problems) for message in self.problems[key]]
+
+
+def _print_schema_report(problems: List[Tuple[str, str]]) -> None:
+    """Prints schema problems as one warning line per file plus a total."""
+    by_file: Dict[str, List[str]] = {}
+    for path, message in problems:
+        by_file.setdefault(path, []).append(message)
+    for path, messages in by_file.items():
+        print(f"[build_manifest] warning: {path}: {'; '.join(messages)}", file=sys.stderr)
+    print(
+        f"[build_manifest] schema: {len(problems)} problem(s) in {len(by_file)} file(s); "
+        "--strict-schema fails the build on them",
+        file=sys.stderr,
+    )
+
+
+class SchemaValidationError(ManifestBuildError):
+    """Raised by --strict-schema when front matter or catalog entries break their section schema."""
+
+    def __init__(self, errors: List[Tuple[str, str]]) -> None:
+        super().__init__(errors)
+        self.args = (f"{len(errors)} schema problem(s) in {len({path for path, _ in errors})} file(s)",)
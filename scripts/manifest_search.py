@@ -0,0 +1,201 @@
+"""
+Prebuilt BM25 search index for the published site, split into prefix shards.
+
+`build_manifest.py --search-index` writes it under docs/assets/search/, and
+`SearchIndex` answers queries from the same files, loading each shard on
+first use. The tokenizer also feeds duplicate detection and related items.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from manifest_common import DOCS_ROOT, _consume_front_matter, _known_doc_paths
+from manifest_output import _write_chunks_if_changed
+
+SEARCH_INDEX_DIR = DOCS_ROOT / "assets" / "search"
+SEARCH_INDEX_FORMAT = "search_index.v1"
+SEARCH_PREFIX_LENGTH = 2
+SEARCH_DOC_CHUNK = 500
+SEARCH_METADATA_WEIGHT = 3
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_SEARCH_MARKUP = re.compile(r"<[^>]*>|https?://\S+|\]\([^)]*\)")
+_SEARCH_COMBINING = re.compile("[\u0300-\u036f]")
+_SEARCH_TOKEN = re.compile(r"[^\W_]{2,}")
+_SEARCH_HEADING = re.compile(r"^#\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_SEARCH_STOP_WORDS = frozenset(
+    "an and are as at be by com como da das de do dos em for from how in is it na nas no nos of on or os "
+    "para pela pelo por que se the this to um uma with".split()
+)
+
+
+def _search_terms(text: str) -> List[str]:
+    """Lowercased, accent-folded word tokens of `text` without markup, URLs or stop words."""
+    folded = _SEARCH_COMBINING.sub("", unicodedata.normalize("NFKD", _SEARCH_MARKUP.sub(" ", text).lower()))
+    return [term for term in _SEARCH_TOKEN.findall(folded) if term not in _SEARCH_STOP_WORDS]
+
+
+def _search_shard(term: str) -> str:
+    """Shard name of a term: its first SEARCH_PREFIX_LENGTH characters as UTF-8 hex."""
+    return term[:SEARCH_PREFIX_LENGTH].encode("utf-8").hex()
+
+
+def _page_url(path: str) -> str:
+    """Site-relative URL mkdocs gives a docs page with directory URLs."""
+    directory, _, name = path.rpartition("/")
+    if name in {"README.md", "index.md"}:
+        return f"{directory}/" if directory else ""
+    return path[: -len(".md")] + "/"
+
+
+def _read_markdown_body(path: Path) -> str:
+    with path.open("r", encoding="utf-8") as handle:
+        if _consume_front_matter(handle, str(path)) is None:
+            handle.seek(0)
+        return handle.read()
+
+
+def build_search_index(
+    manifest: Dict[str, Any], *, docs_root: Path = DOCS_ROOT, output_dir: Path = SEARCH_INDEX_DIR
+) -> Dict[str, int]:
+    """Writes a BM25 inverted index of every docs page to `output_dir`, split into prefix shards.
+
+    `meta.json` holds the BM25 parameters, every document length and the
+    shard list; `shards/<hex prefix>.json` maps each term to its postings as
+    a flat `[doc delta, tf, ...]` list, and `docs/<n>.json` holds the
+    `[url, title, type]` of SEARCH_DOC_CHUNK documents. A query therefore
+    fetches meta, the shards of its terms and the chunks of its top hits.
+    Manifest items contribute their title, tags and summary with
+    SEARCH_METADATA_WEIGHT; other pages use their first heading.
+    """
+    items_by_path = {item.path: item for item in manifest["items"] if item.type != "resource"}
+    docs: List[List[Any]] = []
+    lengths: List[int] = []
+    postings: Dict[str, List[int]] = {}
+    total_length = 0
+    for path in sorted(_known_doc_paths(docs_root)):
+        if not path.endswith(".md"):
+            continue
+        body = _read_markdown_body(docs_root / path)
+        item = items_by_path.get(path)
+        if item is not None:
+            title = str(item.title)
+            metadata = " ".join(map(str, [item.title, item.summary, *item.tags]))
+        else:
+            heading = _SEARCH_HEADING.search(body)
+            title = heading.group(1) if heading else Path(path).stem.replace("-", " ").title()
+            metadata = title
+        counts = Counter(_search_terms(body))
+        for term in _search_terms(metadata):
+            counts[term] += SEARCH_METADATA_WEIGHT
+        if not counts:
+            continue
+        length = sum(counts.values())
+        total_length += length
+        doc = len(docs)
+        docs.append([_page_url(path), title, item.type if item is not None else "page"])
+        lengths.append(length)
+        for term, frequency in counts.items():
+            postings.setdefault(term, []).extend((doc, frequency))
+
+    shards: Dict[str, Dict[str, List[int]]] = {}
+    for term in sorted(postings):
+        flat = postings[term]
+        previous = 0
+        for offset in range(0, len(flat), 2):
+            flat[offset], previous = flat[offset] - previous, flat[offset]
+        shards.setdefault(_search_shard(term), {})[term] = flat
+
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    chunks = {
+        str(start // SEARCH_DOC_CHUNK): docs[start : start + SEARCH_DOC_CHUNK]
+        for start in range(0, len(docs), SEARCH_DOC_CHUNK)
+    }
+    for folder, files in (("shards", shards), ("docs", chunks)):
+        for name, payload in files.items():
+            _write_chunks_if_changed(output_dir / folder / f"{name}.json", [encode(payload)])
+        if (output_dir / folder).is_dir():
+            for stale in (output_dir / folder).glob("*.json"):
+                if stale.stem not in files:
+                    stale.unlink()
+    meta = {
+        "format": SEARCH_INDEX_FORMAT,
+        "prefix_length": SEARCH_PREFIX_LENGTH,
+        "k1": BM25_K1,
+        "b": BM25_B,
+        "doc_count": len(docs),
+        "doc_chunk_size": SEARCH_DOC_CHUNK,
+        "avg_length": round(total_length / len(docs), 4) if docs else 0,
+        "shards": {name: len(table) for name, table in shards.items()},
+        "lengths": lengths,
+    }
+    _write_chunks_if_changed(output_dir / "meta.json", [encode(meta)])
+    return {"docs": len(docs), "terms": len(postings), "shards": len(shards)}
+
+
+class SearchIndex:
+    """Queries an index written by `build_search_index`, reading each shard on first use."""
+
+    def __init__(self, directory: Path = SEARCH_INDEX_DIR) -> None:
+        self.directory = directory
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("format") != SEARCH_INDEX_FORMAT:
+            raise ValueError(f"{directory} does not hold a {SEARCH_INDEX_FORMAT} index.")
+        self.meta = meta
+        self.shards: Dict[str, Dict[str, List[int]]] = {}
+        self.doc_chunks: Dict[int, List[List[str]]] = {}
+
+    def document(self, doc: int) -> List[str]:
+        """Returns `[url, title, type]` for a document number."""
+        chunk, offset = divmod(doc, self.meta["doc_chunk_size"])
+        rows = self.doc_chunks.get(chunk)
+        if rows is None:
+            chunk_path = self.directory / "docs" / f"{chunk}.json"
+            rows = self.doc_chunks[chunk] = json.loads(chunk_path.read_text(encoding="utf-8"))
+        return rows[offset]
+
+    def postings(self, term: str) -> List[Tuple[int, int]]:
+        """Returns (doc, term frequency) pairs for an already tokenized term."""
+        name = _search_shard(term)
+        if name not in self.meta["shards"]:
+            return []
+        table = self.shards.get(name)
+        if table is None:
+            shard_path = self.directory / "shards" / f"{name}.json"
+            table = self.shards[name] = json.loads(shard_path.read_text(encoding="utf-8"))
+        flat = table.get(term) or []
+        pairs: List[Tuple[int, int]] = []
+        doc = 0
+        for offset in range(0, len(flat), 2):
+            doc += flat[offset]
+            pairs.append((doc, flat[offset + 1]))
+        return pairs
+
+    def search(self, query: str, *, limit: int = 10) -> List[Dict[str, Any]]:
+        """Ranks pages for `query` with BM25 and returns the best `limit` hits."""
+        meta = self.meta
+        lengths, count = meta["lengths"], meta["doc_count"]
+        k1, b, avg_length = meta["k1"], meta["b"], meta["avg_length"] or 1
+        scores: Dict[int, float] = {}
+        for term in dict.fromkeys(_search_terms(query)):
+            pairs = self.postings(term)
+            if not pairs:
+                continue
+            idf = math.log(1 + (count - len(pairs) + 0.5) / (len(pairs) + 0.5))
+            for doc, frequency in pairs:
+                norm = k1 * (1 - b + b * lengths[doc] / avg_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+        hits = []
+        for doc, score in heapq.nlargest(limit, scores.items(), key=lambda entry: entry[1]):
+            url, title, item_type = self.document(doc)
+            hits.append({"url": url, "title": title, "type": item_type, "score": round(score, 4)})
+        return hits
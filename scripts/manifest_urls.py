@@ -0,0 +1,354 @@
+"""
+Health checks for the URLs of the resources catalog (`build_manifest.py --check-urls`).
+
+A small HTTP/1.1 client on asyncio streams keeps connections alive per
+origin, limits concurrency per host, and revalidates cached results with
+their ETag/Last-Modified once they pass URL_HEALTH_MAX_AGE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime as dt
+import itertools
+import json
+import ssl
+import time
+import urllib.parse
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from manifest_common import CACHE_DIR
+from manifest_output import _write_chunks_if_changed
+
+if TYPE_CHECKING:
+    from manifest_items import ManifestItem
+
+URL_HEALTH_CACHE_PATH = CACHE_DIR / "url_health.ndjson"
+URL_HEALTH_FORMAT = "url_health.v1"
+URL_HEALTH_MAX_AGE = 24 * 3600  # seconds a result is trusted before it is revalidated
+URL_CHECK_CONCURRENCY = 64
+URL_CHECK_PER_HOST = 4  # concurrent requests, and so pooled connections, per host
+URL_CHECK_HOST_INTERVAL = 0.05  # seconds between request starts on one host
+URL_CHECK_TIMEOUT = 10.0
+URL_CHECK_REDIRECTS = 5
+URL_CHECK_DRAIN_LIMIT = 64 * 1024  # larger GET bodies close the connection instead of being read
+URL_CHECK_USER_AGENT = "agentic-knowledge-garden-link-check/1"
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+_URL_SAFE = "/?&=%:@!$'()*+,;~-._"  # already-valid request-target characters quote() must keep
+
+
+class HttpResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]  # lower-cased names
+
+
+class _StreamTransport:
+    """Minimal HTTP/1.1 client on asyncio streams, keeping idle connections per origin for reuse.
+
+    `check_urls` accepts any object with the same `request`/`close`
+    coroutines, so checks can run against a stand-in server or a fake.
+    """
+
+    def __init__(self, *, timeout: float = URL_CHECK_TIMEOUT, ssl_context: Optional[ssl.SSLContext] = None) -> None:
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+
+    async def request(self, method: str, url: str, headers: Dict[str, str]) -> HttpResponse:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"unsupported URL: {url}")
+        hostname = parts.hostname.encode("idna").decode("ascii")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        origin = (parts.scheme, hostname, port)
+        target = urllib.parse.quote((parts.path or "/") + (f"?{parts.query}" if parts.query else ""), safe=_URL_SAFE)
+        host = hostname if parts.port is None else f"{hostname}:{port}"
+        lines = [
+            f"{method} {target} HTTP/1.1",
+            f"Host: {host}",
+            f"User-Agent: {URL_CHECK_USER_AGENT}",
+            "Accept: */*",
+            *(f"{name}: {value}" for name, value in headers.items()),
+        ]
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        pooled = self.idle.get(origin)
+        if pooled:
+            connection = pooled.pop()
+            try:
+                return await asyncio.wait_for(self._exchange(origin, connection, payload, method), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass  # the server dropped the idle connection; retry once on a fresh one
+        connection = await asyncio.wait_for(self._connect(origin), self.timeout)
+        return await asyncio.wait_for(self._exchange(origin, connection, payload, method), self.timeout)
+
+    async def _connect(self, origin: Tuple[str, str, int]) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        scheme, hostname, port = origin
+        context = None
+        if scheme == "https":
+            context = self.ssl_context or ssl.create_default_context()
+        return await asyncio.open_connection(hostname, port, ssl=context)
+
+    async def _exchange(
+        self,
+        origin: Tuple[str, str, int],
+        connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        payload: bytes,
+        method: str,
+    ) -> HttpResponse:
+        reader, writer = connection
+        keep = False
+        try:
+            writer.write(payload)
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionResetError("connection closed before the status line")
+            version, status, *_ = status_line.decode("latin-1").split(None, 2)
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in {b"\r\n", b"\n", b""}:
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            code = int(status)
+            reusable = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            if method == "HEAD" or code in {204, 304} or code < 200:
+                pass
+            elif "chunked" in headers.get("transfer-encoding", "").lower():
+                reusable = reusable and await self._drain_chunked(reader)
+            elif "content-length" in headers and int(headers["content-length"]) <= URL_CHECK_DRAIN_LIMIT:
+                await reader.readexactly(int(headers["content-length"]))
+            else:
+                reusable = False
+            keep = reusable
+        finally:
+            if not keep:
+                await self._close(writer)
+        if keep:
+            self.idle.setdefault(origin, []).append(connection)
+        return HttpResponse(code, headers)
+
+    async def _close(self, writer: asyncio.StreamWriter) -> None:
+        """Closes a connection and waits for the transport to go away, giving up after `timeout`."""
+        writer.close()
+        try:
+            await asyncio.wait_for(writer.wait_closed(), self.timeout)
+        except (OSError, asyncio.TimeoutError):
+            pass  # the peer reset or stalled the shutdown; the socket is closed either way
+
+    @staticmethod
+    async def _drain_chunked(reader: asyncio.StreamReader) -> bool:
+        """Reads a chunked body up to URL_CHECK_DRAIN_LIMIT; False when it was abandoned."""
+        total = 0
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()) not in {b"\r\n", b"\n", b""}:
+                    pass
+                return True
+            total += size
+            if total > URL_CHECK_DRAIN_LIMIT:
+                return False
+            await reader.readexactly(size + 2)
+
+    async def close(self) -> None:
+        connections = [writer for pooled in self.idle.values() for _, writer in pooled]
+        self.idle.clear()
+        await asyncio.gather(*map(self._close, connections))
+
+
+class _HostLimiter:
+    """Caps concurrent requests per host (host:port) and overall, spacing starts on a host `interval` apart.
+
+    The global slot is taken last, so requests queued behind a busy host
+    never hold it while other hosts sit idle.
+    """
+
+    def __init__(self, per_host: int, interval: float, total: int) -> None:
+        self.per_host = per_host
+        self.interval = interval
+        self.total = asyncio.Semaphore(total)
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.next_start: Dict[str, float] = {}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        semaphore = self.semaphores.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with semaphore:
+            now = asyncio.get_running_loop().time()
+            start = max(now, self.next_start.get(host, now))
+            self.next_start[host] = start + self.interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            async with self.total:
+                yield
+
+
+class UrlCheck(NamedTuple):
+    status: Optional[int]  # final HTTP status, None when the request failed
+    ok: bool
+    checked_at: float  # epoch seconds
+    etag: Optional[str]
+    last_modified: Optional[str]
+    final_url: Optional[str]  # where redirects ended, when they did
+    error: Optional[str]
+
+    def record(self) -> Dict[str, Any]:
+        """The `health` object written into resource items."""
+        checked_at = dt.datetime.fromtimestamp(self.checked_at, dt.timezone.utc).replace(tzinfo=None)
+        return {
+            "status": self.status,
+            "ok": self.ok,
+            "checked_at": checked_at.isoformat(timespec="seconds") + "Z",
+            "final_url": self.final_url,
+            "error": self.error,
+        }
+
+
+class _UrlHealthCache:
+    """URL check results persisted between builds, with the validators used to revalidate them."""
+
+    def __init__(self, path: Path, entries: Optional[Dict[str, UrlCheck]] = None) -> None:
+        self.path = path
+        self.entries: Dict[str, UrlCheck] = entries or {}
+        self.results: Dict[str, UrlCheck] = {}
+        self.fresh = 0
+        self.revalidated = 0
+
+    @classmethod
+    def load(cls, path: Path, *, full: bool = False) -> "_UrlHealthCache":
+        if full or not path.exists():
+            return cls(path)
+        entries: Dict[str, UrlCheck] = {}
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                if json.loads(handle.readline() or "{}").get("format") != URL_HEALTH_FORMAT:
+                    return cls(path)
+                for line in handle:
+                    url, *fields = json.loads(line)
+                    entries[url] = UrlCheck(*fields)
+        except (OSError, ValueError, TypeError, AttributeError):
+            return cls(path)
+        return cls(path, entries)
+
+    def save(self) -> None:
+        if self.results == self.entries:
+            return
+        header = {"format": URL_HEALTH_FORMAT}
+        lines = (json.dumps([url, *check], ensure_ascii=False) + "\n" for url, check in sorted(self.results.items()))
+        _write_chunks_if_changed(self.path, itertools.chain([json.dumps(header) + "\n"], lines))
+
+
+async def _check_url(
+    url: str, transport: Any, limiter: _HostLimiter, previous: Optional[UrlCheck], now: float
+) -> UrlCheck:
+    """HEAD first (GET when the server rejects HEAD), following redirects; 304 keeps `previous`."""
+    headers: Dict[str, str] = {}
+    if previous is not None and previous.ok:
+        if previous.etag:
+            headers["If-None-Match"] = previous.etag
+        if previous.last_modified:
+            headers["If-Modified-Since"] = previous.last_modified
+    current, method = url, "HEAD"
+    try:
+        for _ in range(URL_CHECK_REDIRECTS + 2):
+            async with limiter.slot(urllib.parse.urlsplit(current).netloc.lower()):
+                response = await transport.request(method, current, headers)
+            location = response.headers.get("location")
+            if response.status in _REDIRECT_STATUSES and location:
+                current, headers = urllib.parse.urljoin(current, location), {}
+                continue
+            if method == "HEAD" and response.status >= 400 and response.status not in {404, 410}:
+                method = "GET"  # plenty of servers answer HEAD with 403/405/501
+                continue
+            break
+        else:
+            return UrlCheck(None, False, now, None, None, current, "too many redirects")
+    except Exception as exc:  # reported per URL
+        error = f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+        return UrlCheck(None, False, now, None, None, None, error)
+    if response.status == 304 and previous is not None:
+        return previous._replace(checked_at=now)
+    return UrlCheck(
+        response.status,
+        200 <= response.status < 400,
+        now,
+        response.headers.get("etag"),
+        response.headers.get("last-modified"),
+        current if current != url else None,
+        None,
+    )
+
+
+async def _check_urls_async(
+    urls: List[str],
+    cache: _UrlHealthCache,
+    transport: Any,
+    *,
+    max_age: float,
+    concurrency: int,
+    per_host: int,
+    host_interval: float,
+) -> None:
+    now = time.time()
+    limiter = _HostLimiter(per_host, host_interval, concurrency)
+
+    async def check(url: str) -> None:
+        previous = cache.entries.get(url)
+        # Transport failures (offline, DNS) are retried on every run; HTTP answers are trusted for max_age.
+        if previous is not None and previous.status is not None and now - previous.checked_at < max_age:
+            cache.fresh += 1
+            cache.results[url] = previous
+            return
+        result = await _check_url(url, transport, limiter, previous, now)
+        if previous is not None and result.status == previous.status and result.etag == previous.etag:
+            cache.revalidated += 1
+        cache.results[url] = result
+
+    try:
+        await asyncio.gather(*(check(url) for url in urls))
+    finally:
+        await transport.close()
+
+
+def check_urls(
+    urls: Iterable[str],
+    *,
+    cache: Optional[_UrlHealthCache] = None,
+    transport: Any = None,
+    max_age: float = URL_HEALTH_MAX_AGE,
+    concurrency: int = URL_CHECK_CONCURRENCY,
+    per_host: int = URL_CHECK_PER_HOST,
+    host_interval: float = URL_CHECK_HOST_INTERVAL,
+) -> Dict[str, UrlCheck]:
+    """Checks every URL concurrently and returns {url: UrlCheck}.
+
+    Results younger than `max_age` seconds come from `cache` untouched;
+    older ones are revalidated with their ETag/Last-Modified. `transport`
+    defaults to `_StreamTransport`.
+    """
+    cache = cache if cache is not None else _UrlHealthCache(URL_HEALTH_CACHE_PATH)
+    asyncio.run(
+        _check_urls_async(
+            sorted(set(urls)),
+            cache,
+            transport if transport is not None else _StreamTransport(),
+            max_age=max_age,
+            concurrency=concurrency,
+            per_host=per_host,
+            host_interval=host_interval,
+        )
+    )
+    return cache.results
+
+
+def _resource_urls(items: Iterable[ManifestItem]) -> Dict[str, str]:
+    """Maps resource item ids to the catalog `url` kept on the parsed items; the first entry of an id wins."""
+    urls: Dict[str, str] = {}
+    for item in items:
+        if item.url is not None:
+            urls.setdefault(item.id, item.url)
+    return urls
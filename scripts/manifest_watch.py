@@ -0,0 +1,505 @@
+"""
+Watch mode for `build_manifest.py --watch`.
+
+`_InotifyWatcher` follows every directory of the content sections through
+Linux inotify; `_PollingWatcher` diffs stat snapshots elsewhere and under
+--poll-interval. Both return the docs-relative paths that changed since
+the last call, which `watch` hands to a `_WatchSession` that patches the
+in-memory manifest and the pages those files touch.
+"""
+
+from __future__ import annotations
+
+import bisect
+import datetime as dt
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import manifest_output
+from manifest_archive import ARCHIVE_INDEXES, ARCHIVE_PAGE_SIZE, _ArchiveLayout, regenerate_archives
+from manifest_cards import CARD_CACHE_PATH, _CardCache
+from manifest_common import (
+    DOCS_ROOT,
+    RESOURCES_CATALOG_DIR,
+    RESOURCES_KEY,
+    SECTIONS,
+    _is_resource_key,
+    _known_doc_paths,
+)
+from manifest_graph import _find_dangling_links, _RelationGraph
+from manifest_indexes import _index_specs, _IndexState
+from manifest_items import ManifestItem
+from manifest_json import MANIFEST_PATH, _stable_generated_at, _write_manifest_outputs
+from manifest_output import BUILD_STATE_PATH, _OutputStore, _write_if_changed
+from manifest_pages import PAGE_CARD_LISTS, _page_renderers, _page_signature, regenerate_pages
+from manifest_parse import PARSE_CACHE_PATH, _collect_markdown_items, _collect_resources, _parse_task, _ParseCache
+from manifest_schema import _schema_fingerprint
+
+WATCH_DEBOUNCE = 0.02
+# Seconds without edits before --watch rewrites the manifest files.
+WATCH_FLUSH_DELAY = 1.0
+SECTION_TYPES: Dict[str, str] = dict(SECTIONS)
+
+
+def _is_watched(key: str) -> bool:
+    """True for docs-relative paths that feed the manifest."""
+    if _is_resource_key(key):
+        return True
+    section, _, rest = key.partition("/")
+    if section not in SECTION_TYPES or not rest or not key.endswith(".md"):
+        return False
+    return key.rsplit("/", 1)[-1].lower() not in {"readme.md", "index.md"}
+
+
+def _scan_watched(docs_root: Path, prefix: str = "") -> Dict[str, Tuple[int, int]]:
+    """Returns {docs-relative path: (mtime_ns, size)} for watched files under `prefix`."""
+    root = str(docs_root) + os.sep
+    if prefix:
+        directories = [str(docs_root / prefix)]
+    else:
+        directories = [str(docs_root / section) for section in (*SECTION_TYPES, "resources")]
+    snapshot: Dict[str, Tuple[int, int]] = {}
+    while directories:
+        try:
+            entries = os.scandir(directories.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                    continue
+                key = entry.path[len(root):].replace(os.sep, "/")
+                if _is_watched(key):
+                    stat = entry.stat()
+                    snapshot[key] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+class _PollingWatcher:
+    """Detects changes by diffing stat snapshots of the watched files."""
+
+    name = "polling"
+
+    def __init__(self, docs_root: Path, interval: float) -> None:
+        self.docs_root = docs_root
+        self.interval = interval
+        self.snapshot = _scan_watched(docs_root)
+
+    def wait(self, timeout: float) -> Set[str]:
+        time.sleep(min(self.interval, timeout))
+        current = _scan_watched(self.docs_root)
+        changed = {key for key, signature in current.items() if self.snapshot.get(key) != signature}
+        changed.update(self.snapshot.keys() - current.keys())
+        self.snapshot = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyWatcher:
+    """Linux inotify watcher over every directory of the content sections.
+
+    Returns changed docs-relative paths; a path ending in `/` means "rescan this
+    directory" (new, moved or vanished directories and queue overflows).
+    """
+
+    name = "inotify"
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, docs_root: Path) -> None:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.docs_root = docs_root
+        self.directories: Dict[int, str] = {}
+        for section in (*SECTION_TYPES, "resources"):
+            if (docs_root / section).is_dir():
+                self._watch_tree(section)
+
+    def _watch_tree(self, prefix: str) -> None:
+        for dirpath, _, _ in os.walk(self.docs_root / prefix):
+            wd = self._add_watch(self.fd, os.fsencode(dirpath), self.MASK)
+            if wd >= 0:
+                self.directories[wd] = Path(dirpath).relative_to(self.docs_root).as_posix()
+
+    def wait(self, timeout: float) -> Set[str]:
+        changed: Set[str] = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return changed
+        # Editors save through several writes/renames; let the burst settle.
+        time.sleep(WATCH_DEBOUNCE)
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = struct.unpack_from("iIII", data, offset)
+                name = os.fsdecode(data[offset + 16 : offset + 16 + length].rstrip(b"\0"))
+                offset += 16 + length
+                if mask & self.IN_Q_OVERFLOW:
+                    changed.add("/")
+                    continue
+                if mask & self.IN_IGNORED:
+                    self.directories.pop(wd, None)
+                    continue
+                directory = self.directories.get(wd)
+                if directory is None:
+                    continue
+                key = f"{directory}/{name}"
+                if mask & self.IN_ISDIR:
+                    if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                        self._watch_tree(key)
+                    changed.add(key + "/")
+                else:
+                    changed.add(key)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _WatchSession:
+    """In-memory manifest that --watch patches one changed file at a time.
+
+    Items stay in manifest order: an edit is spliced in with bisect, and only
+    the index buckets and graph rows it touches are updated. The manifest files lag behind
+    until `flush`, which the watch loop calls once saves settle.
+    """
+
+    def __init__(
+        self,
+        docs_root: Path,
+        cache: _ParseCache,
+        *,
+        manifest_path: Optional[Path] = MANIFEST_PATH,
+        ndjson_path: Optional[Path] = None,
+        cards: Optional[_CardCache] = None,
+        archive_page_size: int = ARCHIVE_PAGE_SIZE,
+    ) -> None:
+        self.docs_root = docs_root
+        self.archive_page_size = archive_page_size
+        self.manifest_path = manifest_path
+        self.ndjson_path = ndjson_path
+        self.cache = cache
+        # Lives as long as the session, so an edit re-renders only the cards it changed.
+        self.cards = cards if cards is not None else _CardCache()
+        self.renderers = _page_renderers()
+        # Entries are (manifest sort key, item); ties follow collection order.
+        self.markdown: Dict[str, Tuple[Tuple[Any, ...], ManifestItem]] = {}
+        self.resources: List[Tuple[Tuple[Any, ...], ManifestItem]] = []
+        # Sort keys of manifest["items"], position for position.
+        self.keys: List[Tuple[Any, ...]] = []
+        self.manifest: Dict[str, Any] = {}
+        self.indexes: Optional[_IndexState] = None
+        self.archive_layout: _ArchiveLayout = {}
+        self.pending = False  # manifest files are behind the in-memory manifest
+        self.signatures: Dict[str, Tuple[Any, ...]] = {}
+        self.known_paths: Set[str] = set()
+        self.dangling: Set[Tuple[str, str]] = set()
+
+    def load(self, *, jobs: int = 1) -> Dict[str, Any]:
+        for item in _collect_markdown_items(self.cache, jobs=jobs, docs_root=self.docs_root):
+            self.markdown[item.path] = (self._sort_key(item), item)
+        self._load_resources()
+        self.known_paths = _known_doc_paths(self.docs_root)
+        manifest = self._rebuild()
+        self.dangling = set(_find_dangling_links(manifest, self.known_paths))
+        regenerate_pages(
+            manifest,
+            docs_root=self.docs_root,
+            manifest_path=self.manifest_path,
+            ndjson_path=self.ndjson_path,
+            cards=self.cards,
+        )
+        regenerate_archives(
+            manifest,
+            docs_root=self.docs_root,
+            page_size=self.archive_page_size,
+            cards=self.cards,
+            layout=self.archive_layout,
+        )
+        for page in PAGE_CARD_LISTS:
+            self.signatures[page] = _page_signature(manifest, page)
+        return manifest
+
+    @staticmethod
+    def _sort_key(item: ManifestItem) -> Tuple[Any, ...]:
+        section = item.path.split("/", 1)[0]
+        section_index = next(index for index, (name, _) in enumerate(SECTIONS) if name == section)
+        return (item.type, item.slug, 0, section_index, Path(item.path))
+
+    def _load_resources(self) -> None:
+        collected: List[ManifestItem] = []
+        _collect_resources(collected, docs_root=self.docs_root, cache=self.cache)
+        self.resources = [
+            ((item.type, item.slug, 1, index), item) for index, item in enumerate(collected)
+        ]
+
+    def _rebuild(self) -> Dict[str, Any]:
+        """Sorts every item and rebuilds the indexes and graph from scratch."""
+        entries = sorted([*self.markdown.values(), *self.resources], key=lambda entry: entry[0])
+        self.keys = [key for key, _ in entries]
+        items = [item for _, item in entries]
+        self.indexes = _IndexState(items, _index_specs())
+        self.manifest = {
+            "version": 1,
+            "generated_at": dt.datetime.utcnow().isoformat() + "Z",
+            "items": items,
+            "indexes": self.indexes.indexes(),
+            "graph": _RelationGraph.build(items),
+        }
+        self.manifest["generated_at"] = _stable_generated_at(
+            self.manifest, manifest_output.OUTPUTS, (self.manifest_path, self.ndjson_path)
+        )
+        return self.manifest
+
+    def _splice(
+        self,
+        previous: Optional[Tuple[Any, ...]],
+        item: Optional[ManifestItem],
+        touched: Dict[Tuple[str, str], Tuple[int, Optional[int]]],
+    ) -> None:
+        """Moves one markdown item from sort key `previous` to its new place.
+
+        The archive groups it leaves or joins are recorded in `touched` as the
+        rank range whose pages need rendering again.
+        """
+        items: List[ManifestItem] = self.manifest["items"]
+        graph: _RelationGraph = self.manifest["graph"]
+        indexes: _IndexState = self.indexes
+        key = self._sort_key(item) if item is not None else None
+        before: Dict[Tuple[str, str], int] = {}
+        after: Dict[Tuple[str, str], int] = {}
+        if previous is not None and previous == key:  # same type, slug and path
+            position = bisect.bisect_left(self.keys, previous)
+            before = {(name, group): rank for name, group, rank in indexes.ranks(position, ARCHIVE_INDEXES)}
+            indexes.discard(position)
+            items[position] = item
+            indexes.add(position)
+            graph.replace(position, items)
+            after = {(name, group): rank for name, group, rank in indexes.ranks(position, ARCHIVE_INDEXES)}
+        else:
+            if previous is not None:
+                position = bisect.bisect_left(self.keys, previous)
+                before = {(name, group): rank for name, group, rank in indexes.ranks(position, ARCHIVE_INDEXES)}
+                indexes.discard(position)
+                del self.keys[position]
+                removed = items.pop(position)
+                indexes.renumber(position + 1, -1)
+                graph.remove(position, removed, items)
+            if item is not None:
+                position = bisect.bisect_right(self.keys, key)
+                self.keys.insert(position, key)
+                items.insert(position, item)
+                indexes.renumber(position, 1)
+                indexes.add(position)
+                graph.insert(position, items)
+                after = {(name, group): rank for name, group, rank in indexes.ranks(position, ARCHIVE_INDEXES)}
+        for group in before.keys() | after.keys():
+            ranks = [ranks[group] for ranks in (before, after) if group in ranks]
+            # A group that gained or lost the item shifts every later page.
+            low, high = min(ranks), max(ranks) if len(ranks) == 2 else None
+            if group in touched:
+                seen_low, seen_high = touched[group]
+                low = min(low, seen_low)
+                high = None if high is None or seen_high is None else max(high, seen_high)
+            touched[group] = (low, high)
+
+    def _expand(self, changed: Set[str]) -> Set[str]:
+        keys: Set[str] = set()
+        for key in changed:
+            if not key.endswith("/"):
+                if _is_watched(key):
+                    keys.add(key)
+                continue
+            prefix = key.strip("/")
+            keys.update(_scan_watched(self.docs_root, prefix))
+            keys.update(path for path in self.markdown if not prefix or path.startswith(prefix + "/"))
+            if (RESOURCES_CATALOG_DIR + "/").startswith(prefix + "/" if prefix else ""):
+                keys.add(RESOURCES_KEY)  # catalog shards may have been removed along with a folder
+        return keys
+
+    def apply(self, changed: Set[str]) -> Tuple[int, List[str], List[Tuple[str, str]]]:
+        """Re-parses `changed` paths and rewrites the pages whose card lists moved."""
+        edits: List[Tuple[Optional[Tuple[Any, ...]], Optional[ManifestItem]]] = []
+        errors: List[Tuple[str, str]] = []
+        keys = self._expand(changed)
+        if any(key.endswith("/") for key in changed):
+            self.known_paths = _known_doc_paths(self.docs_root)
+        resources_changed = False
+        for key in sorted(keys):
+            if (self.docs_root / key).is_file():
+                self.known_paths.add(key)
+            else:
+                self.known_paths.discard(key)
+            if _is_resource_key(key):
+                resources_changed = True
+                continue
+            path = self.docs_root / key
+            if not path.is_file():
+                removed = self.markdown.pop(key, None)
+                if removed is not None:
+                    edits.append((removed[0], None))
+                continue
+            result = _parse_task((str(path), SECTION_TYPES[key.split("/", 1)[0]], key, None))
+            if result.error is not None:
+                errors.append((key, result.error))
+                continue
+            item = ManifestItem(**result.item) if result.item else None
+            self.cache.store(key, path.stat(), result.digest, item, dated=result.dated, checks=result.checks)
+            errors.extend((key, message) for message in result.checks[0])
+            previous = self.markdown.pop(key, None)
+            if item is not None:
+                self.markdown[key] = (self._sort_key(item), item)
+            if previous is not None or item is not None:
+                edits.append((previous[0] if previous is not None else None, item))
+        if resources_changed:
+            try:
+                self._load_resources()
+            except Exception as exc:  # keep serving the previous catalog
+                errors.append((RESOURCES_KEY, f"{type(exc).__name__}: {exc}"))
+                resources_changed = False
+
+        written: List[str] = []
+        if not edits and not resources_changed:
+            return len(keys), written, errors
+        touched: Optional[Dict[Tuple[str, str], Tuple[int, Optional[int]]]] = None
+        if resources_changed:  # a catalog moves hundreds of items at once
+            manifest = self._rebuild()
+        else:
+            manifest = self.manifest
+            touched = {}
+            for previous, item in edits:
+                self._splice(previous, item, touched)
+            manifest["indexes"] = self.indexes.indexes()
+        self.pending = True
+        dangling = set(_find_dangling_links(manifest, self.known_paths))
+        errors.extend(sorted(dangling - self.dangling))
+        self.dangling = dangling
+        for page in PAGE_CARD_LISTS:
+            signature = _page_signature(manifest, page)
+            if signature == self.signatures.get(page):
+                continue
+            self.signatures[page] = signature
+            _write_if_changed(self.docs_root / page, self.renderers[page](manifest, cards=self.cards))
+            written.append(page)
+        archived, removed = regenerate_archives(
+            manifest,
+            docs_root=self.docs_root,
+            page_size=self.archive_page_size,
+            cards=self.cards,
+            touched=touched,
+            layout=self.archive_layout,
+        )
+        written.extend(archived + removed)
+        return len(keys), written, errors
+
+    def flush(self) -> bool:
+        """Writes the manifest files if edits arrived since the last flush."""
+        if not self.pending:
+            return False
+        self.pending = False
+        self.manifest["generated_at"] = _stable_generated_at(
+            {**self.manifest, "generated_at": dt.datetime.utcnow().isoformat() + "Z"},
+            manifest_output.OUTPUTS,
+            (self.manifest_path, self.ndjson_path),
+        )
+        _write_manifest_outputs(self.manifest, manifest_path=self.manifest_path, ndjson_path=self.ndjson_path)
+        return True
+
+
+def watch(
+    *,
+    docs_root: Path = DOCS_ROOT,
+    manifest_path: Optional[Path] = MANIFEST_PATH,
+    ndjson_path: Optional[Path] = None,
+    cache_path: Path = PARSE_CACHE_PATH,
+    card_cache_path: Path = CARD_CACHE_PATH,
+    state_path: Path = BUILD_STATE_PATH,
+    archive_page_size: int = ARCHIVE_PAGE_SIZE,
+    jobs: int = 1,
+    poll_interval: Optional[float] = None,
+    quiet: bool = False,
+) -> None:
+    """Keeps the manifest and landing pages in sync with `docs_root` until interrupted."""
+    manifest_output.OUTPUTS = outputs = _OutputStore.load(state_path)
+    cache = _ParseCache.load(cache_path, schemas=_schema_fingerprint(docs_root))
+    cards = _CardCache.load(card_cache_path)
+    session = _WatchSession(
+        docs_root,
+        cache,
+        manifest_path=manifest_path,
+        ndjson_path=ndjson_path,
+        cards=cards,
+        archive_page_size=archive_page_size,
+    )
+    manifest = session.load(jobs=jobs)
+    cache.save()
+    cards.save()
+    outputs.save()
+    for path, message in sorted(session.dangling):
+        print(f"[watch] error: {path}: {message}", file=sys.stderr)
+
+    watcher: Any = None
+    if poll_interval is None and sys.platform.startswith("linux"):
+        try:
+            watcher = _InotifyWatcher(docs_root)
+        except (OSError, AttributeError):
+            watcher = None
+    if watcher is None:
+        watcher = _PollingWatcher(docs_root, poll_interval or 0.5)
+    if not quiet:
+        print(f"[watch] {len(manifest['items'])} items; watching {docs_root} via {watcher.name} (Ctrl+C to stop)")
+
+    last_edit = 0.0
+    try:
+        while True:
+            changed = watcher.wait(WATCH_FLUSH_DELAY)
+            if not changed:
+                if time.monotonic() - last_edit >= WATCH_FLUSH_DELAY and session.flush():
+                    outputs.save()
+                continue
+            start = time.perf_counter()
+            count, written, errors = session.apply(changed)
+            last_edit = time.monotonic()
+            outputs.save()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if not count:
+                continue
+            for path, message in errors:
+                print(f"[watch] error: {path}: {message}", file=sys.stderr)
+            if not quiet:
+                pages = ", ".join(written) or "no pages"
+                print(f"[watch] {count} file(s) changed; rewrote {pages} in {elapsed_ms:.1f} ms")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        session.flush()
+        cache.save()
+        outputs.save()
+        manifest_output.OUTPUTS = None
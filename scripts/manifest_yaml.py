@@ -0,0 +1,434 @@
+"""
+Front matter YAML loading for `build_manifest.py`.
+
+`_fast_yaml_load` handles the restricted subset the garden uses in one pass
+and raises `_UnsupportedYaml` for anything else; `_load_yaml_any` then falls
+back to PyYAML, or to `_simple_yaml_load` when PyYAML is not installed.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from manifest_common import _consume_front_matter
+
+try:
+    import yaml  # type: ignore
+except ImportError:  # pragma: no cover - handled at runtime
+    yaml = None  # Fallback handled in `_load_yaml`
+
+
+# The C loader builds the same objects as `yaml.safe_load`, several times faster.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+
+
+def _simple_yaml_scalar(token: str) -> Any:
+    token = token.strip()
+    if not token:
+        return ""
+    if token in {"null", "Null", "NULL", "~"}:
+        return None
+    if token in {"true", "True", "TRUE"}:
+        return True
+    if token in {"false", "False", "FALSE"}:
+        return False
+    if token.startswith('"') and token.endswith('"'):
+        return token[1:-1]
+    if token.startswith("'") and token.endswith("'"):
+        return token[1:-1]
+    if token.startswith("[") and token.endswith("]"):
+        try:
+            return json.loads(token)
+        except json.JSONDecodeError:
+            return [item.strip() for item in token[1:-1].split(",") if item.strip()]
+    try:
+        if "." in token:
+            return float(token)
+        return int(token)
+    except ValueError:
+        return token
+
+
+def _simple_yaml_load(raw: str) -> Any:
+    lines = raw.splitlines()
+    index = 0
+
+    def parse_block(expected_indent: int) -> Dict[str, Any]:
+        nonlocal index
+        data: Dict[str, Any] = {}
+        while index < len(lines):
+            line = lines[index]
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                index += 1
+                continue
+            indent = len(line) - len(line.lstrip(" "))
+            if indent < expected_indent:
+                break
+            if indent > expected_indent:
+                raise ValueError(f"Unexpected indent at line {index + 1}: {line}")
+            if ":" not in stripped:
+                raise ValueError(f"Expected key:value at line {index + 1}: {line}")
+            key, remainder = stripped.split(":", 1)
+            key = key.strip()
+            remainder = remainder.strip()
+            index += 1
+            if remainder:
+                data[key] = _simple_yaml_scalar(remainder)
+                continue
+
+            # Peek next meaningful line to decide dict vs list.
+            values: Any
+            if index < len(lines):
+                next_line = lines[index]
+                while index < len(lines) and not next_line.strip():
+                    index += 1
+                    if index < len(lines):
+                        next_line = lines[index]
+                if index < len(lines):
+                    next_indent = len(next_line) - len(next_line.lstrip(" "))
+                    next_stripped = next_line.strip()
+                    if next_stripped.startswith("- "):
+                        values = parse_list(next_indent)
+                    else:
+                        values = parse_block(next_indent)
+                else:
+                    values = {}
+            else:
+                values = {}
+            data[key] = values
+        return data
+
+    def parse_list(expected_indent: int) -> List[Any]:
+        nonlocal index
+        items: List[Any] = []
+        while index < len(lines):
+            line = lines[index]
+            stripped = line.strip()
+            if not stripped:
+                index += 1
+                continue
+            indent = len(line) - len(line.lstrip(" "))
+            if indent < expected_indent:
+                break
+            if not stripped.startswith("- "):
+                break
+            payload = stripped[2:].strip()
+            index += 1
+
+            # Check if payload is key:value (inline dict item)
+            if payload and ":" in payload:
+                # This could be an inline dict item like "- key: value"
+                # or start of a nested block like "- title: value"
+                # Check if next line is indented more (nested block)
+                if index < len(lines):
+                    next_line = lines[index]
+                    if next_line.strip() and not next_line.strip().startswith("- "):
+                        next_indent = len(next_line) - len(next_line.lstrip(" "))
+                        if next_indent > indent:
+                            # Nested block - parse the first key:value inline, then the rest as block
+                            key, value = payload.split(":", 1)
+                            block_data = {key.strip(): _simple_yaml_scalar(value)}
+                            block_data.update(parse_block(next_indent))
+                            items.append(block_data)
+                            continue
+                # Simple inline key:value
+                items.append(_simple_yaml_scalar(payload))
+            elif payload:
+                items.append(_simple_yaml_scalar(payload))
+            else:
+                # Nested structure with empty payload
+                if index >= len(lines):
+                    items.append({})
+                    break
+                next_line = lines[index]
+                next_indent = len(next_line) - len(next_line.lstrip(" "))
+                if next_line.strip().startswith("- "):
+                    items.append(parse_list(next_indent))
+                else:
+                    items.append(parse_block(next_indent))
+        return items
+
+    # Decide if root is list or dict
+    while index < len(lines) and not lines[index].strip():
+        index += 1
+    if index < len(lines) and lines[index].lstrip().startswith("- "):
+        return parse_list(len(lines[index]) - len(lines[index].lstrip(" ")))
+    index = 0
+    return parse_block(0)
+
+
+class _UnsupportedYaml(Exception):
+    """Raised by `_fast_yaml_load` when the input leaves the supported subset."""
+
+
+_YAML_NULLS = {"~": None, "null": None, "Null": None, "NULL": None}
+_YAML_BOOLS = {
+    **{word: True for word in ("yes", "Yes", "YES", "true", "True", "TRUE", "on", "On", "ON")},
+    **{word: False for word in ("no", "No", "NO", "false", "False", "FALSE", "off", "Off", "OFF")},
+}
+_YAML_INT = re.compile(r"[-+]?(?:0|[1-9][0-9]*)\Z")
+_YAML_FLOAT = re.compile(r"[-+]?[0-9]+\.[0-9]*\Z")
+_YAML_ESCAPES = {"\\": "\\", '"': '"', "/": "/", "n": "\n", "t": "\t", "r": "\r"}
+# Tabs, exotic line breaks and anything PyYAML rejects as non-printable.
+_YAML_UNSUPPORTED_CHARS = re.compile(
+    "[\x00-\x09\x0b\x0c\x0e-\x1f\x7f-\x9f\u2028\u2029\ud800-\udfff\ufeff\ufffe\uffff]"
+)
+
+
+def _fast_plain_scalar(token: str) -> Any:
+    """Resolves a plain scalar exactly like PyYAML's implicit resolvers, or gives up."""
+    if token in _YAML_NULLS:
+        return None
+    if token in _YAML_BOOLS:
+        return _YAML_BOOLS[token]
+    first = token[0]
+    if first in "0123456789+-.":
+        if _YAML_INT.match(token):
+            return int(token)
+        if _YAML_FLOAT.match(token):
+            return float(token)
+        raise _UnsupportedYaml(token)
+    if first in "[]{},#&*!|>'\"%@`<=?:":
+        raise _UnsupportedYaml(token)
+    return token
+
+
+def _fast_quoted(text: str, start: int) -> Tuple[str, int]:
+    """Parses a single-line quoted scalar starting at `start`; returns (value, end)."""
+    quote = text[start]
+    chunks: List[str] = []
+    pos = start + 1
+    while True:
+        end = text.find(quote, pos)
+        if end < 0:
+            raise _UnsupportedYaml("unterminated quoted scalar")
+        if quote == "'":
+            chunks.append(text[pos:end])
+            if text.startswith("''", end):
+                chunks.append("'")
+                pos = end + 2
+                continue
+            return "".join(chunks), end + 1
+        segment = text[pos:end]
+        escape = segment.find("\\")
+        if escape < 0:
+            chunks.append(segment)
+            return "".join(chunks), end + 1
+        chunks.append(segment[:escape])
+        pos += escape
+        replacement = _YAML_ESCAPES.get(text[pos + 1 : pos + 2])
+        if replacement is None:
+            raise _UnsupportedYaml("unsupported escape sequence")
+        chunks.append(replacement)
+        pos += 2
+
+
+def _fast_check_tail(text: str, pos: int) -> None:
+    rest = text[pos:]
+    if rest.strip() and not (rest[0] == " " and rest.lstrip(" ").startswith("#")):
+        raise _UnsupportedYaml(text)
+
+
+def _fast_flow_sequence(text: str) -> List[Any]:
+    items: List[Any] = []
+    pos = 1
+    length = len(text)
+    while True:
+        while pos < length and text[pos] == " ":
+            pos += 1
+        if pos >= length:
+            raise _UnsupportedYaml("unterminated flow sequence")
+        char = text[pos]
+        if char == "]" and not items:
+            pos += 1
+            break
+        if char in "\"'":
+            value, pos = _fast_quoted(text, pos)
+            items.append(value)
+        else:
+            end = pos
+            while end < length and text[end] not in ",]":
+                end += 1
+            token = text[pos:end].rstrip(" ")
+            if not token or any(mark in token for mark in ("[", "{", "}", ": ", " #")) or token.endswith(":"):
+                raise _UnsupportedYaml(token)
+            if token.startswith("- ") or token == "-":
+                raise _UnsupportedYaml(token)
+            items.append(_fast_plain_scalar(token))
+            pos = end
+        while pos < length and text[pos] == " ":
+            pos += 1
+        if pos >= length:
+            raise _UnsupportedYaml("unterminated flow sequence")
+        if text[pos] == "]":
+            pos += 1
+            break
+        if text[pos] != ",":
+            raise _UnsupportedYaml(text)
+        pos += 1
+        if text[pos:].lstrip(" ").startswith("]"):
+            raise _UnsupportedYaml("trailing comma in flow sequence")
+    _fast_check_tail(text, pos)
+    return items
+
+
+def _fast_inline_value(text: str) -> Any:
+    first = text[0]
+    # Fast paths for the common `key: "value"` and `key: ["a", "b"]` shapes.
+    if first == '"' and text[-1] == '"' and text.count('"') == 2 and "\\" not in text:
+        return text[1:-1]
+    if first == "[" and text[-1] == "]" and "\\" not in text and "'" not in text:
+        try:
+            items = json.loads(text)
+        except ValueError:
+            items = None
+        if isinstance(items, list) and all(type(item) is str for item in items):
+            return items
+    if first in "\"'":
+        value, end = _fast_quoted(text, 0)
+        _fast_check_tail(text, end)
+        return value
+    if first == "[":
+        return _fast_flow_sequence(text)
+    if first == "{":
+        if text[1:].lstrip(" ").startswith("}"):
+            _fast_check_tail(text, text.index("}") + 1)
+            return {}
+        raise _UnsupportedYaml(text)
+    comment = text.find(" #")
+    token = (text[:comment] if comment >= 0 else text).rstrip(" ")
+    if ": " in token or token.endswith(":") or token.startswith("- ") or token == "-":
+        raise _UnsupportedYaml(token)
+    return _fast_plain_scalar(token)
+
+
+def _fast_yaml_load(raw: str) -> Any:
+    """Single-pass parser for the front matter subset used across the garden.
+
+    Supports block mappings, block sequences (including sequences of mappings),
+    plain and single-line quoted scalars, inline lists and `{}`. Within that
+    subset the result equals `yaml.safe_load`; anything else raises
+    `_UnsupportedYaml` so callers can fall back to a full YAML parser.
+    """
+    if _YAML_UNSUPPORTED_CHARS.search(raw):
+        raise _UnsupportedYaml("unsupported character")
+    root: Any = None
+    # Open block collections as [indent, container, is_sequence].
+    stack: List[List[Any]] = []
+    # Collection slot waiting for a nested block: (container, key, indent, owner_is_sequence).
+    pending: Optional[Tuple[Any, Any, int, bool]] = None
+    for line in raw.splitlines():
+        content = line.lstrip(" ")
+        if not content or content[0] == "#":
+            continue
+        if content.startswith(("---", "...", "%")):
+            raise _UnsupportedYaml(content)
+        indent = len(line) - len(content)
+        content = content.rstrip(" ")
+        entry = content[0] == "-" and (len(content) == 1 or content[1] == " ")
+
+        if pending is not None:
+            container, slot, owner_indent, owner_is_sequence = pending
+            pending = None
+            if indent > owner_indent or (indent == owner_indent and entry and not owner_is_sequence):
+                nested: Any = [] if entry else {}
+                container[slot] = nested
+                stack.append([indent, nested, entry])
+        elif root is None:
+            root = [] if entry else {}
+            stack.append([indent, root, entry])
+
+        while stack and stack[-1][0] >= indent:
+            top_indent, _, top_is_sequence = stack[-1]
+            if top_indent > indent or (
+                top_indent == indent
+                and top_is_sequence
+                and not entry
+                and len(stack) > 1
+                and stack[-2][0] == indent
+            ):
+                stack.pop()
+                continue
+            break
+        if not stack or stack[-1][0] != indent:
+            raise _UnsupportedYaml(content)
+
+        frame = stack[-1]
+        if frame[2]:
+            if not entry:
+                raise _UnsupportedYaml(content)
+            sequence = frame[1]
+            payload = content[1:].lstrip(" ")
+            if not payload or payload[0] == "#":
+                sequence.append(None)
+                pending = (sequence, len(sequence) - 1, indent, True)
+                continue
+            if payload[0] == "-" and (len(payload) == 1 or payload[1] == " "):
+                raise _UnsupportedYaml(content)
+            if payload[0] in "\"'[{" or not (": " in payload or payload.endswith(":")):
+                sequence.append(_fast_inline_value(payload))
+                continue
+            # `- key: value` opens a mapping aligned with its first key.
+            mapping: Dict[Any, Any] = {}
+            sequence.append(mapping)
+            indent = indent + len(content) - len(payload)
+            frame = [indent, mapping, False]
+            stack.append(frame)
+            content = payload
+        elif entry:
+            raise _UnsupportedYaml(content)
+
+        split = content.find(": ")
+        if split < 0:
+            if content[-1] != ":":
+                raise _UnsupportedYaml(content)
+            split = len(content) - 1
+        key = content[:split]
+        if not key or key[-1] == " " or " #" in key or type(_fast_plain_scalar(key)) is not str:
+            raise _UnsupportedYaml(content)
+        rest = content[split + 1 :].lstrip(" ")
+        if rest and rest[0] != "#":
+            frame[1][key] = _fast_inline_value(rest)
+        else:
+            frame[1][key] = None
+            pending = (frame[1], key, indent, False)
+    return root
+
+
+def _load_yaml_any(raw: str) -> Any:
+    if not raw.strip():
+        return {}
+    try:
+        return _fast_yaml_load(raw)
+    except _UnsupportedYaml:
+        pass
+    if yaml is not None:
+        return yaml.load(raw, Loader=_YAML_LOADER)
+    return _simple_yaml_load(raw)
+
+
+def _load_yaml(raw: str) -> Dict[str, Any]:
+    """Loads YAML mapping using PyYAML when available, otherwise a minimal parser."""
+    if not raw.strip():
+        return {}
+    loaded = _load_yaml_any(raw)
+    if loaded is None:
+        return {}
+    if not isinstance(loaded, dict):
+        raise ValueError("Front matter must be a mapping at the top level.")
+    return loaded
+
+
+def _parse_markdown(path: Path) -> Tuple[Dict[str, Any], str]:
+    """Returns (front_matter, body) for a Markdown file."""
+    with path.open("r", encoding="utf-8") as handle:
+        fm_raw = _consume_front_matter(handle, str(path))
+        if fm_raw is None:
+            handle.seek(0)
+            return {}, handle.read()
+        body = handle.read().lstrip("\n")
+    return _load_yaml(fm_raw), body
@@ -0,0 +1,50 @@
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPOSITORY_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPOSITORY_ROOT / "scripts"))
+
+
+def _copy_docs(target: Path) -> None:
+    # Generated folders are left out, so every test starts from the sources alone.
+    shutil.copytree(REPOSITORY_ROOT / "docs", target, ignore=shutil.ignore_patterns("archive", "search"))
+
+
+@pytest.fixture
+def docs_root(tmp_path: Path) -> Path:
+    """A private copy of the garden's docs tree."""
+    root = tmp_path / "docs"
+    _copy_docs(root)
+    return root
+
+
+@pytest.fixture
+def repository(tmp_path: Path) -> Path:
+    """A throwaway checkout (scripts, schemas and docs) where build_manifest.py can run end to end."""
+    root = tmp_path / "repository"
+    shutil.copytree(REPOSITORY_ROOT / "scripts", root / "scripts", ignore=shutil.ignore_patterns("__pycache__"))
+    (root / "data").mkdir()
+    for schema in (REPOSITORY_ROOT / "data").glob("*.yml"):
+        shutil.copy(schema, root / "data" / schema.name)
+    _copy_docs(root / "docs")
+    return root
+
+
+@pytest.fixture
+def run_build(repository: Path):
+    """Runs scripts/build_manifest.py in `repository` with the given arguments."""
+
+    def run(*args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, "scripts/build_manifest.py", "--quiet", *args],
+            cwd=repository,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+
+    return run
@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import build_manifest as bm
+import manifest_query
+
+
+def _contents(repository):
+    return {
+        path.relative_to(repository).as_posix(): path.read_bytes()
+        for folder in ("data", "docs")
+        for path in (repository / folder).rglob("*")
+        if path.is_file()
+    }
+
+
+def _snapshot(repository):
+    return {
+        path.relative_to(repository).as_posix(): path.stat().st_mtime_ns
+        for folder in ("data", "docs")
+        for path in (repository / folder).rglob("*")
+        if path.is_file()
+    }
+
+
+def test_noop_rebuild_writes_nothing(repository, run_build):
+    run_build("--search-index")
+    before = _snapshot(repository)
+
+    run_build("--search-index", "--profile", "trace.json")
+
+    counters = json.loads((repository / "trace.json").read_text())["otherData"]["counters"]
+    assert counters.get("writes", 0) == 0
+    assert counters["writes skipped"] > 0
+    assert _snapshot(repository) == before
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson"])
+def test_cold_rebuild_keeps_the_manifest_bytes(repository, run_build, output_format):
+    manifest_path = repository / "data" / f"content_manifest.{output_format}"
+    run_build("--format", output_format)
+    content = manifest_path.read_bytes()
+
+    # A fresh checkout or a cleared cache has no build state to take generated_at from.
+    shutil.rmtree(repository / ".cache")
+    run_build("--format", output_format)
+
+    assert manifest_path.read_bytes() == content
+
+
+def test_query_index_rejects_a_same_size_edit(repository, run_build):
+    run_build()
+    data_path = repository / "data" / "content_manifest.json"
+    index_path = repository / "data" / "content_manifest.idx"
+    with manifest_query.ManifestIndex.open(index_path) as index:
+        assert len(index) == len(json.loads(data_path.read_text())["items"])
+
+    content = data_path.read_bytes()
+    stat = data_path.stat()
+    edited = content.replace(b'"status": "draft"', b'"status": "DRAFT"', 1)
+    assert edited != content and len(edited) == len(content)
+    data_path.write_bytes(edited)
+    # Keep the size and move the mtime forward, as any later save would.
+    os.utime(data_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    with pytest.raises(ValueError, match="out of date"):
+        manifest_query.ManifestIndex.open(index_path)
+
+    run_build()
+    with manifest_query.ManifestIndex.open(index_path) as index:
+        assert index.header["data_size"] == data_path.stat().st_size
+
+
+def test_parallel_parse_matches_a_single_process(repository, run_build):
+    run_build("--jobs", "1", "--format", "both")
+    expected = _contents(repository)
+
+    run_build("--jobs", "4", "--format", "both", "--full")
+    assert _contents(repository) == expected
+
+
+def test_worker_errors_name_their_files(docs_root, tmp_path):
+    broken = ["notes/2025-10-20_broken.md", "patterns/broken.md"]
+    for key in broken:
+        (docs_root / key).write_text('---\ntitle: "Broken\ntags: [memory\n---\n\nBody.\n', encoding="utf-8")
+
+    with pytest.raises(bm.ManifestBuildError) as failure:
+        bm.build_manifest(docs_root=docs_root, cache_path=tmp_path / "cache.ndjson", jobs=2)
+    assert [path for path, _ in failure.value.errors] == broken
+    assert all("Error: " in message for _, message in failure.value.errors)
+
+
+def test_ndjson_reads_back_as_the_json_manifest(repository, run_build):
+    run_build("--format", "both")
+    manifest = json.loads((repository / "data" / "content_manifest.json").read_text(encoding="utf-8"))
+    ndjson_path = repository / "data" / "content_manifest.ndjson"
+
+    header = bm.read_manifest_header(ndjson_path)
+    assert header == {"format": bm.NDJSON_FORMAT, "version": manifest["version"], "generated_at": manifest["generated_at"]}
+    assert list(bm.iter_manifest_items(ndjson_path)) == manifest["items"]
+
+
+def test_missing_origin_note_fails_the_build(repository, run_build):
+    pattern = repository / "docs" / "patterns" / "routing.md"
+    text = pattern.read_text(encoding="utf-8")
+    old = 'origin_note: "notes/2025-10-13_book-agentic-design-patterns.md"'
+    assert old in text
+    pattern.write_text(text.replace(old, 'origin_note: "notes/2025-10-20_missing.md"'), encoding="utf-8")
+
+    with pytest.raises(subprocess.CalledProcessError) as failure:
+        run_build()
+    assert (
+        "[build_manifest] error: patterns/routing.md: pattern:routing: origin_note points to missing "
+        "'notes/2025-10-20_missing.md'" in failure.value.stderr
+    )
+    assert "1 dangling reference(s) in front matter" in failure.value.stderr
+
+    result = run_build("--allow-dangling-links")
+    assert "[build_manifest] warning: patterns/routing.md: " in result.stderr
+
+
+def test_malformed_catalog_shards_report_their_keys(docs_root, tmp_path):
+    catalog = docs_root / "resources" / "catalog"
+    catalog.mkdir()
+    (catalog / "2025-09.md").write_text('- title: "Fine"\n  url: "https://example.com/fine"\n', encoding="utf-8")
+    (catalog / "2025-10.md").write_text('- title: "Unclosed\n  url: "https://example.com/a"\n', encoding="utf-8")
+    (catalog / "2025-11.md").write_text('title: "Not a list"\nurl: "https://example.com/b"\n', encoding="utf-8")
+
+    with pytest.raises(bm.ManifestBuildError) as failure:
+        bm.build_manifest(docs_root=docs_root, cache_path=tmp_path / "cache.ndjson")
+    assert [path for path, _ in failure.value.errors] == [
+        "resources/catalog/2025-10.md",
+        "resources/catalog/2025-11.md",
+    ]
+    assert "must contain a YAML list" in failure.value.errors[1][1]
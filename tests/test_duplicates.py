@@ -0,0 +1,57 @@
+import build_manifest as bm
+
+BODY = (
+    "Agents that keep a long running memory need a way to tell a new observation from one they already "
+    "stored. Hashing the normalised text of every observation and checking the hash before writing keeps "
+    "the store free of echoes, and a time to live on each key lets old entries expire on their own. "
+    "Retrieval then ranks the remaining entries by recency and relevance before they reach the prompt."
+)
+OTHER = (
+    "Routing sends every request to the handler best suited for it. A small classifier reads the request, "
+    "picks a label from a fixed list and the coordinator forwards the request to the agent for that label, "
+    "falling back to a general agent when the classifier is unsure about its answer."
+)
+
+
+def _write(docs_root, key, body):
+    slug = key.rsplit("/", 1)[-1][:-3]
+    front_matter = f'---\ntitle: "{slug}"\nslug: "{slug}"\ncreated_at: "2025-10-20"\n---\n\n'
+    (docs_root / key).write_text(front_matter + body + "\n", encoding="utf-8")
+
+
+def _clusters(docs_root, tmp_path):
+    store = bm._MinHashStore(tmp_path / "minhash.ndjson")
+    bm._collect_signatures(bm._discover_markdown(docs_root), store, docs_root=docs_root)
+    return store, bm.find_near_duplicates(store.signatures)
+
+
+def test_near_identical_notes_pair_up(docs_root, tmp_path):
+    _write(docs_root, "notes/2025-10-20_memory-a.md", BODY)
+    _write(docs_root, "notes/2025-10-20_memory-b.md", BODY + " Both paths are covered by tests.")
+    _write(docs_root, "notes/2025-10-20_routing.md", OTHER)
+
+    _, clusters = _clusters(docs_root, tmp_path)
+    members = {key: cluster for _, cluster in clusters for key in cluster}
+    assert members["notes/2025-10-20_memory-a.md"] == [
+        "notes/2025-10-20_memory-a.md",
+        "notes/2025-10-20_memory-b.md",
+    ]
+    assert "notes/2025-10-20_routing.md" not in members
+
+
+def test_only_notes_and_patterns_are_signed(docs_root, tmp_path):
+    _write(docs_root, "notes/2025-10-20_memory-a.md", BODY)
+    _write(docs_root, "snippets/memory-copy.md", BODY)
+
+    store, clusters = _clusters(docs_root, tmp_path)
+    assert {key.split("/", 1)[0] for key in store.signatures} == {"notes", "patterns"}
+    assert all(not key.startswith("snippets/") for _, cluster in clusters for key in cluster)
+
+
+def test_unchanged_bodies_reuse_their_signatures(docs_root, tmp_path):
+    store, _ = _clusters(docs_root, tmp_path)
+    store.save()
+    warm = bm._MinHashStore.load(tmp_path / "minhash.ndjson")
+    bm._collect_signatures(bm._discover_markdown(docs_root), warm, docs_root=docs_root)
+    assert warm.signatures == store.signatures
+    assert warm.hits == len(store.signatures)
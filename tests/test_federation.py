@@ -0,0 +1,68 @@
+import json
+
+import build_manifest as bm
+
+NOTE = "notes/2025-10-13_agent-memory-without-echo.md"
+PATTERN = "patterns/federated-only.md"
+
+
+def _other_root(tmp_path):
+    """A second garden with a note whose slug this one uses too, and a pattern of its own."""
+    root = tmp_path / "other"
+    (root / "docs" / "notes").mkdir(parents=True)
+    (root / "docs" / "patterns").mkdir()
+    (root / "docs" / NOTE).write_text(
+        '---\ntitle: "Agent memory, again"\nslug: "agent-memory-without-echo"\nstatus: "draft"\n'
+        'created_at: "2025-10-20"\n---\n\nBody.\n',
+        encoding="utf-8",
+    )
+    (root / "docs" / PATTERN).write_text(
+        '---\ntitle: "Pattern: Federated Only"\nslug: "federated-only"\ntags: ["federation"]\n'
+        f'source:\n  origin_note: "{NOTE}"\nstatus: "draft"\ncreated_at: "2025-10-20"\n---\n\nBody.\n',
+        encoding="utf-8",
+    )
+    return root
+
+
+def test_roots_merge_in_order_and_rename_colliding_ids(docs_root, tmp_path):
+    other = bm.FederatedRoot("other", _other_root(tmp_path))
+    manifest, local, known, collisions = bm.build_federated_manifest(
+        [other], docs_root=docs_root, cache_path=tmp_path / "cache.ndjson", state_dir=tmp_path / "federation"
+    )
+
+    items = manifest["items"]
+    assert [(item.type, item.slug) for item in items] == sorted((item.type, item.slug) for item in items)
+    twins = [item for item in items if item.slug == "agent-memory-without-echo" and item.type == "note"]
+    assert [(item.id, item.path) for item in twins] == [
+        ("note:agent-memory-without-echo", NOTE),
+        ("note:agent-memory-without-echo@other", f"other/{NOTE}"),
+    ]
+    assert collisions == [
+        (
+            f"other/{NOTE}",
+            "id 'note:agent-memory-without-echo' is also defined in this repository; "
+            "renamed to 'note:agent-memory-without-echo@other'",
+        )
+    ]
+
+    mounted = next(item for item in items if item.path == f"other/{PATTERN}")
+    assert mounted.origin_note == f"other/{NOTE}"
+    assert {f"other/{NOTE}", f"other/{PATTERN}"} <= known
+
+    home = bm.build_manifest(docs_root=docs_root, cache_path=tmp_path / "home.ndjson")
+    assert [item.id for item in local["items"]] == [item.id for item in home["items"]]
+    assert len(items) == len(home["items"]) + 2
+
+
+def test_mounted_items_stay_off_the_landing_pages(repository, run_build, tmp_path):
+    other = _other_root(tmp_path)
+    result = run_build("--root", f"other={other}")
+    assert f"warning: other/{NOTE}: id 'note:agent-memory-without-echo' is also defined" in result.stderr
+
+    manifest = json.loads((repository / "data" / "content_manifest.json").read_text(encoding="utf-8"))
+    assert f"other/{PATTERN}" in {item["path"] for item in manifest["items"]}
+    pages = [repository / "docs" / "index.md", *(repository / "docs").glob("*/README.md")]
+    pages += (repository / "docs" / "archive").rglob("*.md")
+    for page in pages:
+        text = page.read_text(encoding="utf-8")
+        assert "Federated Only" not in text and "Agent memory, again" not in text, page
@@ -0,0 +1,69 @@
+import pytest
+
+import build_manifest as bm
+from conftest import REPOSITORY_ROOT
+from manifest_common import FRONT_MATTER_LIMIT
+
+yaml = pytest.importorskip("yaml")
+
+CASES = [
+    "title: Plain title\nslug: plain-title\n",
+    'title: "Quoted: with colon"\nsummary: \'It\'\'s single quoted\'\n',
+    'title: "Escapes \\"inside\\" and \\\\ backslash"\n',
+    "tags: [memory, agents, 'quoted tag', \"double\"]\nthemes: []\n",
+    "tags:\n  - memory\n  - agents\nstatus: draft\n",
+    "created_at: 2025-10-13\nupdated_at: 2025-10-14T09:30:00\n",
+    "count: 3\nratio: 0.5\nnegative: -7\nenabled: true\ndisabled: False\nmissing: ~\nempty:\n",
+    "version: 1.0\noctal_like: 0755\nleading_plus: +3\n",
+    "relationships:\n  promotes_to:\n    - patterns/a.md\n    - patterns/b.md\n  related: []\n",
+    "links:\n  - title: First\n    url: https://example.com/a\n  - title: Second\n    url: https://example.com/b?x=1&y=2\n",
+    "title: Trailing comment # not part of the title\n# full line comment\nslug: s\n",
+    "title: 'hash # inside quotes'\nsummary: text with - dash and a colon:inside\n",
+    "nested:\n  deeper:\n    deepest: value\n  sibling: [1, 2, three]\n",
+    "tags: [2025, 'true', null, yes]\n",
+    "summary: >\n  Folded block\n  across lines\n",
+    "summary: |\n  Literal block\n",
+    "anchor: &a value\nalias: *a\n",
+    "title: trailing spaces   \nsummary: 'a:b'\n",
+    "{inline: mapping}\n",
+]
+
+
+def _front_matter_blocks():
+    for path in sorted((REPOSITORY_ROOT / "docs").rglob("*.md")):
+        raw = bm._read_front_matter(path)
+        if raw:
+            yield pytest.param(raw, id=path.relative_to(REPOSITORY_ROOT / "docs").as_posix())
+
+
+@pytest.mark.parametrize("raw", [*CASES, *_front_matter_blocks()])
+def test_fast_yaml_load_matches_safe_load(raw):
+    expected = yaml.safe_load(raw)
+    try:
+        loaded = bm._fast_yaml_load(raw)
+    except bm._UnsupportedYaml:
+        loaded = bm._load_yaml_any(raw)  # outside the fast subset, so the fallback must agree
+    assert loaded == expected
+
+
+def test_fast_yaml_load_covers_the_garden():
+    blocks = [param.values[0] for param in _front_matter_blocks()]
+    unsupported = 0
+    for raw in blocks:
+        try:
+            bm._fast_yaml_load(raw)
+        except bm._UnsupportedYaml:
+            unsupported += 1
+    assert blocks and unsupported == 0
+
+
+def test_oversized_front_matter_fails_the_build_naming_the_file(docs_root, tmp_path):
+    note = docs_root / "notes" / "2025-10-20_oversized.md"
+    padding = "".join(f"line_{index}: {'x' * 80}\n" for index in range(FRONT_MATTER_LIMIT // 80))
+    note.write_text(f'---\ntitle: "Oversized"\n{padding}---\n\nBody.\n', encoding="utf-8")
+
+    with pytest.raises(bm.ManifestBuildError) as failure:
+        bm.build_manifest(docs_root=docs_root, cache_path=tmp_path / "cache.ndjson")
+    [(path, message)] = failure.value.errors
+    assert path == "notes/2025-10-20_oversized.md"
+    assert str(FRONT_MATTER_LIMIT) in message
@@ -0,0 +1,70 @@
+import os
+
+import build_manifest as bm
+import manifest_parse
+
+PATTERN = "patterns/evaluation-and-monitoring.md"
+
+
+def _collect(docs_root, cache_path):
+    cache = bm._ParseCache.load(cache_path, schemas=bm._schema_fingerprint(docs_root))
+    items = bm._collect_markdown_items(cache, docs_root=docs_root)
+    cache.save()
+    return cache, {item.path: item for item in items}
+
+
+def test_unchanged_files_are_served_from_the_cache(docs_root, tmp_path):
+    cache_path = tmp_path / "parse_cache.ndjson"
+    cold, items = _collect(docs_root, cache_path)
+    assert cold.hits == 0 and cold.misses == len(items)
+
+    warm, cached = _collect(docs_root, cache_path)
+    assert warm.hits == len(items) and warm.misses == 0
+    assert [item.encode() for item in cached.values()] == [item.encode() for item in items.values()]
+
+
+def test_an_edited_file_is_parsed_again(docs_root, tmp_path):
+    cache_path = tmp_path / "parse_cache.ndjson"
+    _, items = _collect(docs_root, cache_path)
+    path = docs_root / PATTERN
+    text = path.read_text(encoding="utf-8")
+    stat = path.stat()
+    path.write_text(text.replace('status: "stable"', 'status: "draft"', 1), encoding="utf-8")
+    # Same size; only the mtime tells the edit apart.
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    cache, edited = _collect(docs_root, cache_path)
+    assert cache.misses == 1 and cache.hits == len(items) - 1
+    assert edited[PATTERN].status == "draft"
+
+
+def test_a_touched_file_with_the_same_front_matter_is_revalidated(docs_root, tmp_path):
+    cache_path = tmp_path / "parse_cache.ndjson"
+    _, items = _collect(docs_root, cache_path)
+    path = docs_root / PATTERN
+    path.write_text(path.read_text(encoding="utf-8") + "\nA new paragraph.\n", encoding="utf-8")
+
+    cache, touched = _collect(docs_root, cache_path)
+    assert cache.misses == 0 and cache.hits == len(items)
+    assert touched[PATTERN].encode() == items[PATTERN].encode()
+
+
+def test_a_new_parser_version_drops_the_cache(docs_root, tmp_path, monkeypatch):
+    cache_path = tmp_path / "parse_cache.ndjson"
+    _, items = _collect(docs_root, cache_path)
+    monkeypatch.setattr(manifest_parse, "PARSE_CACHE_VERSION", manifest_parse.PARSE_CACHE_VERSION + 1)
+
+    cache = bm._ParseCache.load(cache_path, schemas=bm._schema_fingerprint(docs_root))
+    assert cache.entries == {}
+    bm._collect_markdown_items(cache, docs_root=docs_root)
+    assert cache.hits == 0 and cache.misses == len(items)
+
+
+def test_a_schema_change_drops_the_cache(docs_root, tmp_path):
+    cache_path = tmp_path / "parse_cache.ndjson"
+    _collect(docs_root, cache_path)
+    schema = docs_root / "patterns" / bm.SECTION_SCHEMA_FILE
+    schema.write_text(schema.read_text(encoding="utf-8") + "\n# edited\n", encoding="utf-8")
+
+    cache = bm._ParseCache.load(cache_path, schemas=bm._schema_fingerprint(docs_root))
+    assert cache.entries == {}
@@ -0,0 +1,102 @@
+import pytest
+
+import build_manifest as bm
+import manifest_related
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+PATTERN = "patterns/evaluation-and-monitoring.md"
+
+
+def _manifest(docs_root, tmp_path):
+    return bm.build_manifest(docs_root=docs_root, cache_path=tmp_path / "parse_cache.ndjson")
+
+
+def _suggest(manifest, docs_root, cache=None):
+    cache = cache if cache is not None else manifest_related._RelatedCache(None)
+    related = manifest_related.suggest_related(manifest, docs_root=docs_root, cache=cache)
+    return {item_id: [item.id for item in items] for item_id, items in related.items()}, cache
+
+
+def _assert_matches_a_cold_run(manifest, docs_root, warm):
+    suggestions, cache = _suggest(manifest, docs_root, warm)
+    expected, cold = _suggest(manifest, docs_root)
+    assert suggestions == expected
+    np.testing.assert_allclose(cache.state["scores"], cold.state["scores"], atol=1e-6)
+    return cache
+
+
+def _edit(path, old, new):
+    text = path.read_text(encoding="utf-8")
+    assert old in text
+    path.write_text(text.replace(old, new, 1), encoding="utf-8")
+
+
+def test_body_edit_matches_a_cold_run(docs_root, tmp_path):
+    manifest = _manifest(docs_root, tmp_path)
+    _, cache = _suggest(manifest, docs_root)
+    # Terms only the fundamentals guide had so far start to weigh, so its row moves without being edited.
+    with (docs_root / PATTERN).open("a", encoding="utf-8") as handle:
+        handle.write("\nObservation, diferenciando sistemas tradicionais.\n")
+
+    cache = _assert_matches_a_cold_run(_manifest(docs_root, tmp_path), docs_root, cache)
+    assert 0 < cache.recomputed < len(manifest["items"])
+
+
+def test_tag_edit_matches_a_cold_run(docs_root, tmp_path):
+    _, cache = _suggest(_manifest(docs_root, tmp_path), docs_root)
+    _edit(docs_root / PATTERN, '"telemetry"', '"memory"')
+
+    _assert_matches_a_cold_run(_manifest(docs_root, tmp_path), docs_root, cache)
+
+
+def test_added_and_removed_items_match_a_cold_run(docs_root, tmp_path):
+    _, cache = _suggest(_manifest(docs_root, tmp_path), docs_root)
+    (docs_root / "notes" / "2025-10-20_related-test.md").write_text(
+        '---\ntitle: "Evaluation notes"\nslug: "related-test"\nsummary: "Monitoring agents."\n'
+        'tags: ["evaluation", "monitoring"]\ncreated_at: "2025-10-20"\n---\n\nEvaluation and monitoring.\n',
+        encoding="utf-8",
+    )
+    cache = _assert_matches_a_cold_run(_manifest(docs_root, tmp_path), docs_root, cache)
+
+    (docs_root / PATTERN).unlink()
+    _assert_matches_a_cold_run(_manifest(docs_root, tmp_path), docs_root, cache)
+
+
+def test_unchanged_garden_recomputes_nothing(docs_root, tmp_path):
+    manifest = _manifest(docs_root, tmp_path)
+    expected, cache = _suggest(manifest, docs_root)
+    suggestions, cache = _suggest(manifest, docs_root, cache)
+    assert suggestions == expected
+    assert cache.recomputed == 0
+
+
+def test_neighbours_share_tags_and_terms(tmp_path):
+    manifest = {
+        "items": [
+            bm.ManifestItem(
+                id=f"note:{slug}",
+                type="note",
+                title=title,
+                slug=slug,
+                summary=summary,
+                tags=tags,
+                themes=[],
+                status="draft",
+                origin_note=None,
+                created_at="2025-10-20",
+                updated_at="2025-10-20",
+                path=f"notes/{slug}.md",
+            )
+            for slug, title, summary, tags in [
+                ("memory-a", "Agent memory", "Vector memory for agents", ["memory"]),
+                ("memory-b", "Memory stores", "Memory stores for agents", ["memory"]),
+                ("routing", "Routing", "Route requests between agents", ["routing"]),
+                ("routing-b", "Routers", "Route requests to tools", ["routing"]),
+            ]
+        ]
+    }
+    suggestions, _ = _suggest(manifest, tmp_path)  # no bodies on disk: titles, summaries and tags only
+    assert suggestions["note:memory-a"][0] == "note:memory-b"
+    assert suggestions["note:routing"][0] == "note:routing-b"
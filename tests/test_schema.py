@@ -0,0 +1,64 @@
+import subprocess
+
+import pytest
+
+import build_manifest as bm
+
+NOTE = "notes/2025-10-20_schema-test.md"
+VALID = {
+    "title": '"Schema test"',
+    "slug": '"schema-test"',
+    "summary": '"A note for the validator."',
+    "created_at": '"2025-10-20"',
+    "status": '"draft"',
+}
+
+
+def _write_note(docs_root, **fields):
+    lines = [f"{key}: {value}" for key, value in {**VALID, **fields}.items() if value is not None]
+    (docs_root / NOTE).write_text("---\n" + "\n".join(lines) + "\n---\n\nBody.\n", encoding="utf-8")
+
+
+CASES = [
+    pytest.param({"summary": None}, "missing required `summary`", id="missing-required"),
+    pytest.param({"tags": '"memory"'}, "`tags` should be list[string], got 'memory'", id="wrong-type"),
+    pytest.param(
+        {"status": '"archived"'}, "`status` should be enum[draft, in-review, stable], got 'archived'", id="unknown-enum"
+    ),
+]
+
+
+@pytest.mark.parametrize("fields, message", CASES)
+def test_schema_report_names_the_file(docs_root, tmp_path, fields, message):
+    _write_note(docs_root, **fields)
+    report = bm._SchemaReport()
+    bm.build_manifest(docs_root=docs_root, cache_path=tmp_path / "cache.ndjson", schema=report)
+
+    problems = report.finish()
+    assert [path for path, _ in problems] == [NOTE]
+    assert message in problems[0][1]
+
+
+@pytest.mark.parametrize("fields, message", CASES)
+def test_strict_schema_fails_the_build(repository, run_build, fields, message):
+    _write_note(repository / "docs", **fields)
+    run_build()  # without --strict-schema the problems are warnings
+
+    with pytest.raises(subprocess.CalledProcessError) as failure:
+        run_build("--strict-schema")
+    assert f"[build_manifest] error: {NOTE}: " in failure.value.stderr
+    assert message in failure.value.stderr
+
+
+def test_valid_front_matter_has_no_problems(docs_root, tmp_path):
+    _write_note(docs_root)
+    report = bm._SchemaReport()
+    bm.build_manifest(docs_root=docs_root, cache_path=tmp_path / "cache.ndjson", schema=report)
+    assert report.finish() == []
+
+
+def test_schema_validation_error_carries_every_path():
+    error = bm.SchemaValidationError([("notes/a.md", "x"), ("notes/a.md", "y"), ("patterns/b.md", "z")])
+    assert isinstance(error, bm.ManifestBuildError)
+    assert [path for path, _ in error.errors] == ["notes/a.md", "notes/a.md", "patterns/b.md"]
+    assert str(error) == "3 schema problem(s) in 2 file(s)"
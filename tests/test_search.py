@@ -0,0 +1,60 @@
+import manifest_search
+
+PAGES = {
+    # Same length, so only the term frequency tells them apart.
+    "retrieval-often.md": "# Alpha\n\nretrieval retrieval retrieval memory\n",
+    "retrieval-once.md": "# Beta\n\nretrieval memory memory memory\n",
+    # Same term frequency, so only the length tells them apart.
+    "routing-short.md": "# Gamma\n\nrouting agents\n",
+    "routing-long.md": "# Delta\n\nrouting agents planners critics tools handlers queues workers\n",
+    "unrelated.md": "# Epsilon\n\nguardrails\n",
+}
+
+
+def _index(tmp_path, monkeypatch=None, doc_chunk=None):
+    docs_root = tmp_path / "docs"
+    docs_root.mkdir()
+    for name, text in PAGES.items():
+        (docs_root / name).write_text(text, encoding="utf-8")
+    if doc_chunk is not None:
+        monkeypatch.setattr(manifest_search, "SEARCH_DOC_CHUNK", doc_chunk)
+    output_dir = tmp_path / "search"
+    stats = manifest_search.build_search_index({"items": []}, docs_root=docs_root, output_dir=output_dir)
+    return manifest_search.SearchIndex(output_dir), stats
+
+
+def _titles(index, query):
+    return [hit["title"] for hit in index.search(query)]
+
+
+def test_higher_term_frequency_ranks_first(tmp_path):
+    index, _ = _index(tmp_path)
+    assert _titles(index, "retrieval") == ["Alpha", "Beta"]
+
+
+def test_shorter_pages_rank_first_at_equal_frequency(tmp_path):
+    index, _ = _index(tmp_path)
+    assert _titles(index, "routing") == ["Gamma", "Delta"]
+    hits = index.search("routing")
+    assert hits[0]["score"] > hits[1]["score"] > 0
+
+
+def test_query_terms_add_up(tmp_path):
+    index, _ = _index(tmp_path)
+    assert _titles(index, "retrieval memory")[:2] == ["Alpha", "Beta"]
+    assert _titles(index, "guardrails") == ["Epsilon"]
+    assert index.search("absent") == []
+
+
+def test_lookup_across_shards_and_document_chunks(tmp_path, monkeypatch):
+    index, stats = _index(tmp_path, monkeypatch, doc_chunk=2)
+    assert stats["docs"] == len(PAGES)
+    assert manifest_search._search_shard("retrieval") != manifest_search._search_shard("routing")
+
+    hits = index.search("retrieval routing guardrails")
+    assert {hit["title"] for hit in hits} == {"Alpha", "Beta", "Gamma", "Delta", "Epsilon"}
+    assert {hit["url"] for hit in hits} >= {"retrieval-often/", "routing-short/", "unrelated/"}
+    # Only the shards of the query terms and the chunks of the hits were read.
+    assert set(index.shards) == {manifest_search._search_shard(term) for term in ("retrieval", "routing", "guardrails")}
+    assert set(index.doc_chunks) == {0, 1, 2}
+    assert len(list((tmp_path / "search" / "docs").glob("*.json"))) == 3
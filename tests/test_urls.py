@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+
+import manifest_urls
+
+
+async def _serve(response: bytes):
+    """A local server answering every request on a connection with `response` until the client hangs up."""
+
+    async def handle(reader, writer):
+        while True:
+            while (line := await reader.readline()) not in {b"\r\n", b"\n", b""}:
+                pass
+            if not line:
+                break
+            writer.write(response)
+            await writer.drain()
+            if b"Connection: close" in response:
+                break
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def _requests(response: bytes, count: int):
+    server, port = await _serve(response)
+    transport = manifest_urls._StreamTransport(timeout=5)
+    try:
+        statuses = [
+            (await transport.request("HEAD", f"http://127.0.0.1:{port}/page", {})).status for _ in range(count)
+        ]
+        pooled = sum(len(connections) for connections in transport.idle.values())
+    finally:
+        await transport.close()
+        server.close()
+        await server.wait_closed()
+    return statuses, pooled
+
+
+def test_connection_close_is_not_pooled():
+    response = b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+    statuses, pooled = asyncio.run(_requests(response, 3))
+    assert statuses == [200, 200, 200]
+    assert pooled == 0
+
+
+def test_keep_alive_connection_is_reused():
+    response = b"HTTP/1.1 204 No Content\r\n\r\n"
+    statuses, pooled = asyncio.run(_requests(response, 3))
+    assert statuses == [204, 204, 204]
+    assert pooled == 1
+
+
+class _FakeTransport:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    async def request(self, method, url, headers):
+        self.calls.append((method, url, dict(headers)))
+        response = self.responses[(method, url)]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def close(self):
+        pass
+
+
+def test_check_urls_follows_redirects_and_falls_back_to_get():
+    transport = _FakeTransport(
+        {
+            ("HEAD", "https://a.test/old"): manifest_urls.HttpResponse(301, {"location": "/new"}),
+            ("HEAD", "https://a.test/new"): manifest_urls.HttpResponse(200, {"etag": '"v1"'}),
+            ("HEAD", "https://b.test/"): manifest_urls.HttpResponse(405, {}),
+            ("GET", "https://b.test/"): manifest_urls.HttpResponse(200, {}),
+            ("HEAD", "https://c.test/"): OSError("unreachable"),
+        }
+    )
+    cache = manifest_urls._UrlHealthCache(None)
+    results = manifest_urls.check_urls(
+        ["https://a.test/old", "https://b.test/", "https://c.test/"], cache=cache, transport=transport, host_interval=0
+    )
+    assert results["https://a.test/old"].final_url == "https://a.test/new"
+    assert results["https://a.test/old"].etag == '"v1"'
+    assert results["https://b.test/"].ok
+    assert not results["https://c.test/"].ok and results["https://c.test/"].status is None
+
+
+def test_stale_results_are_revalidated_with_their_etag():
+    previous = manifest_urls.UrlCheck(200, True, 0.0, '"v1"', None, None, None)
+    transport = _FakeTransport({("HEAD", "https://a.test/"): manifest_urls.HttpResponse(304, {})})
+    cache = manifest_urls._UrlHealthCache(None, {"https://a.test/": previous})
+    results = manifest_urls.check_urls(["https://a.test/"], cache=cache, transport=transport, host_interval=0)
+    assert transport.calls[0][2] == {"If-None-Match": '"v1"'}
+    assert results["https://a.test/"].status == 200 and results["https://a.test/"].checked_at > 0
+    assert cache.revalidated == 1
+
+
+@pytest.mark.parametrize("checked_at_offset, calls", [(-60, 0), (-2 * manifest_urls.URL_HEALTH_MAX_AGE, 1)])
+def test_fresh_results_skip_the_network(checked_at_offset, calls):
+    previous = manifest_urls.UrlCheck(200, True, time.time() + checked_at_offset, None, None, None, None)
+    transport = _FakeTransport({("HEAD", "https://a.test/"): manifest_urls.HttpResponse(200, {})})
+    cache = manifest_urls._UrlHealthCache(None, {"https://a.test/": previous})
+    manifest_urls.check_urls(["https://a.test/"], cache=cache, transport=transport, host_interval=0)
+    assert len(transport.calls) == calls
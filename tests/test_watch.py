@@ -0,0 +1,86 @@
+import json
+import re
+
+import pytest
+
+import build_manifest as bm
+
+PAGE_SIZE = 3  # small pages, so edits move items across page boundaries
+
+
+def _edit(path, pattern, replacement):
+    text = path.read_text(encoding="utf-8")
+    edited = re.sub(pattern, replacement, text, count=1, flags=re.MULTILINE)
+    assert edited != text, f"{pattern!r} did not match {path}"
+    path.write_text(edited, encoding="utf-8")
+
+
+def _files(root):
+    return {path.relative_to(root).as_posix(): path.read_text(encoding="utf-8") for path in root.rglob("*") if path.is_file()}
+
+
+def _assert_matches_full_build(session, docs_root, tmp_path):
+    full = bm.build_manifest(docs_root=docs_root, cache_path=tmp_path / "full-cache.ndjson", full=True)
+    assert bm._serialize_manifest({**session.manifest, "generated_at": ""}) == bm._serialize_manifest(
+        {**full, "generated_at": ""}
+    )
+    for page, content in bm._render_pages(full):
+        assert (docs_root / page).read_text(encoding="utf-8") == content, page
+    reference = tmp_path / "reference"
+    bm.regenerate_archives(full, docs_root=reference, page_size=PAGE_SIZE)
+    assert _files(docs_root / bm.ARCHIVE_DIR) == _files(reference / bm.ARCHIVE_DIR)
+    return full
+
+
+@pytest.fixture
+def session(docs_root, tmp_path):
+    cache = bm._ParseCache.load(tmp_path / "cache.ndjson", schemas=bm._schema_fingerprint(docs_root))
+    session = bm._WatchSession(
+        docs_root, cache, manifest_path=tmp_path / "manifest.json", archive_page_size=PAGE_SIZE
+    )
+    session.load()
+    return session
+
+
+def test_watch_edits_match_a_full_rebuild(session, docs_root, tmp_path):
+    pattern = "patterns/evaluation-and-monitoring.md"
+    edits = [
+        # In place: the item keeps its position.
+        (pattern, r'^summary: ".*"$', 'summary: "Edited in place."'),
+        # Mixed tag types move the item between tag archives.
+        (pattern, r"^tags: \[.*\]$", 'tags: ["monitoring", 7, "7"]'),
+        # A new slug moves the item within the manifest order.
+        (pattern, r'^slug: ".*"$', 'slug: "aaa-evaluation"'),
+        (pattern, r'^status: ".*"$', 'status: "draft"'),
+    ]
+    for key, search, replacement in edits:
+        _edit(docs_root / key, search, replacement)
+        count, _, _ = session.apply({key})
+        assert count == 1
+        _assert_matches_full_build(session, docs_root, tmp_path)
+
+    added = "notes/2025-10-20_watch-test.md"
+    (docs_root / added).write_text(
+        "---\n"
+        'title: "Watch test"\n'
+        'tags: ["memory", "watch"]\n'
+        'created_at: "2025-10-20"\n'
+        "relationships:\n"
+        "  promotes_to:\n"
+        f'    - "{pattern}"\n'
+        '    - "patterns/not-written-yet.md"\n'
+        "---\n\nBody.\n",
+        encoding="utf-8",
+    )
+    session.apply({added})
+    _assert_matches_full_build(session, docs_root, tmp_path)
+
+    (docs_root / pattern).unlink()
+    session.apply({pattern})
+    full = _assert_matches_full_build(session, docs_root, tmp_path)
+
+    assert session.flush()
+    written = json.loads(session.manifest_path.read_text(encoding="utf-8"))
+    expected = json.loads(bm._serialize_manifest(full))
+    written.pop("generated_at"), expected.pop("generated_at")
+    assert written == expected